@@ -1,6 +1,4 @@
-import re
 import psutil
-import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import matplotlib.pyplot as plt
@@ -10,10 +8,18 @@ import os
 import datetime
 import subprocess
 from pathlib import Path
-import shutil
 from network import NetworkMonitor
 from systeminfo import SystemInfoTab
 from benchmark import BenchmarkTab
+from collector import SamplingScheduler
+from charts import BlitManager
+from virtualtable import VirtualTable
+from fileops import DirectoryScanner, LargeFileFinder, FileJobQueue, TransferJob, DeleteJob, ListingCache, read_path
+from fswatch import DirectoryWatcher
+from searchindex import FilenameIndex
+from treesync import TreeReconciler
+from dirindex import DirectorySizeIndex
+from processes import ProcessInfo
 import stat
 
 class ModernSystemMonitorApp:
@@ -50,21 +56,45 @@ class ModernSystemMonitorApp:
         
         # Zmienne dla automatycznego odświeżania temperatury
         self.auto_refresh_temp = False
-        self.temp_refresh_id = None
+        self.temp_subscription = None
         
         # Zmienne dla automatycznego odświeżania procesów
         self.auto_refresh_processes = False
-        self.process_refresh_id = None
+        self.process_subscription = None
         
         # Konfiguracja matplotlib dla ciemnego motywu
         plt.style.use('dark_background')
         
+        # Wspólny harmonogram próbkowania - cały odczyt psutil odbywa się poza wątkiem Tk
+        self.scheduler = SamplingScheduler(self.root)
+        
         # Tworzenie zakładek
         self.create_notebook()
         
+        # Rysuj tylko widoczną zakładkę; po zminimalizowaniu wstrzymaj rysowanie
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.root.bind('<Unmap>', self.on_window_unmap, add='+')
+        self.root.bind('<Map>', self.on_window_map, add='+')
+        self.scheduler.set_visible_tab(self.notebook.select())
+        
         # Rozpocznij aktualizację danych
-        self.update_data()
+        self.subscribe_system_data()
+        self.scheduler.start()
         
+    def on_tab_changed(self, event):
+        """Informuje harmonogram o zmianie widocznej zakładki"""
+        self.scheduler.set_visible_tab(self.notebook.select())
+
+    def on_window_unmap(self, event):
+        """Okno zminimalizowane - wstrzymaj rysowanie wszystkich zakładek"""
+        if event.widget is self.root:
+            self.scheduler.set_minimized(True)
+
+    def on_window_map(self, event):
+        """Okno przywrócone - wznów rysowanie widocznej zakładki"""
+        if event.widget is self.root:
+            self.scheduler.set_minimized(False)
+
     def setup_styles(self):
         """Konfiguruje nowoczesne style dla aplikacji"""
         style = ttk.Style()
@@ -262,6 +292,12 @@ class ModernSystemMonitorApp:
         self.canvas = FigureCanvasTkAgg(self.fig, chart_frame)
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
         
+        # Wykres budowany raz - później zmieniane są tylko słupki i etykiety (blitting)
+        self.cpu_blit = BlitManager(self.canvas)
+        self.cpu_bars = []
+        self.cpu_bar_labels = []
+        self.cpu_title = None
+        
         # Procesy i przyciski
         bottom_frame = ttk.Frame(main_frame, style='Modern.TFrame')
         bottom_frame.pack(fill='x')
@@ -295,7 +331,7 @@ class ModernSystemMonitorApp:
         ttk.Button(button_frame, 
                   text="🔄 Refresh", 
                   style='Modern.TButton',
-                  command=self.update_data).pack(fill='x', pady=5)
+                  command=self.refresh_system_data).pack(fill='x', pady=5)
         
         ttk.Button(button_frame, 
                   text="📊 Details", 
@@ -405,6 +441,7 @@ class ModernSystemMonitorApp:
         actions = [
             ("🔄 Refresh", self.refresh_files),
             ("💾 Large Files", self.find_large_files),
+            ("🔎 Search", self.open_file_search),
             ("👁️ Show Hidden", self.toggle_hidden),
             ("📋 Info", self.show_file_info),
             ("🗑️ Delete", self.delete_selected)
@@ -449,10 +486,46 @@ class ModernSystemMonitorApp:
         self.status_label = ttk.Label(main_frame, text="", style='Modern.TLabel')
         self.status_label.pack(fill='x')
         
+        # Panel postępu operacji na plikach (widoczny tylko w trakcie)
+        self.job_frame = ttk.Frame(main_frame, style='Modern.TFrame')
+        self.job_label = ttk.Label(self.job_frame, text="", style='Modern.TLabel')
+        self.job_label.pack(fill='x')
+        self.job_progress = ttk.Progressbar(self.job_frame, style='Modern.Horizontal.TProgressbar',
+                                            mode='determinate', maximum=100)
+        self.job_progress.pack(side=tk.LEFT, fill='x', expand=True, pady=5)
+        ttk.Button(self.job_frame, text="⏹ Cancel", style='Danger.TButton',
+                  command=self.cancel_file_job).pack(side=tk.RIGHT, padx=2)
+        self.job_pause_button = ttk.Button(self.job_frame, text="⏸ Pause", style='Modern.TButton',
+                                           command=self.toggle_file_job_pause)
+        self.job_pause_button.pack(side=tk.RIGHT, padx=2)
+        
+        # Konfiguruj tagi dla kolorów
+        self.files_tree.tag_configure('parent', foreground='#2196f3', font=('Arial', 10, 'bold'))  # Niebieski, pogrubiony
+        self.files_tree.tag_configure('dir', foreground='#4caf50')  # Zielony
+        self.files_tree.tag_configure('file', foreground='#ff9800')  # Pomarańczowo-żółty
+        self.files_tree.tag_configure('unknown', foreground='#9e9e9e')  # Szary dla nieznanych
+        
         # Zmienne
         self.show_hidden = False
         self.sort_column = 'name'
         self.sort_reverse = False
+        self.file_entries = {}  # nazwa -> FileEntry bieżącego katalogu
+        self.file_order = []  # nazwy wierszy w kolejności tabeli (bez ..)
+        self.directory_scanner = DirectoryScanner(self.root)
+        self.size_index = DirectorySizeIndex()
+        self.size_index_version = None
+        self.size_poll_id = None
+        self.file_jobs = FileJobQueue()
+        self.job_poll_id = None
+        self.directory_watcher = DirectoryWatcher(self.root, self.on_directory_changed)
+        self.listing_cache = ListingCache()
+        self.listing_mtime = None
+        self.listing_key = None  # (katalog, ukryte) listingu w file_entries
+        self.listing_dirty = False  # Zmiany z inotify jeszcze nie zapisane w cache
+        self.revalidated_entries = None
+        self.back_history = []
+        self.forward_history = []
+        self.search_indexes = {}  # katalog główny -> FilenameIndex
         
         # Załaduj początkowy katalog
         self.load_directory()
@@ -492,8 +565,7 @@ class ModernSystemMonitorApp:
         if selection:
             self.clipboard = []
             for item in selection:
-                item_values = self.files_tree.item(item)['values']
-                name = item_values[0]
+                name = item  # iid wiersza to nazwa wpisu
                 # Pomijaj .. w operacjach schowka
                 if name != "..":
                     self.clipboard.append(self.current_path / name)
@@ -509,8 +581,7 @@ class ModernSystemMonitorApp:
         if selection:
             self.clipboard = []
             for item in selection:
-                item_values = self.files_tree.item(item)['values']
-                name = item_values[0]
+                name = item  # iid wiersza to nazwa wpisu
                 # Pomijaj .. w operacjach schowka
                 if name != "..":
                     self.clipboard.append(self.current_path / name)
@@ -521,43 +592,103 @@ class ModernSystemMonitorApp:
                 messagebox.showwarning("Warning", "Cannot cut parent directory (..)")
 
     def paste_files(self):
-        """Wkleja pliki/katalogi z schowka"""
+        """Wkleja pliki/katalogi ze schowka - kopiowanie/przenoszenie w tle"""
         if not self.clipboard:
             messagebox.showwarning("Warning", "Clipboard is empty")
             return
-        
-        try:
-            for source_path in self.clipboard:
-                if not source_path.exists():
+
+        pairs = []
+        for source_path in self.clipboard:
+            if not source_path.exists():
+                continue
+
+            destination_path = self.current_path / source_path.name
+
+            # Jeśli plik już istnieje, zapytaj o nadpisanie
+            if destination_path.exists():
+                result = messagebox.askyesno("Confirm",
+                                           f"'{source_path.name}' already exists. Overwrite?")
+                if not result:
                     continue
-                
-                destination_path = self.current_path / source_path.name
-                
-                # Jeśli plik już istnieje, zapytaj o nadpisanie
-                if destination_path.exists():
-                    result = messagebox.askyesno("Confirm", 
-                                               f"'{source_path.name}' already exists. Overwrite?")
-                    if not result:
-                        continue
-                
-                if self.clipboard_operation == 'copy':
-                    if source_path.is_file():
-                        shutil.copy2(source_path, destination_path)
-                    else:
-                        shutil.copytree(source_path, destination_path)
-                elif self.clipboard_operation == 'cut':
-                    shutil.move(str(source_path), str(destination_path))
-            
-            # Po operacji cut wyczyść schowek
-            if self.clipboard_operation == 'cut':
-                self.clipboard = None
-                self.clipboard_operation = None
-            
+            pairs.append((str(source_path), str(destination_path)))
+
+        if pairs:
+            operation = 'move' if self.clipboard_operation == 'cut' else 'copy'
+            self.submit_file_job(TransferJob(operation, pairs, self.current_path))
+
+        # Po operacji cut wyczyść schowek
+        if self.clipboard_operation == 'cut':
+            self.clipboard = None
+            self.clipboard_operation = None
+
+    def submit_file_job(self, job):
+        """Kolejkuje operację na plikach i pokazuje panel postępu"""
+        self.file_jobs.submit(job)
+        if not self.job_frame.winfo_ismapped():
+            self.job_frame.pack(fill='x', pady=(5, 0), before=self.status_label)
+        if self.job_poll_id is None:
+            self.poll_file_jobs()
+
+    def poll_file_jobs(self):
+        """Aktualizuje panel postępu i obsługuje zakończone operacje"""
+        self.job_poll_id = None
+        refresh = False
+        while not self.file_jobs.finished.empty():
+            job = self.file_jobs.finished.get()
+            refresh = refresh or Path(job.destination) == self.current_path
+            if job.error is not None:
+                messagebox.showerror("Error", f"{job.title} failed: {job.error}")
+            elif job.cancelled:
+                self.status_label.config(text=f"⏹ {job.title} cancelled")
+            else:
+                self.status_label.config(text=f"✅ {job.title} completed: {job.items_done} item(s)")
+        if refresh:
             self.load_directory()
-            self.status_label.config(text="✅ Paste operation completed")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Cannot paste files: {e}")
+
+        job = self.file_jobs.current
+        if job is not None:
+            self.job_label.config(text=self.describe_file_job(job))
+            if job.bytes_total:
+                self.job_progress.config(mode='determinate')
+                self.job_progress['value'] = job.bytes_done / job.bytes_total * 100
+            else:
+                # Nieznana całość (np. usuwanie) - pasek w ruchu
+                self.job_progress.config(mode='indeterminate')
+                self.job_progress.step(5)
+
+        if self.file_jobs.active():
+            self.job_poll_id = self.root.after(250, self.poll_file_jobs)
+        else:
+            self.job_frame.pack_forget()
+            self.job_pause_button.config(text="⏸ Pause")
+
+    def describe_file_job(self, job):
+        """Tekst postępu: elementy, bajty, prędkość i pozostały czas"""
+        state = "⏸ Paused" if self.file_jobs.paused else f"⏳ {job.title}"
+        text = f"{state}: {job.current_name} | Items: {job.items_done}"
+        if job.bytes_total:
+            text += f" | {self.format_size(job.bytes_done)} / {self.format_size(job.bytes_total)}"
+            text += f" | {self.format_size(job.rate())}/s"
+            eta = job.eta()
+            if eta is not None:
+                text += f" | ETA {datetime.timedelta(seconds=int(eta))}"
+        elif job.bytes_done:
+            text += f" | {self.format_size(job.bytes_done)} | {self.format_size(job.rate())}/s"
+        return text
+
+    def toggle_file_job_pause(self):
+        """Wstrzymuje lub wznawia bieżącą operację"""
+        if self.file_jobs.paused:
+            self.file_jobs.resume()
+            self.job_pause_button.config(text="⏸ Pause")
+        else:
+            self.file_jobs.pause()
+            self.job_pause_button.config(text="▶ Resume")
+
+    def cancel_file_job(self):
+        """Anuluje bieżącą i oczekujące operacje"""
+        self.file_jobs.cancel()
+        self.job_pause_button.config(text="⏸ Pause")
 
     def rename_selected(self):
         """Zmienia nazwę zaznaczonego pliku/katalogu"""
@@ -570,9 +701,7 @@ class ModernSystemMonitorApp:
             messagebox.showwarning("Warning", "Please select only one item to rename")
             return
         
-        item = selection[0]
-        item_values = self.files_tree.item(item)['values']
-        old_name = item_values[0]
+        old_name = selection[0]  # iid wiersza to nazwa wpisu
         
         # Nie pozwól zmienić nazwy ..
         if old_name == "..":
@@ -639,8 +768,7 @@ class ModernSystemMonitorApp:
         """Otwiera zaznaczony plik/katalog"""
         selection = self.files_tree.selection()
         if selection:
-            item = self.files_tree.item(selection[0])
-            name = item['values'][0]
+            name = selection[0]  # iid wiersza to nazwa wpisu
             
             # Specjalna obsługa dla ..
             if name == "..":
@@ -650,8 +778,7 @@ class ModernSystemMonitorApp:
             clicked_path = self.current_path / name
             
             if clicked_path.is_dir():
-                self.current_path = clicked_path
-                self.load_directory()
+                self.navigate_to(clicked_path)
             else:
                 self.open_file(clicked_path)
 
@@ -714,7 +841,7 @@ class ModernSystemMonitorApp:
         self.auto_processes_button.grid(row=0, column=0, padx=2)
         
         action_buttons = [
-            ("🔄 Refresh", self.update_processes_data),
+            ("🔄 Refresh", self.refresh_processes_data),
             ("🔍 Search", self.search_processes),
             ("📊 Details", self.show_process_details),
             ("⏹️  Stop", self.stop_process),
@@ -768,6 +895,10 @@ class ModernSystemMonitorApp:
         
         self.processes_tree.pack(fill='both', expand=True, side=tk.LEFT)
         
+        # Konfiguruj kolory statusów
+        for color in ('running', 'sleeping', 'stopped', 'zombie'):
+            self.processes_tree.tag_configure(color, foreground=self.colors[f'process_{color}'])
+        
         # Podwójne kliknięcie dla szczegółów
         self.processes_tree.bind('<Double-1>', self.on_process_double_click)
         
@@ -776,21 +907,26 @@ class ModernSystemMonitorApp:
         self.processes_tree.configure(yscrollcommand=scrollbar_processes.set)
         scrollbar_processes.pack(side=tk.RIGHT, fill='y')
         
+        # Dane procesów w kolumnach po stronie Pythona; przy wielu procesach
+        # w widżecie materializowane są tylko widoczne wiersze (kluczowane (pid, create_time))
+        self.process_columns = {field: () for field in ProcessInfo._fields}
+        self.process_table = VirtualTable(self.processes_tree, scrollbar_processes, self.format_process_row)
+        
         # Pasek statusu
         self.process_status_label = ttk.Label(main_frame, text="Ready", style='Modern.TLabel')
         self.process_status_label.pack(fill='x', pady=(5, 0))
         
         # Załaduj dane procesów
-        self.update_processes_data()
+        self.scheduler.request('processes', self.update_processes_data)
 
     def toggle_auto_refresh_processes(self):
         """Przełącza automatyczne odświeżanie procesów"""
         if self.auto_refresh_processes:
             # Wyłącz automatyczne odświeżanie
             self.auto_refresh_processes = False
-            if self.process_refresh_id:
-                self.root.after_cancel(self.process_refresh_id)
-                self.process_refresh_id = None
+            if self.process_subscription:
+                self.scheduler.unsubscribe(self.process_subscription)
+                self.process_subscription = None
             self.auto_processes_button.config(text="▶️ Auto")
             self.process_status_label.config(text="Auto refresh disabled")
         else:
@@ -802,10 +938,10 @@ class ModernSystemMonitorApp:
 
     def start_auto_refresh_processes(self):
         """Rozpoczyna automatyczne odświeżanie procesów"""
-        if self.auto_refresh_processes:
-            self.update_processes_data()
-            # Zaplanuj kolejne odświeżanie za 2 sekundy
-            self.process_refresh_id = self.root.after(2000, self.start_auto_refresh_processes)
+        if self.auto_refresh_processes and not self.process_subscription:
+            # Harmonogram dostarcza procesy co 2 sekundy
+            self.process_subscription = self.scheduler.subscribe('processes', self.update_processes_data,
+                                                                 tab=self.processes_tab)
 
     def create_temperature_tab(self):
         """Tworzy zakładkę temperatury"""
@@ -836,7 +972,7 @@ class ModernSystemMonitorApp:
         ttk.Button(action_frame, 
                   text="🔄 Refresh Sensors", 
                   style='Modern.TButton',
-                  command=self.update_temperature_data).pack(side=tk.LEFT, padx=2)
+                  command=self.refresh_temperature_data).pack(side=tk.LEFT, padx=2)
         
         ttk.Button(action_frame, 
                   text="📊 Install lm-sensors", 
@@ -877,6 +1013,15 @@ class ModernSystemMonitorApp:
         
         self.temp_tree.pack(fill='both', expand=True, side=tk.LEFT)
         
+        # Konfiguruj kolory statusów
+        self.temp_tree.tag_configure('cool', foreground=self.colors['temp_cool'])
+        self.temp_tree.tag_configure('warm', foreground=self.colors['temp_warm'])
+        self.temp_tree.tag_configure('hot', foreground=self.colors['temp_hot'])
+        self.temp_tree.tag_configure('critical', foreground=self.colors['temp_critical'])
+        self.temp_sync = TreeReconciler(self.temp_tree)
+        self.temp_readings = None
+        self.temp_output_text = None
+        
         # Pasek przewijania
         scrollbar_temp = ttk.Scrollbar(temp_frame, orient=tk.VERTICAL, command=self.temp_tree.yview)
         self.temp_tree.configure(yscrollcommand=scrollbar_temp.set)
@@ -901,11 +1046,11 @@ class ModernSystemMonitorApp:
         scrollbar_output.pack(side=tk.RIGHT, fill='y')
         
         # Załaduj dane temperatury
-        self.update_temperature_data()
+        self.refresh_temperature_data()
 
     def create_network_tab(self):
         """Tworzy zakładkę Network"""
-        self.network_monitor = NetworkMonitor(self.network_tab, self.colors)
+        self.network_monitor = NetworkMonitor(self.network_tab, self.colors, self.scheduler)
 
     def create_system_info_tab(self):
         """Tworzy zakładkę System Info"""
@@ -920,9 +1065,9 @@ class ModernSystemMonitorApp:
         if self.auto_refresh_temp:
             # Wyłącz automatyczne odświeżanie
             self.auto_refresh_temp = False
-            if self.temp_refresh_id:
-                self.root.after_cancel(self.temp_refresh_id)
-                self.temp_refresh_id = None
+            if self.temp_subscription:
+                self.scheduler.unsubscribe(self.temp_subscription)
+                self.temp_subscription = None
             self.auto_button.config(text="▶️ Auto")
             self.sensors_status_label.config(text="Auto refresh disabled")
         else:
@@ -934,42 +1079,40 @@ class ModernSystemMonitorApp:
 
     def start_auto_refresh(self):
         """Rozpoczyna automatyczne odświeżanie temperatury"""
-        if self.auto_refresh_temp:
-            self.update_temperature_data()
-            # Zaplanuj kolejne odświeżanie za 1 sekundę
-            self.temp_refresh_id = self.root.after(1000, self.start_auto_refresh)
-
-    def update_data(self):
-        """Aktualizuje dane systemowe"""
-        try:
-            self.update_cpu_ram_data()
-            self.update_disk_data()
-        except Exception as e:
-            print(f"Error updating data: {e}")
-        
-        # Zaplanuj kolejną aktualizację po 2 sekundach
-        self.root.after(2000, self.update_data)
-
-    def update_cpu_ram_data(self):
-        """Aktualizuje dane CPU i RAM z poprawionym odczytem częstotliwości"""
-        # CPU Data
-        self.cpu_percent_per_core = psutil.cpu_percent(interval=0.1, percpu=True)
-        self.total_usage = psutil.cpu_percent(interval=0)
-        
-        physical_cores = psutil.cpu_count(logical=False)
-        logical_cores = psutil.cpu_count(logical=True)
-        
-        # POPRAWIONY ODCZYT CZĘSTOTLIWOŚCI CPU
-        cpu_freq = psutil.cpu_freq()
-        if cpu_freq:
-            # Sprawdź czy częstotliwość jest realistyczna (więcej niż 100 MHz)
-            if cpu_freq.current > 100:  # Większe niż 100 MHz
-                self.cpu_freq = int(cpu_freq.current)
-            else:
-                # Spróbuj alternatywnych metod odczytu częstotliwości
-                self.cpu_freq = self.get_cpu_frequency_alternative()
-        else:
-            self.cpu_freq = self.get_cpu_frequency_alternative()
+        if self.auto_refresh_temp and not self.temp_subscription:
+            # Harmonogram odczytuje czujniki co 1 sekundę
+            self.temp_subscription = self.scheduler.subscribe('sensors', self.update_temperature_data,
+                                                              tab=self.temperature_tab)
+
+    def refresh_temperature_data(self):
+        """Zleca jednorazowy odczyt czujników"""
+        self.scheduler.request('sensors', self.update_temperature_data)
+
+    def subscribe_system_data(self):
+        """Subskrybuje metryki zakładek CPU & RAM oraz Disk"""
+        self.scheduler.subscribe('cpu', self.update_cpu_data, tab=self.cpu_tab)
+        self.scheduler.subscribe('cpu_freq', self.update_cpu_freq, tab=self.cpu_tab)
+        self.scheduler.subscribe('memory', self.update_memory_data, tab=self.cpu_tab)
+        self.scheduler.subscribe('processes', self.update_process_list, tab=self.cpu_tab)
+        self.scheduler.subscribe('disks', self.update_disk_data, tab=self.disk_tab)
+
+    def refresh_system_data(self):
+        """Wymusza natychmiastowy odczyt danych systemowych"""
+        for metric in ('cpu', 'memory', 'processes', 'disks'):
+            self.scheduler.request(metric)
+
+    def update_cpu_freq(self, sample):
+        """Zapamiętuje częstotliwość CPU"""
+        self.cpu_freq = sample.value
+
+    def update_cpu_data(self, sample):
+        """Aktualizuje dane CPU z próbki harmonogramu"""
+        cpu = sample.value
+        self.cpu_percent_per_core = list(cpu.per_core)
+        self.total_usage = cpu.total
+        
+        physical_cores = cpu.physical_cores
+        logical_cores = cpu.logical_cores
         
         # Update CPU info
         cpu_info_text = (f"🖥️  CPU Usage: {self.total_usage:.1f}% | "
@@ -977,25 +1120,20 @@ class ModernSystemMonitorApp:
                         f"Frequency: {self.cpu_freq} MHz")
         self.cpu_info_label.config(text=cpu_info_text)
         
+        self.update_cpu_chart()
+
+    def update_memory_data(self, sample):
+        """Aktualizuje dane RAM i SWAP z próbki harmonogramu"""
         # RAM Data - zaawansowane obliczenia
-        ram = psutil.virtual_memory()
+        ram = sample.value.ram
         
         total_gb = ram.total / (1024 ** 3)
         
-        # Różne metody obliczania użycia RAM
-        # Metoda 1: Podobna do htop (total - available)
+        # Metoda podobna do htop (total - available)
+        # Zazwyczaj metoda htop-style jest bardziej precyzyjna niż ram.used
         used_htop = ram.total - ram.available
-        used_gb_htop = used_htop / (1024 ** 3)
-        percent_htop = (used_htop / ram.total) * 100
-        
-        # Metoda 2: Używana przez psutil
-        used_gb_psutil = ram.used / (1024 ** 3)
-        percent_psutil = ram.percent
-        
-        # Wybierz metodę która jest bliższa htop
-        # Zazwyczaj metoda htop-style jest bardziej precyzyjna
-        used_gb = used_gb_htop
-        ram_percent = percent_htop
+        used_gb = used_htop / (1024 ** 3)
+        ram_percent = (used_htop / ram.total) * 100
         
         # Update RAM info
         ram_text = f"💾 RAM: {used_gb:.1f} GB / {total_gb:.1f} GB ({ram_percent:.1f}%)"
@@ -1003,94 +1141,44 @@ class ModernSystemMonitorApp:
         self.ram_progress['value'] = ram_percent
         
         # SWAP Data
-        swap = psutil.swap_memory()
+        swap = sample.value.swap
         self.swap_usage = swap.used / (1024 ** 3)
         self.swap_total = swap.total / (1024 ** 3)
         self.swap_percent = swap.percent
         
         swap_text = f"🔄 SWAP: {self.swap_usage:.1f} GB / {self.swap_total:.1f} GB ({self.swap_percent:.1f}%)"
         self.swap_label.config(text=swap_text)
-        
-        # Update charts and process list
-        self.update_cpu_chart()
-        self.update_process_list()
-    def get_cpu_frequency_alternative(self):
-        """Alternatywne metody odczytu częstotliwości CPU gdy psutil zwraca błędne dane"""
-        try:
-            # Metoda 1: Odczyt z /proc/cpuinfo (Linux)
-            if os.path.exists('/proc/cpuinfo'):
-                with open('/proc/cpuinfo', 'r') as f:
-                    content = f.read()
-                    # Szukaj częstotliwości w kHz i konwertuj na MHz
-                    import re
-                    matches = re.findall(r'cpu MHz\s*:\s*(\d+\.\d+)', content)
-                    if matches:
-                        frequencies = [float(m) for m in matches]
-                        avg_freq = sum(frequencies) / len(frequencies)
-                        if avg_freq > 100:  # Tylko jeśli realistyczna wartość
-                            return int(avg_freq)
-            
-            # Metoda 2: Użyj lscpu (Linux)
-            try:
-                result = subprocess.run(['lscpu'], capture_output=True, text=True, timeout=2)
-                if result.returncode == 0:
-                    lines = result.stdout.split('\n')
-                    for line in lines:
-                        if 'CPU MHz:' in line:
-                            freq = float(line.split(':')[1].strip())
-                            if freq > 100:
-                                return int(freq)
-                        elif 'CPU max MHz:' in line:
-                            freq = float(line.split(':')[1].strip())
-                            if freq > 100:
-                                return int(freq)
-            except:
-                pass
-            
-            # Metoda 3: Spróbuj ponownie psutil z innym interwałem
-            time.sleep(0.1)
-            cpu_freq = psutil.cpu_freq()
-            if cpu_freq and cpu_freq.current > 100:
-                return int(cpu_freq.current)
-                
-            # Metoda 4: Domyślna wartość dla nowoczesnych procesorów
-            return 2000  # 2 GHz jako domyślna wartość
-            
-        except Exception as e:
-            print(f"Błąd odczytu częstotliwości CPU: {e}")
-            return 2000  # Fallback value
     
-    def update_cpu_chart(self):
-        """Aktualizuje wykres CPU - POPRAWIONA WERSJA"""
+    def cpu_usage_color(self, usage):
+        """Zwraca kolor słupka dla użycia rdzenia"""
+        if usage < 50:
+            return self.colors['success']
+        elif usage < 80:
+            return self.colors['warning']
+        return self.colors['danger']
+
+    def build_cpu_chart(self, core_count):
+        """Buduje wykres CPU od nowa (tylko gdy zmienia się liczba rdzeni)"""
         self.ax.clear()
+        self.cpu_blit.clear()
         
         # UŻYJ LICZB CAŁKOWITYCH dla rdzeni - KLUCZOWA ZMIANA
-        cores = list(range(len(self.cpu_percent_per_core)))
+        cores = list(range(core_count))
         
-        # Sprawdź czy mamy dane
-        if not self.cpu_percent_per_core:
-            print("Brak danych CPU do wyświetlenia")
-            return
-        
-        colors = [self.colors['success'] if usage < 50 
-                 else self.colors['warning'] if usage < 80 
-                 else self.colors['danger'] 
-                 for usage in self.cpu_percent_per_core]
-        
-        # Utwórz wykres słupkowy z POPRAWIONYMI etykietami
-        bars = self.ax.bar(cores, self.cpu_percent_per_core, color=colors, 
+        # Słupki startują od zera - wysokości ustawia update_cpu_chart
+        bars = self.ax.bar(cores, [0] * core_count, color=self.colors['success'], 
                           edgecolor='white', linewidth=0.5, width=0.8)
+        self.cpu_bars = [self.cpu_blit.add_artist(bar) for bar in bars]
         
-        # POPRAWIONE: Ustaw etykiety rdzeni jako liczby całkowite
         self.ax.set_xlabel('CPU Cores', color=self.colors['text'], fontsize=12)
         self.ax.set_ylabel('Usage (%)', color=self.colors['text'], fontsize=12)
-        self.ax.set_title(f'CPU Core Utilization - Total: {self.total_usage:.1f}%', 
-                         color=self.colors['text'], pad=20, fontsize=14)
+        self.cpu_title = self.cpu_blit.add_artist(
+            self.ax.set_title('CPU Core Utilization', color=self.colors['text'], pad=20, fontsize=14))
         self.ax.set_ylim(0, 100)
         
-        # POPRAWIONE: Ustaw poprawne etykiety na osi X
-        self.ax.set_xticks(cores)  # Ustaw ticki na pozycjach rdzeni
-        self.ax.set_xticklabels([f'Core {i}' for i in cores])  # Etykiety jako "Core 0", "Core 1", etc.
+        # Ustaw etykiety na osi X jako "Core 0", "Core 1", etc.
+        self.ax.set_xticks(cores)
+        self.ax.set_xticklabels([f'Core {i}' for i in cores])
         
         # Obracaj etykiety jeśli jest wiele rdzeni
         if len(cores) > 8:
@@ -1101,13 +1189,13 @@ class ModernSystemMonitorApp:
         # Customize ticks
         self.ax.tick_params(colors=self.colors['text_secondary'], labelsize=10)
         
-        # Add values on bars - POPRAWIONE pozycjonowanie
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            if height > 5:  # Tylko jeśli wartość jest widoczna
-                self.ax.text(bar.get_x() + bar.get_width()/2., height + 1,
-                            f'{height:.1f}%', ha='center', va='bottom', 
-                            fontsize=8, color=self.colors['text'], weight='bold')
+        # Etykiety wartości nad słupkami
+        self.cpu_bar_labels = []
+        for bar in bars:
+            label = self.ax.text(bar.get_x() + bar.get_width()/2., 1, '',
+                                 ha='center', va='bottom', 
+                                 fontsize=8, color=self.colors['text'], weight='bold')
+            self.cpu_bar_labels.append(self.cpu_blit.add_artist(label))
         
         # Dodaj informację o liczbie rdzeni
         physical_cores = psutil.cpu_count(logical=False)
@@ -1119,25 +1207,38 @@ class ModernSystemMonitorApp:
                         fontsize=9, color=self.colors['text_secondary'],
                         verticalalignment='top', bbox=dict(boxstyle='round', 
                         facecolor=self.colors['bg_light'], alpha=0.7))
+
+    def update_cpu_chart(self):
+        """Aktualizuje wykres CPU - zmienia tylko wysokości, kolory i etykiety"""
+        # Sprawdź czy mamy dane
+        if not self.cpu_percent_per_core:
+            print("Brak danych CPU do wyświetlenia")
+            return
+        
+        rebuild = len(self.cpu_bars) != len(self.cpu_percent_per_core)
+        if rebuild:
+            self.build_cpu_chart(len(self.cpu_percent_per_core))
         
-        self.canvas.draw()
+        for bar, label, usage in zip(self.cpu_bars, self.cpu_bar_labels, self.cpu_percent_per_core):
+            bar.set_height(usage)
+            bar.set_facecolor(self.cpu_usage_color(usage))
+            # Etykieta tylko jeśli wartość jest widoczna
+            label.set_y(usage + 1)
+            label.set_text(f'{usage:.1f}%' if usage > 5 else '')
+        
+        self.cpu_title.set_text(f'CPU Core Utilization - Total: {self.total_usage:.1f}%')
+        
+        if rebuild:
+            self.cpu_blit.redraw()
+        else:
+            self.cpu_blit.update()
 
-    def update_process_list(self):
+    def update_process_list(self, sample):
         """Aktualizuje listę procesów w zakładce CPU"""
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        processes = psutil.process_iter(attrs=['pid', 'name', 'cpu_percent'])
-        process_info = []
-        
-        for process in processes:
-            try:
-                cpu_percent = process.info['cpu_percent']
-                if cpu_percent > 0:
-                    process_info.append((process.info['pid'], process.info['name'], cpu_percent))
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        
+        process_info = [(p.pid, p.name, p.cpu) for p in sample.value if p.cpu > 0]
         process_info.sort(key=lambda x: x[2], reverse=True)
         
         for i in range(min(8, len(process_info))):
@@ -1154,39 +1255,33 @@ class ModernSystemMonitorApp:
         self.tree.tag_configure('medium', foreground=self.colors['warning'])
         self.tree.tag_configure('high', foreground=self.colors['danger'])
 
-    def update_disk_data(self):
+    def update_disk_data(self, sample):
         """Aktualizuje dane dysków"""
-        self.disk_usage = psutil.disk_partitions()
+        self.disk_usage = sample.value
         
         # Clear current list
         for item in self.disk_tree.get_children():
             self.disk_tree.delete(item)
         
         # Add partitions
-        for partition in self.disk_usage:
-            try:
-                usage = psutil.disk_usage(partition.mountpoint)
-                
-                total_gb = usage.total / (1024 ** 3)
-                used_gb = usage.used / (1024 ** 3)
-                free_gb = usage.free / (1024 ** 3)
-                percent = usage.percent
-                
-                # Determine color based on usage
-                tags = ('low',) if percent < 70 else ('medium',) if percent < 90 else ('high',)
-                
-                self.disk_tree.insert('', 'end', 
-                                    values=(partition.device, 
-                                           partition.mountpoint, 
-                                           partition.fstype,
-                                           f"{total_gb:.1f}G",
-                                           f"{used_gb:.1f}G", 
-                                           f"{free_gb:.1f}G",
-                                           f"{percent:.1f}%"),
-                                    tags=tags)
-                
-            except PermissionError:
-                continue
+        for disk in self.disk_usage:
+            total_gb = disk.total / (1024 ** 3)
+            used_gb = disk.used / (1024 ** 3)
+            free_gb = disk.free / (1024 ** 3)
+            percent = disk.percent
+            
+            # Determine color based on usage
+            tags = ('low',) if percent < 70 else ('medium',) if percent < 90 else ('high',)
+            
+            self.disk_tree.insert('', 'end', 
+                                values=(disk.device, 
+                                       disk.mountpoint, 
+                                       disk.fstype,
+                                       f"{total_gb:.1f}G",
+                                       f"{used_gb:.1f}G", 
+                                       f"{free_gb:.1f}G",
+                                       f"{percent:.1f}%"),
+                                tags=tags)
         
         # Configure tags
         self.disk_tree.tag_configure('low', foreground=self.colors['success'])
@@ -1203,23 +1298,19 @@ class ModernSystemMonitorApp:
         usage_percent = []
         colors = []
         
-        for partition in self.disk_usage:
-            try:
-                usage = psutil.disk_usage(partition.mountpoint)
-                device_name = partition.device.split('/')[-1]
-                devices.append(device_name)
-                usage_percent.append(usage.percent)
-                
-                # Color based on usage
-                if usage.percent > 90:
-                    colors.append(self.colors['danger'])
-                elif usage.percent > 70:
-                    colors.append(self.colors['warning'])
-                else:
-                    colors.append(self.colors['success'])
-                    
-            except (PermissionError, OSError):
-                continue
+        # Użycie dysków pochodzi z migawki - bez ponownego disk_usage
+        for disk in self.disk_usage:
+            device_name = disk.device.split('/')[-1]
+            devices.append(device_name)
+            usage_percent.append(disk.percent)
+            
+            # Color based on usage
+            if disk.percent > 90:
+                colors.append(self.colors['danger'])
+            elif disk.percent > 70:
+                colors.append(self.colors['warning'])
+            else:
+                colors.append(self.colors['success'])
         
         if devices:
             bars = self.ax_disk.bar(devices, usage_percent, color=colors, edgecolor='white', linewidth=0.5)
@@ -1297,133 +1388,196 @@ class ModernSystemMonitorApp:
         """Pokazuje ustawienia"""
         messagebox.showinfo("Settings", "Settings panel coming soon!\n\nCurrent features:\n- Dark theme\n- Real-time monitoring\n- Process management\n- File explorer\n- Temperature monitoring\n- System information")
 
-    def load_directory(self):
-        """Ładuje zawartość bieżącego katalogu z dodaniem .. dla katalogu nadrzędnego"""
+    def load_directory(self, use_cache=True):
+        """Ładuje zawartość bieżącego katalogu w tle (porcjami), z .. dla katalogu nadrzędnego.
+        
+        Niedawno oglądany katalog o niezmienionym mtime jest pokazywany od razu
+        z cache, a listowanie w tle tylko go weryfikuje.
+        """
+        # Listing zmieniony przez inotify trafia do cache dopiero teraz
+        if self.listing_dirty:
+            self.remember_listing()
+        
+        # Wyczyść poprzednią zawartość (anuluje też trwające listowanie)
+        self.files_tree.delete(*self.files_tree.get_children())
+        self.file_entries = {}
+        self.file_order = []
+        self.listing_key = (self.current_path, self.show_hidden)
+        self.revalidated_entries = None
+        self.path_var.set(str(self.current_path))
+        
+        # Dodaj .. tylko jeśli nie jesteśmy w root
+        if self.current_path.parent != self.current_path:
+            self.files_tree.insert('', 'end', iid='..',
+                                 values=("..", "📁 UP", "📁 Parent Directory", "", "drwxr-xr-x"),
+                                 tags=('parent',))
+        
+        # Obserwuj katalog od początku listowania, by nie zgubić zmian
+        self.directory_watcher.watch(self.current_path)
+        # mtime sprzed listowania - listing zapisany w cache nie będzie nowszy niż on
         try:
-            # Wyczyść poprzednią zawartość
-            for item in self.files_tree.get_children():
-                self.files_tree.delete(item)
-            
-            self.path_var.set(str(self.current_path))
-            
-            # Sprawdź czy katalog istnieje i jest dostępny
-            if not self.current_path.exists():
-                messagebox.showerror("Error", f"Directory does not exist: {self.current_path}")
-                return
-                
-            if not self.current_path.is_dir():
-                messagebox.showerror("Error", f"Path is not a directory: {self.current_path}")
-                return
-
-            # DODAJ .. DLA KATALOGU NADRZĘDNEGO - KLUCZOWA ZMIANA
-            items = []
-            
-            # Dodaj .. tylko jeśli nie jesteśmy w root
-            if self.current_path.parent != self.current_path:
-                items.append("..")  # Specjalny wpis dla katalogu nadrzędnego
-
+            self.listing_mtime = os.stat(self.current_path).st_mtime
+        except (OSError, PermissionError):
+            self.listing_mtime = None
+        
+        cached = self.listing_cache.get(self.current_path, self.show_hidden) if use_cache else None
+        if cached is not None:
+            for entry in cached:
+                self.upsert_file_row(entry)
+            self.on_directory_loaded()
+            self.revalidated_entries = {}
+            self.directory_scanner.scan(self.current_path, self.show_hidden,
+                                        self.on_revalidate_chunk,
+                                        self.on_revalidate_done,
+                                        self.on_directory_error)
+            return
+        
+        self.status_label.config(text=f"⏳ Loading: {self.current_path}")
+        self.directory_scanner.scan(self.current_path, self.show_hidden,
+                                    self.on_directory_chunk,
+                                    self.on_directory_loaded,
+                                    self.on_directory_error)
+
+    def remember_listing(self):
+        """Zapisuje bieżący listing w cache nawigacji"""
+        path, show_hidden = self.listing_key
+        self.listing_cache.put(path, show_hidden, self.listing_mtime, self.file_entries.values())
+        self.listing_dirty = False
+
+    def on_revalidate_chunk(self, entries):
+        """Zbiera wpisy weryfikującego listowania (widok już pokazany z cache)"""
+        self.revalidated_entries.update((entry.name, entry) for entry in entries)
+
+    def on_revalidate_done(self):
+        """Nanosi różnice między listingiem z cache a aktualnym stanem katalogu"""
+        fresh = self.revalidated_entries
+        self.revalidated_entries = None
+        for name in [name for name in self.file_entries if name not in fresh]:
+            del self.file_entries[name]
+            if self.files_tree.exists(name):
+                self.files_tree.delete(name)
+        for name, entry in fresh.items():
+            if self.file_entries.get(name) != entry:
+                self.upsert_file_row(entry)
+        self.on_directory_loaded()
+
+    def format_file_row(self, entry):
+        """Zwraca (values, tag) wiersza tabeli plików dla FileEntry"""
+        if entry.is_dir:
+            size = self.format_directory_size(entry.name)
+            file_type = "📁 Folder"
+            tag = 'dir'
+        else:
+            size = self.format_size(entry.size)
+            file_type = "📄 File"
+            tag = 'file'
+        modified = datetime.datetime.fromtimestamp(entry.mtime).strftime('%Y-%m-%d %H:%M')
+        return (entry.name, size, file_type, modified, self.get_permissions(entry.mode)), tag
+
+    def directory_size(self, name):
+        """Rozmiar podkatalogu bieżącego katalogu z indeksu (lub None)"""
+        return self.size_index.size_of(os.path.join(os.path.abspath(self.current_path), str(name)))
+
+    def format_directory_size(self, name):
+        """Tekst kolumny Size dla katalogu"""
+        size = self.directory_size(name)
+        return self.format_size(size) if size is not None else "📁 DIR"
+
+    def poll_directory_sizes(self):
+        """Uzupełnia rozmiary katalogów, gdy indeks w tle je policzy"""
+        self.size_poll_id = None
+        if self.size_index.version != self.size_index_version:
+            self.size_index_version = self.size_index.version
+            for name, entry in self.file_entries.items():
+                if entry.is_dir and self.files_tree.exists(name):
+                    size = self.format_directory_size(name)
+                    if self.files_tree.set(name, 'size') != size:
+                        self.files_tree.set(name, 'size', size)
+        if self.size_index.busy:
+            self.size_poll_id = self.root.after(500, self.poll_directory_sizes)
+
+    def upsert_file_row(self, entry):
+        """Dodaje wiersz wpisu lub aktualizuje istniejący"""
+        self.file_entries[entry.name] = entry
+        values, tag = self.format_file_row(entry)
+        if self.files_tree.exists(entry.name):
+            self.files_tree.item(entry.name, values=values, tags=(tag,))
+        else:
+            self.files_tree.insert('', 'end', iid=entry.name, values=values, tags=(tag,))
+
+    def on_directory_chunk(self, entries):
+        """Dodaje porcję wpisów z listowania w tle"""
+        for entry in entries:
+            self.upsert_file_row(entry)
+        self.status_label.config(text=f"⏳ Loading: {len(self.file_entries)} items | Path: {self.current_path}")
+
+    def on_directory_loaded(self):
+        """Po zakończeniu listowania: .., katalogi, potem pliki (bieżące sortowanie)"""
+        self.apply_file_order()
+        self.remember_listing()
+        
+        # Rozmiary katalogów: z zapisanego indeksu, potem aktualizacja w tle
+        self.size_index.request(self.current_path)
+        self.size_index_version = None
+        if self.size_poll_id is None:
+            self.poll_directory_sizes()
+        
+        dir_count = sum(1 for entry in self.file_entries.values() if entry.is_dir)
+        file_count = len(self.file_entries) - dir_count
+        self.status_label.config(text=f"📊 Folders: {dir_count} | Files: {file_count} | Path: {self.current_path}")
+
+    def on_directory_changed(self, names, rescan):
+        """Nanosi zmiany zgłoszone przez inotify jako małe różnice"""
+        if rescan:
+            self.load_directory()
+            return
+        
+        directory = str(self.current_path)
+        # W trakcie listowania kolejność ustali on_directory_loaded
+        ordered = self.directory_scanner.callbacks is None
+        key = self.file_sort_key(self.sort_column)
+        moved = []
+        for name in names:
+            if not self.show_hidden and name.startswith('.'):
+                continue
             try:
-                # Użyj listdir zamiast iterdir dla lepszej kompatybilności
-                for item_name in os.listdir(self.current_path):
-                    item_path = self.current_path / item_name
-                    
-                    # Sprawdź czy plik/katalog jest dostępny
-                    try:
-                        # Sprawdź dostępność przez próbę dostępu do metadanych
-                        item_path.stat()
-                        
-                        if not self.show_hidden and item_name.startswith('.'):
-                            continue
-                        items.append(item_path)
-                    except (OSError, PermissionError):
-                        # Pomijaj elementy do których nie ma dostępu
-                        continue
-                        
-            except (OSError, PermissionError) as e:
-                messagebox.showerror("Error", f"Cannot access directory: {e}")
-                return
-            
-            # Sortowanie: najpierw .., potem katalogi alfabetycznie, potem pliki alfabetycznie
-            directories = []
-            files = []
-            
-            for item in items:
-                if item == "..":
-                    # .. traktujemy jako specjalny katalog
-                    directories.insert(0, item)  # Zawsze na początku
-                    continue
-                    
-                try:
-                    if item.is_dir():
-                        directories.append(item)
-                    else:
-                        files.append(item)
-                except (OSError, PermissionError):
-                    # Pomijaj elementy do których stracono dostęp
-                    continue
-            
-            # Sortowanie alfabetyczne katalogów (oprócz .. które jest już na początku)
-            directories[1:] = sorted(directories[1:], key=lambda x: x.name.lower())
-            
-            # Sortowanie alfabetyczne plików
-            files.sort(key=lambda x: x.name.lower())
-            
-            # Połącz posortowane listy
-            sorted_items = directories + files
-            
-            # Dodaj elementy do treeview
-            for item in sorted_items:
-                try:
-                    if item == "..":
-                        # Specjalne traktowanie dla ..
-                        display_name = ".."
-                        size = "📁 UP"
-                        file_type = "📁 Parent Directory"
-                        modified = ""
-                        permissions = "drwxr-xr-x"  # Typowe uprawnienia dla katalogu
-                        
-                        self.files_tree.insert('', 'end', 
-                                             values=(display_name, size, file_type, modified, permissions),
-                                             tags=('parent',))
-                        
-                    else:
-                        stat = item.stat()
-                        size = self.format_size(stat.st_size) if item.is_file() else "📁 DIR"
-                        file_type = "📄 File" if item.is_file() else "📁 Folder"
-                        modified = datetime.datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                        permissions = self.get_permissions(stat.st_mode)
-                        
-                        # Użyj nazwy z path dla lepszej kompatybilności
-                        display_name = item.name
-                        
-                        self.files_tree.insert('', 'end', 
-                                             values=(display_name, size, file_type, modified, permissions),
-                                             tags=('file' if item.is_file() else 'dir'))
-                        
-                except (OSError, PermissionError) as e:
-                    # Jeśli nie można odczytać stat, pokaż podstawowe informacje
-                    if item == "..":
-                        display_name = ".."
-                    else:
-                        display_name = item.name
-                        
-                    self.files_tree.insert('', 'end', 
-                                         values=(display_name, "N/A", "Unknown", "N/A", "N/A"),
-                                         tags=('unknown',))
-                    continue
-            
-            # Konfiguruj tagi dla kolorów - DODAJ NOWY TAG DLA ..
-            self.files_tree.tag_configure('parent', foreground='#2196f3', font=('Arial', 10, 'bold'))  # Niebieski, pogrubiony
-            self.files_tree.tag_configure('dir', foreground='#4caf50')  # Zielony
-            self.files_tree.tag_configure('file', foreground='#ff9800')  # Pomarańczowo-żółty
-            self.files_tree.tag_configure('unknown', foreground='#9e9e9e')  # Szary dla nieznanych
-            
-            file_count = len(files)
-            dir_count = len([d for d in directories if d != ".."])  # Nie licz .. jako normalnego katalogu
+                entry = read_path(directory, name)
+            except FileNotFoundError:
+                # Usunięty lub przeniesiony
+                if self.file_entries.pop(name, None) is not None and ordered:
+                    self.file_order.remove(name)
+                if self.files_tree.exists(name):
+                    self.files_tree.delete(name)
+                continue
+            except (OSError, PermissionError):
+                continue
+            previous = self.file_entries.get(name)
+            self.upsert_file_row(entry)
+            # Przesuwany tylko nowy wpis lub taki, którego klucz sortowania się zmienił
+            if previous is None or previous.is_dir != entry.is_dir or key(previous) != key(entry):
+                moved.append(name)
+        
+        if ordered:
+            for name in moved:
+                self.place_file_row(name)
+            try:
+                self.listing_mtime = os.stat(self.current_path).st_mtime
+            except (OSError, PermissionError):
+                self.listing_mtime = None
+            self.listing_dirty = True
+            dir_count = sum(1 for entry in self.file_entries.values() if entry.is_dir)
+            file_count = len(self.file_entries) - dir_count
             self.status_label.config(text=f"📊 Folders: {dir_count} | Files: {file_count} | Path: {self.current_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Cannot load directory: {e}")
+
+    def on_directory_error(self, error):
+        """Błąd listowania katalogu"""
+        self.status_label.config(text=f"❌ Path: {self.current_path}")
+        if isinstance(error, FileNotFoundError):
+            messagebox.showerror("Error", f"Directory does not exist: {self.current_path}")
+        elif isinstance(error, NotADirectoryError):
+            messagebox.showerror("Error", f"Path is not a directory: {self.current_path}")
+        else:
+            messagebox.showerror("Error", f"Cannot access directory: {error}")
 
     def get_permissions(self, st_mode):
         """Zwraca uprawnienia w formacie tekstowym dla różnych systemów"""
@@ -1466,13 +1620,7 @@ class ModernSystemMonitorApp:
         """Obsługa podwójnego kliknięcia z uwzględnieniem .."""
         selection = self.files_tree.selection()
         if selection:
-            item = self.files_tree.item(selection[0])
-            values = item['values']
-            
-            if not values:  # Zabezpieczenie przed pustymi wartościami
-                return
-                
-            name = values[0]
+            name = selection[0]  # iid wiersza to nazwa wpisu
         
             # SPECJALNA OBSŁUGA DLA .. - KLUCZOWA ZMIANA
             if name == "..":
@@ -1485,8 +1633,7 @@ class ModernSystemMonitorApp:
                 # Sprawdź czy ścieżka istnieje
                 if clicked_path.exists():
                     if clicked_path.is_dir():
-                        self.current_path = clicked_path
-                        self.load_directory()
+                        self.navigate_to(clicked_path)
                     else:
                         self.open_file(clicked_path)
                 else:
@@ -1508,27 +1655,45 @@ class ModernSystemMonitorApp:
         except Exception as e:
             messagebox.showerror("Error", f"Cannot open file: {e}")
 
+    def navigate_to(self, path):
+        """Przechodzi do katalogu i zapisuje poprzedni w historii"""
+        if path != self.current_path:
+            self.back_history.append(self.current_path)
+            self.forward_history.clear()
+        self.current_path = path
+        self.load_directory()
+
     def go_back(self):
         """Powrót do poprzedniego katalogu z obsługą błędów"""
         try:
+            if self.back_history:
+                self.forward_history.append(self.current_path)
+                self.current_path = self.back_history.pop()
+                self.load_directory()
+                return
+            # Bez historii - do katalogu nadrzędnego
             parent = self.current_path.parent
             if parent != self.current_path:  # Zapobiegaj nieskończonej pętli
-                self.current_path = parent
-                self.load_directory()
+                self.navigate_to(parent)
         except Exception as e:
             messagebox.showerror("Error", f"Cannot go back: {e}")
 
     def go_forward(self):
-        """Do przodu"""
-        messagebox.showinfo("Info", "Forward navigation coming soon!")
+        """Do przodu - do katalogu opuszczonego przez go_back"""
+        try:
+            if self.forward_history:
+                self.back_history.append(self.current_path)
+                self.current_path = self.forward_history.pop()
+                self.load_directory()
+        except Exception as e:
+            messagebox.showerror("Error", f"Cannot go forward: {e}")
 
     def go_up(self):
         """Do katalogu nadrzędnego z obsługą błędów"""
         try:
             parent = self.current_path.parent
             if parent != self.current_path:
-                self.current_path = parent
-                self.load_directory()
+                self.navigate_to(parent)
         except Exception as e:
             messagebox.showerror("Error", f"Cannot go up: {e}")
 
@@ -1537,8 +1702,7 @@ class ModernSystemMonitorApp:
         try:
             home_path = Path.home()
             if home_path.exists() and home_path.is_dir():
-                self.current_path = home_path
-                self.load_directory()
+                self.navigate_to(home_path)
             else:
                 messagebox.showerror("Error", "Home directory not found or inaccessible")
         except Exception as e:
@@ -1554,8 +1718,7 @@ class ModernSystemMonitorApp:
                 new_path = new_path.expanduser()
             
             if new_path.exists() and new_path.is_dir():
-                self.current_path = new_path
-                self.load_directory()
+                self.navigate_to(new_path)
             else:
                 messagebox.showerror("Error", "Path does not exist or is not a directory")
                 
@@ -1569,52 +1732,212 @@ class ModernSystemMonitorApp:
             if directory:
                 new_path = Path(directory)
                 if new_path.exists() and new_path.is_dir():
-                    self.current_path = new_path
-                    self.load_directory()
+                    self.navigate_to(new_path)
         except Exception as e:
             messagebox.showerror("Error", f"Cannot browse directory: {e}")
 
     def refresh_files(self):
-        """Odświeża pliki"""
-        self.load_directory()
+        """Odświeża pliki (pełne listowanie, bez cache)"""
+        self.load_directory(use_cache=False)
 
     def find_large_files(self):
-        """Znajduje duże pliki"""
-        large_files = []
-        try:
-            for item in self.current_path.rglob('*'):
-                if item.is_file():
-                    try:
-                        size = item.stat().st_size
-                        if size > 100 * 1024 * 1024:  # 100 MB
-                            large_files.append((item, size))
-                    except (OSError, PermissionError):
-                        continue
+        """Znajduje duże pliki - skanowanie w tle z wynikami na bieżąco"""
+        window = tk.Toplevel(self.root)
+        window.title("Large Files")
+        window.geometry("700x500")
+        window.configure(bg=self.colors['bg'])
+        
+        # Ustawienia wyszukiwania
+        controls = ttk.Frame(window, style='Modern.TFrame')
+        controls.pack(fill='x', padx=10, pady=(10, 0))
+        
+        ttk.Label(controls, text="Min size (MB):", style='Modern.TLabel').pack(side=tk.LEFT)
+        threshold_var = tk.StringVar(value="100")
+        ttk.Entry(controls, textvariable=threshold_var, width=8, font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        
+        same_fs_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(controls, text="Stay on this filesystem", variable=same_fs_var,
+                       bg=self.colors['bg'], fg=self.colors['text'],
+                       selectcolor=self.colors['bg_light'],
+                       activebackground=self.colors['bg'],
+                       activeforeground=self.colors['text']).pack(side=tk.LEFT, padx=10)
+        
+        search_button = ttk.Button(controls, text="🔍 Search", style='Accent.TButton')
+        search_button.pack(side=tk.RIGHT)
+        
+        progress_label = ttk.Label(window, text="", style='Modern.TLabel')
+        progress_label.pack(fill='x', padx=10, pady=5)
+        
+        # Wyniki
+        result_frame = ttk.Frame(window, style='Modern.TFrame')
+        result_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        
+        tree = ttk.Treeview(result_frame, columns=('path', 'size'), show='headings')
+        tree.heading('path', text='Path')
+        tree.heading('size', text='Size')
+        tree.column('path', width=500)
+        tree.column('size', width=150)
+        tree.pack(fill='both', expand=True, side=tk.LEFT)
+        
+        scrollbar = ttk.Scrollbar(result_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill='y')
+        
+        sync = TreeReconciler(tree)
+        search_path = self.current_path
+        state = {'finder': None}
+        
+        def poll():
+            finder = state['finder']
+            if finder is None or not window.winfo_exists():
+                return
+            sync.sync([(path, (path, self.format_size(size)), ()) for size, path in finder.results()])
             
-            if large_files:
-                large_files.sort(key=lambda x: x[1], reverse=True)
-                
-                large_files_window = tk.Toplevel(self.root)
-                large_files_window.title("Large Files (>100 MB)")
-                large_files_window.geometry("700x500")
-                large_files_window.configure(bg=self.colors['bg'])
-                
-                tree = ttk.Treeview(large_files_window, columns=('path', 'size'), show='headings')
-                tree.heading('path', text='Path')
-                tree.heading('size', text='Size')
-                tree.column('path', width=500)
-                tree.column('size', width=150)
-                
-                for file_path, size in large_files[:50]:
-                    tree.insert('', 'end', values=(str(file_path), self.format_size(size)))
-                
-                tree.pack(fill='both', expand=True, padx=10, pady=10)
-                
+            progress = f"Folders: {finder.directories} | Files: {finder.files} | Found: {len(sync.order)}"
+            if not finder.done:
+                progress_label.config(text=f"⏳ {progress} | {finder.current}")
+                window.after(250, poll)
+                return
+            
+            search_button.config(text="🔍 Search")
+            if finder.error is not None:
+                progress_label.config(text=f"❌ Cannot search: {finder.error}")
+            elif finder.cancelled:
+                progress_label.config(text=f"⏹ Cancelled | {progress}")
+            elif not sync.order:
+                progress_label.config(text=f"✅ No files larger than {threshold_var.get()} MB found | {progress}")
             else:
-                messagebox.showinfo("Large Files", "No files larger than 100 MB found")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Error searching for large files: {e}")
+                progress_label.config(text=f"✅ Done | {progress}")
+        
+        def start():
+            try:
+                threshold = float(threshold_var.get()) * 1024 * 1024
+            except ValueError:
+                messagebox.showerror("Error", "Minimum size must be a number", parent=window)
+                return
+            sync.clear()
+            finder = LargeFileFinder(search_path, threshold, same_filesystem=same_fs_var.get())
+            state['finder'] = finder
+            finder.start()
+            search_button.config(text="⏹ Cancel")
+            window.title(f"Large Files - {search_path}")
+            poll()
+        
+        def toggle():
+            finder = state['finder']
+            if finder is not None and not finder.done:
+                finder.cancel()
+            else:
+                start()
+        
+        def close():
+            if state['finder'] is not None:
+                state['finder'].cancel()
+            window.destroy()
+        
+        search_button.config(command=toggle)
+        window.protocol("WM_DELETE_WINDOW", close)
+        start()
+
+    def open_file_search(self):
+        """Okno wyszukiwania nazw plików w indeksie wybranego katalogu"""
+        window = tk.Toplevel(self.root)
+        window.title("Search Files")
+        window.geometry("750x500")
+        window.configure(bg=self.colors['bg'])
+
+        # Katalog główny indeksu
+        root_frame = ttk.Frame(window, style='Modern.TFrame')
+        root_frame.pack(fill='x', padx=10, pady=(10, 0))
+        ttk.Label(root_frame, text="Index root:", style='Modern.TLabel').pack(side=tk.LEFT)
+        root_var = tk.StringVar(value=str(self.current_path))
+        ttk.Entry(root_frame, textvariable=root_var, font=('Arial', 10)).pack(side=tk.LEFT, fill='x', expand=True, padx=5)
+
+        # Pole zapytania
+        query_var = tk.StringVar()
+        query_entry = ttk.Entry(window, textvariable=query_var, font=('Arial', 12))
+        query_entry.pack(fill='x', padx=10, pady=10)
+
+        status_label = ttk.Label(window, text="", style='Modern.TLabel')
+        status_label.pack(fill='x', padx=10)
+
+        # Wyniki
+        result_frame = ttk.Frame(window, style='Modern.TFrame')
+        result_frame.pack(fill='both', expand=True, padx=10, pady=10)
+
+        tree = ttk.Treeview(result_frame, columns=('name', 'folder'), show='headings')
+        tree.heading('name', text='Name')
+        tree.heading('folder', text='Folder')
+        tree.column('name', width=250)
+        tree.column('folder', width=450)
+        tree.pack(fill='both', expand=True, side=tk.LEFT)
+
+        scrollbar = ttk.Scrollbar(result_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill='y')
+
+        sync = TreeReconciler(tree)
+        state = {'index': None}
+
+        def run_query(event=None):
+            index = state['index']
+            if index is None:
+                return
+            results = index.search(query_var.get())
+            sync.sync([(ident, (name, folder), ()) for ident, name, folder in results])
+
+        def poll():
+            index = state['index']
+            if index is None or not window.winfo_exists():
+                return
+            if index.error is not None:
+                status_label.config(text=f"❌ Cannot index: {index.error}")
+            elif index.busy:
+                status_label.config(text=f"⏳ Indexing {index.root} | Names: {len(index)}")
+            elif index.cancelled:
+                status_label.config(text=f"⏹ Indexing cancelled {index.root} | Names: {len(index)}")
+            else:
+                status_label.config(text=f"✅ Indexed {index.root} | Names: {len(index)}")
+            run_query()
+            if index.busy:
+                window.after(500, poll)
+
+        def build_index():
+            root = Path(root_var.get().strip()).expanduser()
+            if not root.is_dir():
+                messagebox.showerror("Error", "Path does not exist or is not a directory", parent=window)
+                return
+            # Zapisany indeks wczytywany od razu, potem przyrostowe skanowanie
+            index = self.search_indexes.get(str(root))
+            if index is None:
+                index = self.search_indexes[str(root)] = FilenameIndex(root)
+            if state['index'] is not None and state['index'] is not index:
+                state['index'].cancel()
+            state['index'] = index
+            # Trwające (lub przerwane przy zamknięciu okna) skanowanie zaczyna się od nowa
+            index.start()
+            poll()
+
+        def open_result(event):
+            selection = tree.selection()
+            if not selection:
+                return
+            name, folder = tree.item(selection[0])['values']
+            folder_path = Path(str(folder))
+            if folder_path.is_dir():
+                self.navigate_to(folder_path)
+
+        def close():
+            if state['index'] is not None:
+                state['index'].cancel()
+            window.destroy()
+
+        ttk.Button(root_frame, text="🔄 Index", style='Accent.TButton', command=build_index).pack(side=tk.RIGHT)
+        query_entry.bind('<KeyRelease>', run_query)
+        tree.bind('<Double-1>', open_result)
+        window.protocol("WM_DELETE_WINDOW", close)
+        query_entry.focus()
+        build_index()
 
     def toggle_hidden(self):
         """Przełącza ukryte pliki"""
@@ -1625,14 +1948,7 @@ class ModernSystemMonitorApp:
         """Pokazuje informacje o pliku z obsługą .."""
         selection = self.files_tree.selection()
         if selection:
-            item = self.files_tree.item(selection[0])
-            values = item['values']
-            
-            if not values:
-                messagebox.showwarning("Warning", "No file information available")
-                return
-                
-            name = values[0]
+            name = selection[0]  # iid wiersza to nazwa wpisu
         
             # SPECJALNA OBSŁUGA DLA ..
             if name == "..":
@@ -1680,8 +1996,7 @@ class ModernSystemMonitorApp:
         if selection:
             items_to_delete = []
             for item in selection:
-                item_values = self.files_tree.item(item)['values']
-                name = item_values[0]
+                name = item  # iid wiersza to nazwa wpisu
                 # Nie pozwól usunąć ..
                 if name == "..":
                     messagebox.showwarning("Warning", "Cannot delete parent directory")
@@ -1697,15 +2012,9 @@ class ModernSystemMonitorApp:
                 message = f"Are you sure you want to delete {len(items_to_delete)} items?"
             
             if messagebox.askyesno("Confirm", message):
-                try:
-                    for name, file_path in items_to_delete:
-                        if file_path.is_file():
-                            file_path.unlink()
-                        else:
-                            shutil.rmtree(file_path)
-                    self.load_directory()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Cannot delete: {e}")
+                # Usuwanie w tle - widok odświeżany raz, po zakończeniu
+                paths = [str(file_path) for name, file_path in items_to_delete]
+                self.submit_file_job(DeleteJob(paths, self.current_path))
         else:
             messagebox.showwarning("Warning", "Please select a file or folder to delete")
 
@@ -1716,141 +2025,95 @@ class ModernSystemMonitorApp:
         else:
             self.sort_column = column
             self.sort_reverse = False
-    
-        # Pobierz wszystkie elementy z treeview
-        all_items = []
-        for item in self.files_tree.get_children():
-            values = self.files_tree.item(item)['values']
-            is_parent = values[0] == ".."  # Sprawdź czy to ..
-            is_dir = values[2] == "📁 Folder" or values[2] == "📁 Parent Directory"  # Sprawdź czy to katalog
-            all_items.append((item, values, is_parent, is_dir))
-    
-        # Podziel na .., katalogi i pliki
-        parent_dir = [(item, values) for item, values, is_parent, is_dir in all_items if is_parent]
-        directories = [(item, values) for item, values, is_parent, is_dir in all_items if not is_parent and is_dir]
-        files = [(item, values) for item, values, is_parent, is_dir in all_items if not is_parent and not is_dir]
-    
-        # Sortuj katalogi (oprócz ..) według wybranej kolumny
-        if column == 'name':
-            directories.sort(key=lambda x: x[1][0].lower(), reverse=self.sort_reverse)
-        elif column == 'size':
-            directories.sort(key=lambda x: x[1][1], reverse=self.sort_reverse)
-        elif column == 'modified':
-            directories.sort(key=lambda x: x[1][3], reverse=self.sort_reverse)
-        elif column == 'permissions':
-            directories.sort(key=lambda x: x[1][4], reverse=self.sort_reverse)
-        else:
-            directories.sort(key=lambda x: x[1][0].lower(), reverse=self.sort_reverse)
-    
-        # Sortuj pliki według wybranej kolumny
-        if column == 'name':
-            files.sort(key=lambda x: x[1][0].lower(), reverse=self.sort_reverse)
-        elif column == 'size':
-            # Konwertuj rozmiar pliku na bajty dla poprawnego sortowania
-            def parse_size(size_str):
-                if size_str == "📁 DIR" or size_str == "📁 UP":
-                    return 0
-                size_map = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3, 'TB': 1024**4}
-                try:
-                    num, unit = size_str.split()
-                    num = float(num)
-                    return num * size_map.get(unit, 1)
-                except:
-                    return 0
-        
-            files.sort(key=lambda x: parse_size(x[1][1]), reverse=self.sort_reverse)
-        elif column == 'modified':
-            files.sort(key=lambda x: x[1][3], reverse=self.sort_reverse)
-        elif column == 'permissions':
-            files.sort(key=lambda x: x[1][4], reverse=self.sort_reverse)
-        else:
-            files.sort(key=lambda x: x[1][0].lower(), reverse=self.sort_reverse)
-    
-        # Połącz posortowane listy (najpierw .., potem katalogi, potem pliki)
-        sorted_items = parent_dir + directories + files
-    
-        # Wyczyść i dodaj posortowane elementy
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
-    
-        for item, values in sorted_items:
-            # Określ tag na podstawie typu
-            if values[0] == "..":
-                tag = 'parent'
-            elif values[2] == "📁 Folder" or values[2] == "📁 Parent Directory":
-                tag = 'dir'
+        self.apply_file_order()
+
+    def file_sort_key(self, column):
+        """Klucz sortowania na surowych danych FileEntry (bajty, mtime, tryb)"""
+        if column == 'size':
+            return lambda e: (self.directory_size(e.name) or 0) if e.is_dir else e.size
+        if column == 'modified':
+            return lambda e: e.mtime
+        if column == 'permissions':
+            return lambda e: stat.S_IMODE(e.mode)
+        return lambda e: e.name.lower()
+
+    def apply_file_order(self):
+        """Zmienia kolejność istniejących wierszy według modelu - bez ich przebudowy"""
+        key = self.file_sort_key(self.sort_column)
+        directories = [e for e in self.file_entries.values() if e.is_dir]
+        files = [e for e in self.file_entries.values() if not e.is_dir]
+        directories.sort(key=key, reverse=self.sort_reverse)
+        files.sort(key=key, reverse=self.sort_reverse)
+        
+        order = [entry.name for entry in directories]
+        order.extend(entry.name for entry in files)
+        if self.files_tree.exists('..'):
+            order.insert(0, '..')
+        
+        # Jedno wywołanie Tk - elementy (zaznaczenie, tagi) zostają zachowane
+        if list(self.files_tree.get_children()) != order:
+            self.files_tree.set_children('', *order)
+        self.file_order = order[1:] if order and order[0] == '..' else order
+
+    def place_file_row(self, name):
+        """Przesuwa jeden wiersz na miejsce wynikające z sortowania (wyszukiwanie binarne)"""
+        key = self.file_sort_key(self.sort_column)
+        entry = self.file_entries[name]
+        entry_key = key(entry)
+        order = self.file_order
+        old_index = order.index(name) if name in order else None
+        if old_index is not None:
+            del order[old_index]
+        
+        def goes_before(other_name):
+            other = self.file_entries[other_name]
+            if entry.is_dir != other.is_dir:
+                return entry.is_dir  # Katalogi przed plikami
+            other_key = key(other)
+            return entry_key > other_key if self.sort_reverse else entry_key < other_key
+        
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if goes_before(order[middle]):
+                high = middle
             else:
-                tag = 'file'
-            
-            self.files_tree.insert('', 'end', values=values, tags=(tag,))
+                low = middle + 1
+        order.insert(low, name)
+        if low != old_index:
+            offset = 1 if self.files_tree.exists('..') else 0
+            self.files_tree.move(name, '', low + offset)
 
     # Metody dla zakładki Processes
-    def update_processes_data(self):
+    def update_processes_data(self, sample=None):
         """Aktualizuje dane procesów"""
         try:
-            # Pobierz wszystkie procesy
-            processes = []
-            total_cpu = 0
-            status_count = {'running': 0, 'sleeping': 0, 'idle': 0, 'zombie': 0, 'other': 0}
-            
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 
-                                           'status', 'username', 'num_threads', 'create_time']):
-                try:
-                    process_info = proc.info
-                    
-                    # Konwertuj czas stworzenia
-                    create_time = datetime.datetime.fromtimestamp(process_info['create_time']).strftime('%H:%M:%S') if process_info['create_time'] else 'N/A'
-                    
-                    processes.append({
-                        'pid': process_info['pid'],
-                        'name': process_info['name'],
-                        'cpu': process_info['cpu_percent'] or 0,
-                        'memory': process_info['memory_percent'] or 0,
-                        'status': process_info['status'],
-                        'user': process_info['username'] or 'N/A',
-                        'threads': process_info['num_threads'] or 0,
-                        'create_time': create_time
-                    })
-                    
-                    total_cpu += process_info['cpu_percent'] or 0
-                    
-                    # Zlicz statusy
-                    status = process_info['status'].lower()
-                    if status in status_count:
-                        status_count[status] += 1
-                    else:
-                        status_count['other'] += 1
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-            
-            # Posortuj procesy
-            processes.sort(key=lambda x: x.get(self.process_sort_column, 0), 
-                          reverse=self.process_sort_reverse)
-            
-            # Wyczyść i wypełnij tabelę
-            for item in self.processes_tree.get_children():
-                self.processes_tree.delete(item)
+            if sample is None:
+                sample = self.scheduler.latest('processes')
+            if sample is None:
+                self.process_status_label.config(text="Collecting process data...")
+                return
             
-            for proc in processes:
-                status = proc['status']
-                status_color = self.get_status_color(status)
-                
-                self.processes_tree.insert('', 'end', 
-                                         values=(proc['pid'],
-                                                proc['name'][:30] + '...' if len(proc['name']) > 30 else proc['name'],
-                                                f"{proc['cpu']:.1f}",
-                                                f"{proc['memory']:.2f}",
-                                                status,
-                                                proc['user'][:15] if proc['user'] != 'N/A' else 'N/A',
-                                                proc['threads'],
-                                                proc['create_time']),
-                                         tags=(status_color,))
+            # Procesy z próbki harmonogramu zapisane kolumnowo
+            processes = sample.value
+            if processes:
+                self.process_columns = dict(zip(ProcessInfo._fields, zip(*processes)))
+            else:
+                self.process_columns = {field: () for field in ProcessInfo._fields}
+            columns = self.process_columns
+            keys = list(zip(columns['pid'], columns['create_time']))
+            self.process_table.set_data(keys, columns)
+            self.render_process_table()
             
-            # Konfiguruj kolory statusów
-            for status, color in [('running', 'running'), ('sleeping', 'sleeping'), 
-                                ('idle', 'stopped'), ('zombie', 'zombie')]:
-                self.processes_tree.tag_configure(color, foreground=self.colors[f'process_{color}'])
+            total_cpu = sum(columns['cpu'])
+            status_count = {'running': 0, 'sleeping': 0, 'idle': 0, 'zombie': 0, 'other': 0}
+            for status in columns['status']:
+                # Zlicz statusy
+                status = status.lower()
+                if status in status_count:
+                    status_count[status] += 1
+                else:
+                    status_count['other'] += 1
             
             # Aktualizuj statystyki
             self.total_processes_label.config(text=f"Total Processes: {len(processes)}")
@@ -1863,6 +2126,46 @@ class ModernSystemMonitorApp:
         except Exception as e:
             self.process_status_label.config(text=f"Error: {str(e)}")
 
+    def render_process_table(self):
+        """Filtruje i sortuje dane procesów, a następnie rysuje widoczne wiersze"""
+        columns = self.process_columns
+        
+        # Filtruj według pola wyszukiwania
+        predicate = None
+        search_term = self.process_search_var.get().lower()
+        if search_term:
+            names = columns['name']
+            pids = columns['pid']
+            predicate = lambda i: search_term in names[i].lower() or search_term in str(pids[i])
+        
+        self.process_table.apply_view(self.process_sort_column, self.process_sort_reverse, predicate)
+        self.process_table.render()
+
+    def format_process_row(self, index):
+        """Formatuje wiersz procesu (tylko dla wierszy materializowanych w tabeli)"""
+        columns = self.process_columns
+        name = columns['name'][index]
+        user = columns['user'][index]
+        status = columns['status'][index]
+        created = columns['create_time'][index]
+        
+        # Konwertuj czas stworzenia
+        create_time = datetime.datetime.fromtimestamp(created).strftime('%H:%M:%S') if created else 'N/A'
+        
+        values = (columns['pid'][index],
+                  name[:30] + '...' if len(name) > 30 else name,
+                  f"{columns['cpu'][index]:.1f}",
+                  f"{columns['memory'][index]:.2f}",
+                  status,
+                  user[:15] if user != 'N/A' else 'N/A',
+                  columns['threads'][index],
+                  create_time)
+        return values, (self.get_status_color(status),)
+
+    def refresh_processes_data(self):
+        """Zleca świeży odczyt procesów"""
+        self.scheduler.request('processes', self.update_processes_data)
+
     def get_status_color(self, status):
         """Zwraca kolor dla statusu procesu"""
         status = status.lower()
@@ -1885,32 +2188,13 @@ class ModernSystemMonitorApp:
             self.process_sort_column = column
             self.process_sort_reverse = True
         
-        self.update_processes_data()
+        # Sortowanie działa na danych kolumnowych, bez ponownego odczytu procesów
+        self.render_process_table()
 
     def on_process_search(self, event):
         """Filtruje procesy na podstawie wyszukiwania"""
-        search_term = self.process_search_var.get().lower()
-        
-        if not search_term:
-            # Pokaż wszystkie procesy jeśli wyszukiwanie jest puste
-            for item in self.processes_tree.get_children():
-                self.processes_tree.delete(item)
-            self.update_processes_data()
-            return
-        
-        # Filtruj widoczne procesy
-        for item in self.processes_tree.get_children():
-            values = self.processes_tree.item(item)['values']
-            process_name = values[1].lower() if len(values) > 1 else ''
-            pid = str(values[0]) if len(values) > 0 else ''
-            
-            if search_term in process_name or search_term in pid:
-                self.processes_tree.item(item, tags=())
-            else:
-                self.processes_tree.item(item, tags=('hidden',))
-        
-        # Ukryj niepasujące wiersze
-        self.processes_tree.tag_configure('hidden', foreground=self.colors['bg_light'])
+        # Filtr działa na danych kolumnowych, nie na elementach tabeli
+        self.render_process_table()
 
     def on_process_double_click(self, event):
         """Obsługa podwójnego kliknięcia na proces"""
@@ -1928,13 +2212,19 @@ class ModernSystemMonitorApp:
         item = self.processes_tree.item(selection[0])
         pid = item['values'][0]
         
+        # psutil >= 6 zmienił nazwę connections na net_connections
+        connections_attr = 'net_connections' if hasattr(psutil.Process, 'net_connections') else 'connections'
+        
         try:
-            process = psutil.Process(pid)
+            # Uchwyt z rejestru - CPU z ostatniego ticku, nie z nowego obiektu
+            record, process = self.scheduler.process_registry.get(pid)
             with process.oneshot():
-                info = process.as_dict(attrs=['name', 'cpu_percent', 'memory_percent', 
+                info = process.as_dict(attrs=['name', 'memory_percent', 
                                             'status', 'username', 'num_threads', 
                                             'create_time', 'memory_info', 'cpu_times',
-                                            'io_counters', 'connections', 'open_files'])
+                                            'io_counters', connections_attr, 'open_files'])
+                info['cpu_percent'] = record.cpu
+                info['connections'] = info[connections_attr]
                 
                 # Formatuj informacje
                 details = f"""
@@ -1982,10 +2272,10 @@ class ModernSystemMonitorApp:
         
         if messagebox.askyesno("Confirm Stop", f"Are you sure you want to stop process:\n{name} (PID: {pid})?"):
             try:
-                process = psutil.Process(pid)
+                record, process = self.scheduler.process_registry.get(pid)
                 process.suspend()
                 messagebox.showinfo("Success", f"Process {name} stopped successfully")
-                self.update_processes_data()
+                self.refresh_processes_data()
             except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
                 messagebox.showerror("Error", f"Cannot stop process: {e}")
 
@@ -2002,10 +2292,10 @@ class ModernSystemMonitorApp:
         
         if messagebox.askyesno("Confirm Kill", f"Are you sure you want to KILL process:\n{name} (PID: {pid})?\n\nThis action cannot be undone!"):
             try:
-                process = psutil.Process(pid)
+                record, process = self.scheduler.process_registry.get(pid)
                 process.terminate()
                 messagebox.showinfo("Success", f"Process {name} killed successfully")
-                self.update_processes_data()
+                self.refresh_processes_data()
             except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
                 messagebox.showerror("Error", f"Cannot kill process: {e}")
 
@@ -2029,16 +2319,17 @@ class ModernSystemMonitorApp:
         name = item['values'][1]
         
         try:
-            process = psutil.Process(pid)
+            record, process = self.scheduler.process_registry.get(pid)
             memory_mb = process.memory_info().rss / 1024 / 1024
-            cpu_percent = process.cpu_percent()
+            # Użycie CPU policzone przez rejestr z różnicy między tickami
+            cpu_percent = record.cpu
             
             resources_info = f"""
 📊 RESOURCE USAGE: {name} (PID: {pid})
 
 💻 CPU Usage: {cpu_percent:.1f}%
 💾 Memory Usage: {memory_mb:.1f} MB
-🎯 Status: {process.status()}
+🎯 Status: {record.status}
             """
             
             messagebox.showinfo("Resource Usage", resources_info)
@@ -2047,34 +2338,29 @@ class ModernSystemMonitorApp:
             messagebox.showerror("Error", f"Cannot get resource usage: {e}")
 
     # Metody dla zakładki Temperature
-    def update_temperature_data(self):
-        """Aktualizuje dane temperatury z czujników"""
+    def update_temperature_data(self, sample):
+        """Aktualizuje dane temperatury z próbki czujników"""
         try:
+            sensors = sample.value
+
+            # Zawieszony program sensors - poprzednie odczyty zostają w tabeli
+            if sensors.timed_out:
+                self.sensors_status_label.config(text="⚠️ sensors did not respond in time. Retrying shortly...")
+                return
+
             # Sprawdź czy sensors jest dostępne
-            result = subprocess.run(['which', 'sensors'], capture_output=True, text=True)
-            if result.returncode != 0:
+            if not sensors.available:
                 self.sensors_status_label.config(text="❌ lm-sensors not installed. Click 'Install lm-sensors' to install.")
                 self.clear_temperature_data()
                 return
-            
-            # Pobierz dane z czujników
-            sensors_result = subprocess.run(['sensors'], capture_output=True, text=True)
-            
-            if sensors_result.returncode != 0:
+
+            if sensors.returncode != 0:
                 self.sensors_status_label.config(text="❌ Error reading sensors. Try running 'sudo sensors-detect' first.")
                 self.clear_temperature_data()
                 return
-            
-            sensors_output = sensors_result.stdout
-            self.parse_sensors_data(sensors_output)
-            
-            # Aktualizuj status
-            if self.auto_refresh_temp:
-                status_text = f"✅ Auto refresh enabled - Last updated: {datetime.datetime.now().strftime('%H:%M:%S')}"
-            else:
-                status_text = f"✅ Last updated: {datetime.datetime.now().strftime('%H:%M:%S')}"
-            self.sensors_status_label.config(text=status_text)
-            
+
+            self.show_temperature_readings(sensors)
+
         except Exception as e:
             error_text = f"❌ Error: {str(e)}"
             if self.auto_refresh_temp:
@@ -2082,68 +2368,33 @@ class ModernSystemMonitorApp:
             self.sensors_status_label.config(text=error_text)
             self.clear_temperature_data()
 
-    def parse_sensors_data(self, sensors_output):
-        """Parsuje output z czujników i wyświetla w tabeli"""
-        # Wyczyść poprzednie dane
-        for item in self.temp_tree.get_children():
-            self.temp_tree.delete(item)
-        
-        # Wyświetl surowy output
-        self.sensors_output.delete(1.0, tk.END)
-        self.sensors_output.insert(1.0, sensors_output)
-        
-        lines = sensors_output.split('\n')
-        current_adapter = ""
-        sensor_count = 0
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Pomiń puste linie
-            if not line:
-                continue
-                
-            # Sprawdź czy to nowy adapter
-            if line.startswith('Adapter:'):
-                current_adapter = line
-                continue
-                
-            # Parsuj linię z temperaturą
-            if ':' in line and ('°C' in line or '°F' in line):
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    sensor_name = parts[0].strip()
-                    temp_data = parts[1].strip()
-                    
-                    # Ekstraktuj wartości temperatur
-                    current_temp = self.extract_temperature_value(temp_data, 'current')
-                    high_temp = self.extract_temperature_value(temp_data, 'high')
-                    crit_temp = self.extract_temperature_value(temp_data, 'crit')
-                    
-                    # Określ status na podstawie temperatury
-                    status, status_color = self.get_temperature_status(current_temp, high_temp, crit_temp)
-                    
-                    # Dodaj do tabeli
-                    full_sensor_name = f"{sensor_name}"
-                    if current_adapter:
-                        full_sensor_name += f" ({current_adapter})"
-                    
-                    self.temp_tree.insert('', 'end', 
-                                        values=(full_sensor_name,
-                                               f"{current_temp:.1f}" if current_temp is not None else "N/A",
-                                               f"{high_temp:.1f}" if high_temp is not None else "N/A",
-                                               f"{crit_temp:.1f}" if crit_temp is not None else "N/A",
-                                               status),
-                                        tags=(status_color,))
-                    sensor_count += 1
-        
-        # Konfiguruj kolory statusów
-        self.temp_tree.tag_configure('cool', foreground=self.colors['temp_cool'])
-        self.temp_tree.tag_configure('warm', foreground=self.colors['temp_warm'])
-        self.temp_tree.tag_configure('hot', foreground=self.colors['temp_hot'])
-        self.temp_tree.tag_configure('critical', foreground=self.colors['temp_critical'])
-        
+    def show_temperature_readings(self, sensors):
+        """Wyświetla odczyty w tabeli - komórki i tekst zmieniane tylko przy zmianie wartości"""
+        if sensors.output != self.temp_output_text:
+            self.temp_output_text = sensors.output
+            self.sensors_output.delete(1.0, tk.END)
+            self.sensors_output.insert(1.0, sensors.output)
+
+        if sensors.readings != self.temp_readings:
+            self.temp_readings = sensors.readings
+            rows = []
+            seen = {}
+            for reading in sensors.readings:
+                # Klucz: nazwa czujnika (+ numer, gdy nazwa się powtarza)
+                occurrence = seen.get(reading.sensor, 0)
+                seen[reading.sensor] = occurrence + 1
+                status, status_color = self.get_temperature_status(reading.current, reading.high, reading.critical)
+                rows.append(((reading.sensor, occurrence),
+                             (reading.sensor,
+                              f"{reading.current:.1f}" if reading.current is not None else "N/A",
+                              f"{reading.high:.1f}" if reading.high is not None else "N/A",
+                              f"{reading.critical:.1f}" if reading.critical is not None else "N/A",
+                              status),
+                             (status_color,)))
+            self.temp_sync.sync(rows)
+
         # Aktualizuj status
+        sensor_count = len(sensors.readings)
         if sensor_count > 0:
             base_text = f"✅ Found {sensor_count} temperature sensors"
             if self.auto_refresh_temp:
@@ -2153,40 +2404,6 @@ class ModernSystemMonitorApp:
         else:
             self.sensors_status_label.config(text="⚠️ No temperature sensors found. Try running 'sudo sensors-detect'")
 
-    def extract_temperature_value(self, temp_data, temp_type):
-        """Ekstraktuje wartość temperatury z tekstu"""
-        try:
-            # JAWNY IMPORT W FUNKCJI
-            import re
-            
-            if temp_type == 'current':
-                # Szukaj wzorca: +XX.X°C (np.: +45.0°C)
-                match = re.search(r'([+-]?\d+\.\d+)°C', temp_data)
-                if match:
-                    return float(match.group(1))
-                
-                # Alternatywny wzorzec
-                match = re.search(r'(\d+\.\d+)°C', temp_data)
-                if match:
-                    return float(match.group(1))
-                    
-            elif temp_type == 'high':
-                # Szukaj high temp (high = +YY.Y°C)
-                match = re.search(r'high\s*=\s*([+-]?\d+\.\d+)', temp_data)
-                if match:
-                    return float(match.group(1))
-                    
-            elif temp_type == 'crit':
-                # Szukaj critical temp (crit = +ZZ.Z°C)
-                match = re.search(r'crit\s*=\s*([+-]?\d+\.\d+)', temp_data)
-                if match:
-                    return float(match.group(1))
-                
-        except (ValueError, AttributeError):
-            pass
-        
-        return None
-
     def get_temperature_status(self, current_temp, high_temp, crit_temp):
         """Określa status temperatury na podstawie wartości"""
         if current_temp is None:
@@ -2203,11 +2420,14 @@ class ModernSystemMonitorApp:
 
     def clear_temperature_data(self):
         """Czyści dane temperatury"""
-        for item in self.temp_tree.get_children():
-            self.temp_tree.delete(item)
+        self.temp_sync.clear()
+        self.temp_readings = None
         
-        self.sensors_output.delete(1.0, tk.END)
-        self.sensors_output.insert(1.0, "No sensor data available.\n\nPlease install lm-sensors package and run 'sudo sensors-detect' to configure sensors.")
+        message = "No sensor data available.\n\nPlease install lm-sensors package and run 'sudo sensors-detect' to configure sensors."
+        if self.temp_output_text != message:
+            self.temp_output_text = message
+            self.sensors_output.delete(1.0, tk.END)
+            self.sensors_output.insert(1.0, message)
 
     def install_lm_sensors(self):
         """Instaluje pakiet lm-sensors"""
@@ -2236,6 +2456,8 @@ class ModernSystemMonitorApp:
                     process = subprocess.run(' '.join(cmd), shell=True, capture_output=True, text=True)
                     
                     if process.returncode == 0:
+                        # Program sensors pojawił się w PATH - ustal backend ponownie
+                        self.scheduler.sensors_backend.resolve()
                         messagebox.showinfo("Success", "lm-sensors installed successfully!\n\nNow run 'Detect Sensors' to configure sensors.")
                         self.sensors_status_label.config(text="✅ lm-sensors installed. Click 'Detect Sensors' to configure.")
                     else:
@@ -2268,7 +2490,7 @@ class ModernSystemMonitorApp:
             if process.returncode == 0:
                 messagebox.showinfo("Success", "Sensors detection completed!\n\nYou may need to reload modules or restart the system.")
                 self.sensors_status_label.config(text="✅ Sensors detection completed. Refreshing data...")
-                self.update_temperature_data()
+                self.refresh_temperature_data()
             else:
                 messagebox.showerror("Error", f"Sensors detection failed:\n{process.stderr}")
                 self.sensors_status_label.config(text="❌ Detection failed")
@@ -0,0 +1,53 @@
+class BlitManager:
+    """Odświeża wykres przez blitting - tło jest zapamiętywane po pełnym
+    rysowaniu, a przy aktualizacji rysowane są tylko animowane elementy.
+
+    Pełne rysowanie (np. po zmianie rozmiaru okna) wywołuje draw_event,
+    który zapisuje nowe tło.
+    """
+
+    def __init__(self, canvas, region=None):
+        self.canvas = canvas
+        self.region = region  # Obszar blittingu (bbox osi lub figury)
+        self.artists = []
+        self.background = None
+        self.cid = canvas.mpl_connect('draw_event', self.on_draw)
+
+    def get_region(self):
+        """Zwraca obszar blittingu"""
+        return self.region if self.region is not None else self.canvas.figure.bbox
+
+    def add_artist(self, artist):
+        """Dodaje animowany element rysowany przy każdej aktualizacji"""
+        artist.set_animated(True)
+        self.artists.append(artist)
+        return artist
+
+    def clear(self):
+        """Zapomina elementy i tło (przed przebudową wykresu)"""
+        self.artists = []
+        self.background = None
+
+    def on_draw(self, event):
+        """Zapisuje tło po pełnym rysowaniu i dorysowuje elementy animowane"""
+        self.background = self.canvas.copy_from_bbox(self.get_region())
+        self.draw_artists()
+
+    def draw_artists(self):
+        """Rysuje elementy animowane"""
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+
+    def redraw(self):
+        """Pełne rysowanie - np. po zmianie skali osi"""
+        self.canvas.draw()
+
+    def update(self):
+        """Odświeża tylko elementy animowane na zapamiętanym tle"""
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.get_region())
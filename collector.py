@@ -0,0 +1,375 @@
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+from netconn import ConnectionTable, SocketTraffic
+from netifs import InterfaceCache
+from processes import ProcessRegistry
+import sensors
+
+# Niezmienne próbki publikowane przez kolektor
+Sample = namedtuple('Sample', ['timestamp', 'value'])
+CpuSample = namedtuple('CpuSample', ['per_core', 'total', 'physical_cores', 'logical_cores'])
+MemorySample = namedtuple('MemorySample', ['ram', 'swap'])
+NetSample = namedtuple('NetSample', ['total', 'pernic'])
+DiskInfo = namedtuple('DiskInfo', ['device', 'mountpoint', 'fstype', 'total', 'used', 'free', 'percent'])
+
+PHYSICAL_CORES = psutil.cpu_count(logical=False) or 0
+LOGICAL_CORES = psutil.cpu_count(logical=True) or 0
+
+
+class TickContext:
+    """Pamięć podręczna jednego ticku - każde wywołanie systemowe wykonywane raz"""
+
+    def __init__(self, timestamp, scheduler):
+        self.timestamp = timestamp
+        self.scheduler = scheduler  # Źródła danych współdzielone przez metryki
+        self._cache = {}
+
+    def get(self, key, func, *args, **kwargs):
+        """Zwraca wynik func(*args) obliczony co najwyżej raz w tym ticku"""
+        if key not in self._cache:
+            self._cache[key] = func(*args, **kwargs)
+        return self._cache[key]
+
+
+def read_cpu_frequency():
+    """Odczytuje częstotliwość CPU w MHz z metodami zapasowymi"""
+    try:
+        cpu_freq = psutil.cpu_freq()
+        if cpu_freq and cpu_freq.current > 100:  # Większe niż 100 MHz
+            return int(cpu_freq.current)
+
+        # Metoda 1: Odczyt z /proc/cpuinfo (Linux)
+        if os.path.exists('/proc/cpuinfo'):
+            with open('/proc/cpuinfo', 'r') as f:
+                matches = re.findall(r'cpu MHz\s*:\s*(\d+\.\d+)', f.read())
+                if matches:
+                    frequencies = [float(m) for m in matches]
+                    avg_freq = sum(frequencies) / len(frequencies)
+                    if avg_freq > 100:  # Tylko jeśli realistyczna wartość
+                        return int(avg_freq)
+
+        # Metoda 2: Użyj lscpu (Linux)
+        try:
+            result = subprocess.run(['lscpu'], capture_output=True, text=True, timeout=2)
+            if result.returncode == 0:
+                for line in result.stdout.split('\n'):
+                    if 'CPU MHz:' in line or 'CPU max MHz:' in line:
+                        freq = float(line.split(':')[1].strip())
+                        if freq > 100:
+                            return int(freq)
+        except:
+            pass
+
+        # Metoda 3: Domyślna wartość dla nowoczesnych procesorów
+        return 2000  # 2 GHz jako domyślna wartość
+
+    except Exception as e:
+        print(f"Błąd odczytu częstotliwości CPU: {e}")
+        return 2000  # Fallback value
+
+
+def sample_cpu(ctx):
+    """Próbka użycia CPU (per rdzeń i całkowite)"""
+    return CpuSample(per_core=tuple(psutil.cpu_percent(interval=None, percpu=True)),
+                     total=psutil.cpu_percent(interval=None),
+                     physical_cores=PHYSICAL_CORES,
+                     logical_cores=LOGICAL_CORES)
+
+
+def sample_cpu_freq(ctx):
+    """Próbka częstotliwości CPU"""
+    return read_cpu_frequency()
+
+
+def sample_memory(ctx):
+    """Próbka RAM i SWAP"""
+    return MemorySample(ram=psutil.virtual_memory(), swap=psutil.swap_memory())
+
+
+def sample_disks(ctx):
+    """Zwraca użycie partycji - jedno wywołanie disk_usage na partycję"""
+    disks = []
+    for partition in psutil.disk_partitions():
+        try:
+            usage = psutil.disk_usage(partition.mountpoint)
+        except (PermissionError, OSError):
+            continue
+        disks.append(DiskInfo(partition.device, partition.mountpoint, partition.fstype,
+                              usage.total, usage.used, usage.free, usage.percent))
+    return tuple(disks)
+
+
+def sample_network(ctx):
+    """Liczniki sieciowe - suma wyliczana z jednego odczytu per interfejs"""
+    pernic = ctx.get('net_io_pernic', psutil.net_io_counters, pernic=True)
+    counters = list(pernic.values())
+    if counters:
+        total = type(counters[0])(*[sum(field) for field in zip(*counters)])
+    else:
+        total = psutil.net_io_counters()
+    return NetSample(total=total, pernic=pernic)
+
+
+def sample_net_if(ctx):
+    """Adresy i parametry interfejsów (z pamięci, dopóki netlink nie zgłosi zmiany)"""
+    return ctx.scheduler.interface_cache.sample()
+
+
+def sample_processes(ctx):
+    """Zwraca listę procesów z rejestru (jeden odczyt i delty CPU na tick)"""
+    return ctx.scheduler.process_registry.sample()
+
+
+def sample_connections(ctx):
+    """Tabela połączeń sieciowych (PID tylko, gdy widok go potrzebuje)"""
+    return ctx.scheduler.connection_table.read()
+
+
+def sample_process_traffic(ctx):
+    """Przyrosty ruchu TCP per proces od poprzedniego odczytu"""
+    return ctx.scheduler.socket_traffic.sample(ctx.timestamp)
+
+
+def sample_sensors(ctx):
+    """Odczyt czujników temperatury (None, dopóki program sensors jeszcze działa)"""
+    return ctx.scheduler.sensors_backend.read()
+
+
+# Domyślne metryki: nazwa -> (funkcja próbkująca, interwał w sekundach)
+DEFAULT_METRICS = {
+    'cpu': (sample_cpu, 1.0),
+    'cpu_freq': (sample_cpu_freq, 5.0),
+    'memory': (sample_memory, 2.0),
+    'disks': (sample_disks, 2.0),
+    'net': (sample_network, 1.0),
+    'net_if': (sample_net_if, 1.0),
+    'processes': (sample_processes, 2.0),
+    'sensors': (sample_sensors, 1.0),
+    'connections': (sample_connections, 2.0),
+    'process_net': (sample_process_traffic, 2.0),
+}
+
+
+class Subscription:
+    """Subskrypcja metryki dostarczana w wątku Tk"""
+
+    def __init__(self, metric, callback, tab=None, once=False):
+        self.metric = metric
+        self.callback = callback
+        self.tab = tab  # Ścieżka zakładki notebooka lub None (zawsze aktywna)
+        self.once = once
+        self.version = 0
+
+
+class Metric:
+    """Metryka próbkowana przez harmonogram"""
+
+    def __init__(self, name, sampler, every):
+        self.name = name
+        self.sampler = sampler
+        self.every = every  # Co ile ticków
+        self.pending = False
+        self.version = 0
+        self.sample = None
+
+
+class SamplingScheduler:
+    """Wspólny harmonogram próbkowania z interwałami per metryka.
+
+    Wątek kolektora próbkuje tylko metryki, które mają subskrybentów, na
+    wspólnej podstawie czasu (tickach). Wywołania psutil współdzielone
+    przez kilka metryk wykonywane są raz na tick (TickContext). Jedna
+    pętla after() w wątku Tk dostarcza nowe próbki subskrybentom.
+
+    Subskrypcje przypisane do zakładki są aktywne tylko, gdy zakładka jest
+    widoczna, a okno nie jest zminimalizowane. Metryki bez aktywnych
+    subskrybentów nie są próbkowane; ukryte zakładki dostają ostatnią
+    próbkę od razu po ponownym pokazaniu.
+
+    Harmonogram tworzy też źródła danych trzymające zasoby (gniazda
+    netlink, deskryptory sysfs) - import modułu niczego nie otwiera.
+    Próbkuje je tylko wątek kolektora; wątek Tk sięga do nich przez
+    atrybuty harmonogramu.
+    """
+
+    def __init__(self, root, tick=0.5):
+        self.root = root
+        self.tick = tick
+        # Wspólny rejestr procesów
+        self.process_registry = ProcessRegistry()
+        # Backend czujników ustalany raz przy starcie (nie co sekundę)
+        self.sensors_backend = sensors.select_backend()
+        # Tabela połączeń sieciowych z pamięcią właścicieli gniazd (i-węzeł -> PID)
+        self.connection_table = ConnectionTable()
+        # Ruch TCP per proces (liczniki tcp_info z NETLINK_SOCK_DIAG)
+        self.socket_traffic = SocketTraffic(self.connection_table)
+        # Adresy i parametry interfejsów - odczytywane ponownie tylko po zmianie
+        self.interface_cache = InterfaceCache()
+        self.metrics = {}
+        self.subscriptions = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pump_id = None
+        self.visible_tab = None
+        self.minimized = False
+
+        for name, (sampler, interval) in DEFAULT_METRICS.items():
+            self.register(name, sampler, interval)
+
+    def register(self, name, sampler, interval):
+        """Rejestruje metrykę z interwałem zaokrąglonym do wielokrotności ticku"""
+        every = max(1, int(round(interval / self.tick)))
+        with self._lock:
+            self.metrics[name] = Metric(name, sampler, every)
+
+    def subscribe(self, metric, callback, tab=None):
+        """Subskrybuje metrykę - callback(sample) wywoływany w wątku Tk.
+
+        Jeśli podano tab, callback (np. rysowanie wykresu) jest wstrzymany,
+        dopóki zakładka nie jest widoczna.
+        """
+        subscription = Subscription(metric, callback, tab=str(tab) if tab is not None else None)
+        with self._lock:
+            self.subscriptions.append(subscription)
+            # Nowy subskrybent dostaje ostatnią próbkę albo świeży odczyt
+            metric_obj = self.metrics[metric]
+            if metric_obj.sample is None and self.is_active(subscription):
+                metric_obj.pending = True
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Anuluje subskrypcję"""
+        with self._lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+
+    def request(self, metric, callback=None):
+        """Wymusza odczyt metryki w następnym ticku (opcjonalnie jednorazowy callback)"""
+        with self._lock:
+            metric_obj = self.metrics[metric]
+            metric_obj.pending = True
+            if callback is not None:
+                subscription = Subscription(metric, callback, once=True)
+                subscription.version = metric_obj.version
+                self.subscriptions.append(subscription)
+
+    def set_visible_tab(self, tab):
+        """Ustawia widoczną zakładkę (wywoływane z <<NotebookTabChanged>>)"""
+        with self._lock:
+            self.visible_tab = str(tab) if tab else None
+            self._refresh_active_metrics()
+        self._deliver()
+
+    def set_minimized(self, minimized):
+        """Wstrzymuje wszystkie zakładki, gdy okno jest zminimalizowane"""
+        with self._lock:
+            if self.minimized == minimized:
+                return
+            self.minimized = minimized
+            self._refresh_active_metrics()
+        self._deliver()
+
+    def is_active(self, subscription):
+        """Czy subskrypcja powinna teraz otrzymywać próbki"""
+        if subscription.once or subscription.tab is None:
+            return True
+        return not self.minimized and subscription.tab == self.visible_tab
+
+    def _refresh_active_metrics(self):
+        # Metryki wznowionych zakładek odczytaj w najbliższym ticku
+        for subscription in self.subscriptions:
+            if self.is_active(subscription) and subscription.tab is not None:
+                self.metrics[subscription.metric].pending = True
+
+    def latest(self, metric):
+        """Zwraca ostatnią próbkę metryki (lub None)"""
+        with self._lock:
+            return self.metrics[metric].sample
+
+    def start(self):
+        """Uruchamia wątek kolektora i pętlę dostarczania w Tk"""
+        # Pierwsze wywołanie cpu_percent(None) tylko inicjalizuje liczniki
+        psutil.cpu_percent(interval=None, percpu=True)
+        psutil.cpu_percent(interval=None)
+
+        self._thread = threading.Thread(target=self._run, name='SamplingScheduler', daemon=True)
+        self._thread.start()
+        self._pump()
+
+    def stop(self):
+        """Zatrzymuje wątek kolektora i pętlę dostarczania"""
+        self._stop_event.set()
+        if self._pump_id:
+            self.root.after_cancel(self._pump_id)
+            self._pump_id = None
+
+    def _run(self):
+        start = time.monotonic()
+        tick = 0
+        while not self._stop_event.is_set():
+            self._run_tick(tick)
+            tick += 1
+            delay = start + tick * self.tick - time.monotonic()
+            if delay < 0:
+                # Pomiń zaległe ticki, aby zachować wyrównanie do podstawy czasu
+                skipped = int(-delay // self.tick) + 1
+                tick += skipped
+                delay += skipped * self.tick
+            if self._stop_event.wait(delay):
+                break
+
+    def _run_tick(self, tick):
+        """Próbkuje metryki należne w danym ticku"""
+        with self._lock:
+            wanted = {s.metric for s in self.subscriptions if self.is_active(s)}
+            due = [m for m in self.metrics.values()
+                   if m.pending or (m.name in wanted and tick % m.every == 0)]
+            for metric in due:
+                metric.pending = False
+
+        if not due:
+            return
+
+        ctx = TickContext(time.time(), self)
+        for metric in due:
+            try:
+                value = metric.sampler(ctx)
+            except Exception as e:
+                print(f"Error sampling {metric.name}: {e}")
+                continue
+            if value is None:
+                continue  # Odczyt jeszcze w toku - brak nowej próbki
+            with self._lock:
+                metric.sample = Sample(ctx.timestamp, value)
+                metric.version += 1
+
+    def _pump(self):
+        """Pętla dostarczania próbek w wątku Tk"""
+        self._deliver()
+        self._pump_id = self.root.after(int(self.tick * 1000), self._pump)
+
+    def _deliver(self):
+        """Dostarcza nowe próbki aktywnym subskrybentom"""
+        with self._lock:
+            deliveries = []
+            for subscription in self.subscriptions:
+                metric = self.metrics[subscription.metric]
+                if metric.version > subscription.version and self.is_active(subscription):
+                    subscription.version = metric.version
+                    deliveries.append((subscription, metric.sample))
+            delivered_once = {id(s) for s, _ in deliveries if s.once}
+            self.subscriptions = [s for s in self.subscriptions if id(s) not in delivered_once]
+
+        for subscription, sample in deliveries:
+            try:
+                subscription.callback(sample)
+            except Exception as e:
+                print(f"Error updating {subscription.metric}: {e}")
@@ -0,0 +1,207 @@
+import os
+from bisect import bisect_left
+import sqlite3
+import threading
+
+
+def default_index_path():
+    """Ścieżka pliku indeksu w katalogu cache użytkownika"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'SystemMonitor', 'dirsizes.db')
+
+
+class DirectorySizeIndex:
+    """Trwały indeks sumarycznych rozmiarów katalogów (jak cache du).
+
+    Dla każdego katalogu zapisuje w SQLite mtime, rozmiar własnych plików
+    i rozmiar całego poddrzewa. Aktualizacja działa w wątku tła: katalog,
+    którego mtime się nie zmienił, nie jest ponownie listowany (jego pliki
+    nie są statowane), sprawdzane są tylko podkatalogi. Indeks nie
+    przekracza granic systemu plików; wiersze zapisane dla innego
+    urządzenia (st_dev) są ignorowane.
+
+    Uwaga: mtime katalogu nie zmienia się, gdy plik rośnie w miejscu, więc
+    rozmiar własnych plików odświeża się dopiero po dodaniu/usunięciu wpisu.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_index_path()
+        self.sizes = {}  # ścieżka -> rozmiar poddrzewa (bajty)
+        self.version = 0
+        self.root = None
+        self.busy = False
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self._thread = None
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            with self.connect() as db:
+                db.execute("""CREATE TABLE IF NOT EXISTS dirs (
+                                  path TEXT PRIMARY KEY,
+                                  parent TEXT,
+                                  dev INTEGER,
+                                  mtime REAL,
+                                  own_size INTEGER,
+                                  total_size INTEGER)""")
+        except (OSError, sqlite3.Error):
+            # Brak miejsca na indeks - działaj tylko w pamięci
+            self.db_path = None
+
+    def connect(self):
+        """Nowe połączenie (każdy wątek używa własnego)"""
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def size_of(self, path):
+        """Rozmiar poddrzewa katalogu lub None, jeśli jeszcze nieznany"""
+        with self.lock:
+            return self.sizes.get(os.fspath(path))
+
+    def request(self, path):
+        """Zapewnia (w tle) aktualne rozmiary dla poddrzewa path"""
+        path = os.path.abspath(os.fspath(path))
+        root = self.root
+        if self.busy and root is not None and (path == root or path.startswith(root.rstrip(os.sep) + os.sep)):
+            return  # Bieżąca aktualizacja już obejmuje ten katalog
+        self.cancel()
+        self.cancel_event = threading.Event()
+        self.root = path
+        self.busy = True
+        self._thread = threading.Thread(target=self._run, args=(path, self.cancel_event), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Przerywa trwającą aktualizację (ukończone poddrzewa zostają zapisane)"""
+        self.cancel_event.set()
+
+    def _publish(self, sizes):
+        with self.lock:
+            self.sizes.update(sizes)
+            self.version += 1
+
+    def _forget(self, paths):
+        with self.lock:
+            for path in paths:
+                self.sizes.pop(path, None)
+            self.version += 1
+
+    def _load(self, db, root, dev):
+        """Wczytuje zapisane wiersze poddrzewa (tylko dla tego urządzenia)"""
+        rows = {}
+        if db is None:
+            return rows
+        prefix = root.rstrip(os.sep) + os.sep
+        # Zakres [prefix, prefix z ostatnim znakiem +1) pokrywa wszystkie potomne ścieżki
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        query = "SELECT path, parent, mtime, own_size, total_size FROM dirs WHERE dev = ? AND (path = ? OR (path >= ? AND path < ?))"
+        for path, parent, mtime, own_size, total_size in db.execute(query, (dev, root, prefix, upper)):
+            rows[path] = (parent, mtime, own_size, total_size)
+        return rows
+
+    def _scan(self, path, dev):
+        """Listuje katalog: rozmiar własnych plików i podkatalogi (ten sam system plików)"""
+        own_size = 0
+        children = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.stat(follow_symlinks=False).st_dev == dev:
+                            children.append(entry.path)
+                    else:
+                        own_size += entry.stat(follow_symlinks=False).st_size
+                except (OSError, PermissionError):
+                    continue
+        return own_size, children
+
+    def _run(self, root, cancel_event):
+        db = None
+        try:
+            dev = os.stat(root).st_dev
+            if self.db_path is not None:
+                db = self.connect()
+            cached = self._load(db, root, dev)
+            self._publish({path: row[3] for path, row in cached.items()})
+            self._update(db, root, dev, cached, cancel_event)
+        except (OSError, PermissionError, sqlite3.Error):
+            pass
+        finally:
+            if db is not None:
+                db.close()
+            if cancel_event is self.cancel_event:
+                self.busy = False
+                with self.lock:
+                    self.version += 1
+
+    def _update(self, db, root, dev, cached, cancel_event):
+        """Aktualizuje poddrzewo w kolejności post-order (bez rekurencji)"""
+        children_of = {}
+        for path, row in cached.items():
+            children_of.setdefault(row[0], []).append(path)
+
+        root_parent = os.path.dirname(root)
+        stack = [(root, root_parent if root_parent != root else None, False)]
+        pending = {}   # ścieżka -> (rodzic, mtime, own_size, dzieci)
+        totals = {}
+        updates = []
+        removed = []
+
+        while stack:
+            if cancel_event.is_set():
+                break
+            path, parent, expanded = stack.pop()
+            if not expanded:
+                try:
+                    st = os.lstat(path)
+                    row = cached.get(path)
+                    if row is not None and row[1] == st.st_mtime:
+                        # Katalog bez zmian - nie listuj plików, sprawdź tylko podkatalogi
+                        own_size, children = row[2], children_of.get(path, [])
+                    else:
+                        own_size, children = self._scan(path, dev)
+                        kept = set(children)
+                        removed.extend(child for child in children_of.get(path, []) if child not in kept)
+                except (OSError, PermissionError):
+                    totals[path] = 0
+                    continue
+                pending[path] = (parent, st.st_mtime, own_size, children)
+                stack.append((path, parent, True))
+                stack.extend((child, path, False) for child in children)
+            else:
+                parent, mtime, own_size, children = pending.pop(path)
+                total = own_size + sum(totals.pop(child, 0) for child in children)
+                totals[path] = total
+                row = cached.get(path)
+                if row != (parent, mtime, own_size, total):
+                    updates.append((path, parent, dev, mtime, own_size, total))
+                    self._publish({path: total})
+                if len(updates) >= 500:
+                    self._store(db, updates, [])
+                    updates = []
+
+        self._store(db, updates, removed)
+
+    def _store(self, db, updates, removed):
+        """Zapisuje zmienione wiersze i usuwa zniknięte poddrzewa"""
+        if removed:
+            # Migawka pod blokadą - inny wątek może właśnie publikować rozmiary
+            with self.lock:
+                paths = sorted(self.sizes)
+            forgotten = []
+            for gone in removed:
+                # Potomkowie gone leżą w posortowanej liście tuż za prefiksem
+                prefix = gone + os.sep
+                index = bisect_left(paths, gone)
+                if index < len(paths) and paths[index] == gone:
+                    forgotten.append(gone)
+                index = bisect_left(paths, prefix, index)
+                while index < len(paths) and paths[index].startswith(prefix):
+                    forgotten.append(paths[index])
+                    index += 1
+            self._forget(forgotten)
+        if db is None:
+            return
+        with db:
+            db.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?)", updates)
+            for gone in removed:
+                db.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                           (gone, gone + os.sep, gone + chr(ord(os.sep) + 1)))
@@ -0,0 +1,639 @@
+import errno
+import heapq
+import os
+import queue
+import shutil
+import stat
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Surowy rekord wpisu katalogu - jeden stat na wpis
+FileEntry = namedtuple('FileEntry', ['name', 'is_dir', 'size', 'mtime', 'mode'])
+
+
+def read_entry(entry):
+    """Buduje FileEntry z DirEntry (jedno wywołanie stat, wynik cache'owany)"""
+    st = entry.stat()
+    return FileEntry(entry.name, stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime, st.st_mode)
+
+
+def read_path(directory, name):
+    """Buduje FileEntry dla nazwy w katalogu (jedno wywołanie stat)"""
+    st = os.stat(os.path.join(directory, name))
+    return FileEntry(name, stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime, st.st_mode)
+
+
+class ListingCache:
+    """LRU ostatnio oglądanych listingów katalogów.
+
+    Wpis jest ważny, dopóki mtime katalogu się nie zmienił (dodanie,
+    usunięcie lub zmiana nazwy wpisu). Zmian wewnątrz plików mtime
+    katalogu nie wykrywa - dlatego po trafieniu listing jest i tak
+    weryfikowany w tle.
+    """
+
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.items = OrderedDict()  # (ścieżka, ukryte) -> (mtime, wpisy)
+
+    def get(self, path, show_hidden):
+        """Zwraca wpisy z cache lub None, jeśli brak lub nieaktualne"""
+        key = (os.fspath(path), show_hidden)
+        item = self.items.get(key)
+        if item is None:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime
+        except (OSError, PermissionError):
+            mtime = None
+        if mtime != item[0]:
+            del self.items[key]
+            return None
+        self.items.move_to_end(key)
+        return item[1]
+
+    def put(self, path, show_hidden, mtime, entries):
+        """Zapamiętuje listing odczytany przy danym mtime katalogu"""
+        if mtime is None:
+            return
+        key = (os.fspath(path), show_hidden)
+        self.items[key] = (mtime, tuple(entries))
+        self.items.move_to_end(key)
+        while len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+
+
+class DirectoryScanner:
+    """Listuje katalog w wątku roboczym przez os.scandir.
+
+    Wyniki trafiają do kolejki i są przekazywane porcjami w wątku Tk
+    (pętla after()), więc pierwsze wiersze pojawiają się od razu. Każde
+    nowe skanowanie unieważnia poprzednie (numer generacji) - przejście
+    do innego katalogu przerywa trwające listowanie.
+    """
+
+    def __init__(self, root, chunk_size=200, chunk_interval=0.1, poll_ms=50):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.chunk_interval = chunk_interval
+        self.poll_ms = poll_ms
+        self.generation = 0
+        self.queue = queue.Queue()
+        self.callbacks = None
+        self._after_id = None
+
+    def scan(self, path, show_hidden, on_chunk, on_done, on_error):
+        """Rozpoczyna listowanie katalogu (anuluje poprzednie)"""
+        self.cancel()
+        generation = self.generation
+        self.callbacks = (generation, on_chunk, on_done, on_error)
+        thread = threading.Thread(target=self._worker, args=(generation, path, show_hidden), daemon=True)
+        thread.start()
+        self._schedule()
+        return generation
+
+    def cancel(self):
+        """Przerywa bieżące skanowanie i porzuca jego wyniki"""
+        self.generation += 1
+        self.callbacks = None
+
+    def is_cancelled(self, generation):
+        """Czy skanowanie o danej generacji zostało anulowane"""
+        return generation != self.generation
+
+    def _worker(self, generation, path, show_hidden):
+        """Wątek roboczy - czyta wpisy i wysyła je porcjami"""
+        chunk = []
+        last_flush = time.monotonic()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if self.is_cancelled(generation):
+                        return
+                    if not show_hidden and entry.name.startswith('.'):
+                        continue
+                    try:
+                        chunk.append(read_entry(entry))
+                    except (OSError, PermissionError):
+                        # Pomijaj elementy do których nie ma dostępu
+                        continue
+                    now = time.monotonic()
+                    if len(chunk) >= self.chunk_size or now - last_flush >= self.chunk_interval:
+                        self.queue.put((generation, 'chunk', chunk))
+                        chunk = []
+                        last_flush = now
+        except (OSError, PermissionError) as e:
+            self.queue.put((generation, 'error', e))
+            return
+        if chunk:
+            self.queue.put((generation, 'chunk', chunk))
+        self.queue.put((generation, 'done', None))
+
+    def _schedule(self):
+        """Planuje odbiór wyników w wątku Tk"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Przekazuje zebrane porcje do callbacków bieżącego skanowania"""
+        self._after_id = None
+        while True:
+            try:
+                generation, kind, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if self.callbacks is None or generation != self.callbacks[0]:
+                continue  # Wyniki anulowanego skanowania
+            _, on_chunk, on_done, on_error = self.callbacks
+            if kind == 'chunk':
+                on_chunk(payload)
+            else:
+                self.callbacks = None
+                if kind == 'done':
+                    on_done()
+                else:
+                    on_error(payload)
+        if self.callbacks is not None:
+            self._schedule()
+
+
+def walk_tree(root, on_file, cancelled, workers=4, same_filesystem=False, on_directory=None,
+              cached_subdirs=None):
+    """Przechodzi drzewo katalogów kilkoma wątkami (os.scandir).
+
+    Nie podąża za dowiązaniami symbolicznymi; z same_filesystem=True nie
+    wchodzi w punkty montowania innych systemów plików. on_file(entry) i
+    on_directory(path, entries, subdirs) wywoływane są z wątków roboczych.
+    cached_subdirs(path) może zwrócić zapamiętaną listę podkatalogów
+    niezmienionego katalogu - wtedy nie jest on listowany ponownie.
+    Funkcja blokuje do końca przejścia lub anulowania (cancelled() -> True).
+    Wyjątek z wywołania zwrotnego przerywa przejście i jest zgłaszany
+    ponownie w wątku wywołującym.
+    """
+    root = os.fspath(root)
+    root_dev = os.stat(root).st_dev if same_filesystem else None
+    directories = queue.Queue()
+    directories.put(root)
+    errors = []
+
+    def scan_directory(path):
+        if cached_subdirs is not None:
+            subdirs = cached_subdirs(path)
+            if subdirs is not None:
+                for subdir in subdirs:
+                    directories.put(subdir)
+                return
+
+        entries = []
+        subdirs = []
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    if cancelled():
+                        return
+                    entries.append(entry)
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if root_dev is not None and entry.stat(follow_symlinks=False).st_dev != root_dev:
+                                continue
+                            directories.put(entry.path)
+                            subdirs.append(entry.path)
+                        elif on_file is not None and entry.is_file(follow_symlinks=False):
+                            on_file(entry)
+                    except (OSError, PermissionError):
+                        continue
+        except (OSError, PermissionError):
+            return
+        if on_directory is not None:
+            on_directory(path, entries, subdirs)
+
+    def worker():
+        while True:
+            path = directories.get()
+            try:
+                if path is None:
+                    return
+                if not errors and not cancelled():
+                    scan_directory(path)
+            except Exception as e:
+                # Wątek zostaje, by opróżnić kolejkę - join() nie może zawisnąć
+                errors.append(e)
+            finally:
+                directories.task_done()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    # Podkatalogi są dodawane przed task_done() rodzica, więc join() czeka na całe drzewo
+    directories.join()
+    for _ in threads:
+        directories.put(None)
+    if errors:
+        raise errors[0]
+
+
+class LargeFileFinder:
+    """Szuka największych plików w tle.
+
+    Pliki nie mniejsze niż threshold trafiają do ograniczonego kopca
+    top-N; results() i postęp można odczytywać w trakcie skanowania.
+    """
+
+    def __init__(self, path, threshold, limit=50, same_filesystem=True, workers=4):
+        self.path = path
+        self.threshold = threshold
+        self.limit = limit
+        self.same_filesystem = same_filesystem
+        self.workers = workers
+        self.heap = []
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.directories = 0
+        self.files = 0
+        self.current = ''
+        self.error = None
+        self.done = False
+
+    def start(self):
+        """Uruchamia skanowanie w wątku tła"""
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def cancel(self):
+        """Przerywa skanowanie"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _run(self):
+        try:
+            walk_tree(self.path, self._on_file, self.cancel_event.is_set,
+                      workers=self.workers, same_filesystem=self.same_filesystem,
+                      on_directory=self._on_directory)
+        except (OSError, PermissionError) as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def _on_file(self, entry):
+        size = entry.stat(follow_symlinks=False).st_size
+        with self.lock:
+            self.files += 1
+            if size < self.threshold:
+                return
+            if len(self.heap) < self.limit:
+                heapq.heappush(self.heap, (size, entry.path))
+            elif size > self.heap[0][0]:
+                heapq.heapreplace(self.heap, (size, entry.path))
+
+    def _on_directory(self, path, entries, subdirs):
+        with self.lock:
+            self.directories += 1
+            self.current = path
+
+    def results(self):
+        """Znalezione pliki (rozmiar, ścieżka) od największego"""
+        with self.lock:
+            return sorted(self.heap, reverse=True)
+
+
+# Rozmiar porcji kopiowania - między porcjami obsługiwana jest pauza i anulowanie
+COPY_CHUNK = 8 * 1024 * 1024
+
+# Błędy, po których wracamy do wolniejszej metody kopiowania
+ZERO_COPY_FALLBACK = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF)
+
+
+class JobCancelled(Exception):
+    """Zadanie przerwane przez użytkownika"""
+
+
+class FileJobQueue:
+    """Kolejka zadań plikowych wykonywanych po kolei w wątku tła.
+
+    Zadanie ma metodę run(jobs) i wywołuje jobs.checkpoint() między
+    porcjami pracy - tam obsługiwane są pauza i anulowanie. Zakończone
+    zadania (z ewentualnym błędem) trafiają do kolejki finished, którą
+    odbiera wątek Tk.
+    """
+
+    def __init__(self):
+        self.pending = queue.Queue()
+        self.finished = queue.Queue()
+        self.current = None
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, job):
+        """Dodaje zadanie do kolejki"""
+        self.pending.put(job)
+        # Jeden długo żyjący wątek - czeka na kolejne zadania w get()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+
+    def active(self):
+        """Czy jest zadanie w toku lub w kolejce"""
+        # Licznik zadań nieodebranych i niezakończonych (bez luki między get() a current)
+        return self.pending.unfinished_tasks > 0
+
+    @property
+    def paused(self):
+        return not self.resume_event.is_set()
+
+    def pause(self):
+        """Wstrzymuje bieżące zadanie"""
+        if self.current is not None and not self.paused:
+            self.current.pause_started = time.monotonic()
+            self.resume_event.clear()
+
+    def resume(self):
+        """Wznawia wstrzymane zadanie"""
+        job = self.current
+        if job is not None and self.paused:
+            job.paused_for += time.monotonic() - job.pause_started
+        self.resume_event.set()
+
+    def cancel(self):
+        """Anuluje bieżące i oczekujące zadania"""
+        self.cancel_event.set()
+        self.resume()
+
+    def checkpoint(self):
+        """Punkt kontrolny zadania - czeka w pauzie, zgłasza anulowanie"""
+        self.resume_event.wait()
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def _worker(self):
+        while True:
+            job = self.pending.get()
+            if self.cancel_event.is_set():
+                job.cancelled = True
+                self.finished.put(job)
+                if self.pending.empty():
+                    self.cancel_event.clear()
+                self.pending.task_done()
+                continue
+            self.current = job
+            job.started = time.monotonic()
+            try:
+                job.run(self)
+            except JobCancelled:
+                job.cancelled = True
+            except Exception as e:
+                # Każdy błąd (też np. RecursionError na bardzo głębokim drzewie)
+                # kończy tylko zadanie - jedyny wątek roboczy musi przetrwać
+                job.error = e
+            finally:
+                self.current = None
+                if self.pending.empty():
+                    self.cancel_event.clear()
+                self.finished.put(job)
+                self.pending.task_done()
+
+
+class FileJob:
+    """Wspólny stan postępu zadania plikowego"""
+
+    title = "Working"
+
+    # Czy system pozwala na operacje względem deskryptora katalogu
+    USE_DIR_FD = (os.unlink in os.supports_dir_fd and os.rmdir in os.supports_dir_fd
+                  and os.open in os.supports_dir_fd and os.scandir in os.supports_fd)
+
+    # Czy usuwane wpisy liczą się do postępu (usuwanie tak, sprzątanie po przeniesieniu nie)
+    count_removed = True
+
+    def __init__(self, destination):
+        self.destination = destination  # Katalog do odświeżenia po zakończeniu
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.items_done = 0
+        self.current_name = ''
+        self.started = None
+        self.paused_for = 0.0
+        self.pause_started = 0.0
+        self.cancelled = False
+        self.error = None
+
+    def remove_path(self, path, jobs):
+        """Usuwa plik lub katalog rekurencyjnie, z punktami kontrolnymi.
+
+        Katalogi są przechodzone przez os.scandir na deskryptorze katalogu,
+        a wpisy usuwane względem niego (unlink/rmdir z dir_fd) - bez
+        ponownego rozwiązywania pełnych ścieżek i bez podążania za
+        dowiązaniami.
+        """
+        jobs.checkpoint()
+        self.current_name = os.path.basename(path)
+        st = os.lstat(path)
+        if stat.S_ISDIR(st.st_mode):
+            self.remove_directory(path, None, jobs)
+        else:
+            os.unlink(path)
+            if self.count_removed:
+                self.bytes_done += st.st_size
+        if self.count_removed:
+            self.items_done += 1
+
+    def remove_directory(self, name, parent_fd, jobs):
+        """Usuwa zawartość katalogu, a potem sam katalog"""
+        if self.USE_DIR_FD:
+            fd = os.open(name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=parent_fd)
+            try:
+                self.remove_contents(fd, fd, jobs)
+            finally:
+                os.close(fd)
+            os.rmdir(name, dir_fd=parent_fd)
+        else:
+            self.remove_contents(name, None, jobs)
+            os.rmdir(name)
+
+    def remove_contents(self, directory, dir_fd, jobs):
+        """Usuwa wpisy katalogu (directory to deskryptor lub ścieżka)"""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                jobs.checkpoint()
+                # Z dir_fd wpisy adresowane są nazwą względem katalogu
+                target = entry.name if dir_fd is not None else entry.path
+                if entry.is_dir(follow_symlinks=False):
+                    self.remove_directory(target, dir_fd, jobs)
+                else:
+                    size = entry.stat(follow_symlinks=False).st_size
+                    os.unlink(target, dir_fd=dir_fd)
+                    if self.count_removed:
+                        self.bytes_done += size
+                if self.count_removed:
+                    self.items_done += 1
+
+    def rate(self):
+        """Średnia prędkość w bajtach/s (bez czasu pauzy)"""
+        if self.started is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started - self.paused_for
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    def eta(self):
+        """Szacowany pozostały czas w sekundach (lub None)"""
+        rate = self.rate()
+        if rate <= 0 or self.bytes_total <= self.bytes_done:
+            return None
+        return (self.bytes_total - self.bytes_done) / rate
+
+
+class TransferJob(FileJob):
+    """Kopiowanie lub przenoszenie listy (źródło, cel).
+
+    Przenoszenie w obrębie jednego systemu plików to pojedyncze
+    os.rename. W pozostałych przypadkach dane kopiowane są bez udziału
+    przestrzeni użytkownika (copy_file_range, potem sendfile), a gdy
+    jądro tego nie obsługuje - przez pread/pwrite.
+    """
+
+    # Postęp to skopiowane dane, nie sprzątanie źródła po przeniesieniu
+    count_removed = False
+
+    def __init__(self, operation, pairs, destination):
+        super().__init__(destination)
+        self.operation = operation  # 'copy' lub 'move'
+        self.pairs = pairs
+        self.title = "Moving" if operation == 'move' else "Copying"
+
+    def run(self, jobs):
+        for source, target in self.pairs:
+            if os.path.lexists(target) and os.path.samefile(source, target):
+                raise shutil.SameFileError(f"'{source}' and '{target}' are the same file")
+            try:
+                inside = os.path.commonpath([os.path.abspath(source), os.path.abspath(target)]) == os.path.abspath(source)
+            except ValueError:
+                inside = False  # Różne dyski (Windows) - ścieżki niepowiązane
+            if inside:
+                raise shutil.Error(f"Cannot copy '{source}' into itself")
+
+        remaining = []
+        for source, target in self.pairs:
+            jobs.checkpoint()
+            if self.operation == 'move':
+                try:
+                    os.rename(source, target)  # O(1) w obrębie systemu plików
+                    self.items_done += 1
+                    continue
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.ENOTEMPTY, errno.EEXIST):
+                        raise
+            remaining.append((source, target))
+
+        for source, _ in remaining:
+            self.bytes_total += self.measure(source, jobs)
+
+        for source, target in remaining:
+            self.copy_path(source, target, jobs)
+            if self.operation == 'move':
+                # Źródło usuwane dopiero po udanym skopiowaniu (z pauzą i anulowaniem)
+                self.remove_path(source, jobs)
+
+    def measure(self, path, jobs):
+        """Sumaryczny rozmiar plików do skopiowania"""
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode):
+            return st.st_size if stat.S_ISREG(st.st_mode) else 0
+        total = 0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                jobs.checkpoint()
+                total += self.measure(entry.path, jobs)
+        return total
+
+    def copy_path(self, source, target, jobs):
+        """Kopiuje plik, dowiązanie lub katalog (rekurencyjnie, z łączeniem)"""
+        jobs.checkpoint()
+        self.current_name = os.path.basename(source)
+        st = os.lstat(source)
+        if stat.S_ISLNK(st.st_mode):
+            if os.path.lexists(target):
+                os.unlink(target)
+            os.symlink(os.readlink(source), target)
+        elif stat.S_ISDIR(st.st_mode):
+            os.makedirs(target, exist_ok=True)
+            with os.scandir(source) as entries:
+                for entry in entries:
+                    self.copy_path(entry.path, os.path.join(target, entry.name), jobs)
+            shutil.copystat(source, target)
+        else:
+            self.copy_file(source, target, jobs)
+            shutil.copystat(source, target)
+        self.items_done += 1
+
+    def copy_file(self, source, target, jobs):
+        """Kopiuje dane pliku porcjami (zero-copy, jeśli jądro pozwala)"""
+        try:
+            with open(source, 'rb') as fsrc, open(target, 'wb') as fdst:
+                infd, outfd = fsrc.fileno(), fdst.fileno()
+                methods = [self._pread_pwrite]
+                if hasattr(os, 'sendfile'):
+                    methods.insert(0, self._sendfile)
+                if hasattr(os, 'copy_file_range'):
+                    methods.insert(0, self._copy_file_range)
+
+                offset = 0
+                while True:
+                    jobs.checkpoint()
+                    try:
+                        copied = methods[0](infd, outfd, offset)
+                    except OSError as e:
+                        # Metoda nieobsługiwana dla tej pary plików - spróbuj następnej
+                        if len(methods) > 1 and e.errno in ZERO_COPY_FALLBACK:
+                            methods.pop(0)
+                            continue
+                        raise
+                    if copied == 0:
+                        break
+                    offset += copied
+                    self.bytes_done += copied
+        except JobCancelled:
+            # Nie zostawiaj niedokończonej kopii
+            try:
+                os.unlink(target)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _copy_file_range(infd, outfd, offset):
+        return os.copy_file_range(infd, outfd, COPY_CHUNK, offset, offset)
+
+    @staticmethod
+    def _sendfile(infd, outfd, offset):
+        os.lseek(outfd, offset, os.SEEK_SET)
+        return os.sendfile(outfd, infd, offset, COPY_CHUNK)
+
+    @staticmethod
+    def _pread_pwrite(infd, outfd, offset):
+        data = os.pread(infd, COPY_CHUNK, offset)
+        if data:
+            os.pwrite(outfd, data, offset)
+        return len(data)
+
+
+class DeleteJob(FileJob):
+    """Rekurencyjne usuwanie listy ścieżek (FileJob.remove_path).
+
+    bytes_done to suma rozmiarów usuniętych plików.
+    """
+
+    title = "Deleting"
+
+    def __init__(self, paths, destination):
+        super().__init__(destination)
+        self.paths = paths
+
+    def run(self, jobs):
+        for path in self.paths:
+            self.remove_path(path, jobs)
@@ -0,0 +1,156 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+
+# Stałe z <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_MODIFY |
+              IN_ATTRIB | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def load_libc():
+    """Ładuje libc z funkcjami inotify (tylko Linux)"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class DirectoryWatcher:
+    """Obserwuje jeden katalog przez inotify (ctypes, bez zależności).
+
+    Zdarzenia są odczytywane w wątku Tk (createfilehandler, a gdy go brak
+    - pętla after()) i zbierane przez okno window_ms; potem wywoływane
+    jest on_change(names, rescan) ze zbiorem zmienionych nazw. rescan=True
+    oznacza, że trzeba przeładować cały katalog (przepełnienie kolejki,
+    usunięcie lub przeniesienie obserwowanego katalogu).
+    """
+
+    def __init__(self, root, on_change, window_ms=200, max_names=500):
+        self.root = root
+        self.on_change = on_change
+        self.window_ms = window_ms
+        self.max_names = max_names
+        self.libc = load_libc()
+        self.fd = None
+        self.wd = None
+        self.names = set()
+        self.rescan = False
+        self._flush_id = None
+        self._poll_id = None
+        if self.libc is not None:
+            fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self.fd = fd
+                self._attach()
+
+    def is_available(self):
+        """Czy inotify działa na tym systemie"""
+        return self.fd is not None
+
+    def _attach(self):
+        """Podłącza deskryptor do pętli zdarzeń Tk"""
+        try:
+            self.root.tk.createfilehandler(self.fd, 1, lambda fd, mask: self.read_events())  # tkinter.READABLE
+        except (AttributeError, RuntimeError):
+            # Tk bez obsługi plików (np. Windows) - odpytuj deskryptor
+            self._poll()
+
+    def _poll(self):
+        self.read_events()
+        self._poll_id = self.root.after(self.window_ms, self._poll)
+
+    def watch(self, path):
+        """Przełącza obserwację na katalog path (porzuca zebrane zmiany)"""
+        if self.fd is None:
+            return
+        self.unwatch()
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        self.wd = wd if wd >= 0 else None
+
+    def unwatch(self):
+        """Kończy obserwację bieżącego katalogu"""
+        if self.wd is not None:
+            self.libc.inotify_rm_watch(self.fd, self.wd)
+            self.wd = None
+        self.names = set()
+        self.rescan = False
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+
+    def read_events(self):
+        """Odczytuje dostępne zdarzenia i planuje ich zbiorcze przekazanie"""
+        try:
+            data = os.read(self.fd, 65536)
+        except OSError:
+            return  # Brak zdarzeń (EAGAIN)
+
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                self.rescan = True
+            elif wd != self.wd or mask & IN_IGNORED:
+                continue  # Zdarzenie poprzednio obserwowanego katalogu
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                self.rescan = True
+            elif name:
+                self.names.add(os.fsdecode(name))
+
+        if len(self.names) > self.max_names:
+            self.rescan = True
+        if (self.names or self.rescan) and self._flush_id is None:
+            self._flush_id = self.root.after(self.window_ms, self.flush)
+
+    def flush(self):
+        """Przekazuje zebrane zmiany"""
+        self._flush_id = None
+        names, rescan = self.names, self.rescan
+        self.names = set()
+        self.rescan = False
+        if rescan:
+            names = set()
+        self.on_change(names, rescan)
+
+    def close(self):
+        """Zamyka deskryptor inotify"""
+        if self.fd is None:
+            return
+        self.unwatch()
+        try:
+            self.root.tk.deletefilehandler(self.fd)
+        except (AttributeError, RuntimeError):
+            pass
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+        os.close(self.fd)
+        self.fd = None
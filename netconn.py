@@ -0,0 +1,332 @@
+import os
+import socket
+import struct
+import sys
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+import psutil
+
+# Połączenie w układzie zbliżonym do psutil (pid ustalany leniwie po i-węźle)
+Address = namedtuple('Address', ['ip', 'port'])
+Connection = namedtuple('Connection', ['family', 'type', 'laddr', 'raddr', 'status', 'inode', 'pid'])
+
+# Pliki /proc/net: rodzaj -> (rodzina, typ gniazda)
+PROC_NET_KINDS = {
+    'tcp': (socket.AF_INET, socket.SOCK_STREAM),
+    'tcp6': (socket.AF_INET6, socket.SOCK_STREAM),
+    'udp': (socket.AF_INET, socket.SOCK_DGRAM),
+    'udp6': (socket.AF_INET6, socket.SOCK_DGRAM),
+}
+
+# Stany TCP z include/net/tcp_states.h (kolumna st, szesnastkowo)
+TCP_STATES = {
+    '01': psutil.CONN_ESTABLISHED,
+    '02': psutil.CONN_SYN_SENT,
+    '03': psutil.CONN_SYN_RECV,
+    '04': psutil.CONN_FIN_WAIT1,
+    '05': psutil.CONN_FIN_WAIT2,
+    '06': psutil.CONN_TIME_WAIT,
+    '07': psutil.CONN_CLOSE,
+    '08': psutil.CONN_CLOSE_WAIT,
+    '09': psutil.CONN_LAST_ACK,
+    '0A': psutil.CONN_LISTEN,
+    '0B': psutil.CONN_CLOSING,
+    '0C': psutil.CONN_SYN_RECV,  # NEW_SYN_RECV
+}
+
+
+@lru_cache(maxsize=65536)
+def decode_address(text, family):
+    """'0100007F:0050' -> Address('127.0.0.1', 80); () dla adresu pustego"""
+    host, port = text.split(':')
+    raw = bytes.fromhex(host)
+    # Adres zapisany jako słowa 32-bitowe w kolejności bajtów hosta
+    if sys.byteorder == 'little':
+        raw = b''.join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    port = int(port, 16)
+    if port == 0 and not any(raw):
+        return ()
+    return Address(socket.inet_ntop(family, raw), port)
+
+
+def parse_proc_net(data, family, kind):
+    """Parsuje zawartość /proc/net/{tcp,udp}[6] do listy Connection"""
+    connections = []
+    is_tcp = kind == socket.SOCK_STREAM
+    for line in data.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10:
+            continue
+        status = TCP_STATES.get(fields[3], psutil.CONN_NONE) if is_tcp else psutil.CONN_NONE
+        connections.append(Connection(family, kind,
+                                      decode_address(fields[1], family),
+                                      decode_address(fields[2], family),
+                                      status, int(fields[9]), None))
+    return connections
+
+
+class ConnectionTable:
+    """Lista połączeń z /proc/net/tcp{,6} i udp{,6} czytanych hurtowo.
+
+    Odczyt tabel gniazd nie dotyka /proc/[pid]/fd - PID właściciela
+    ustalany jest dopiero dla wierszy, które są wyświetlane: widok pyta
+    o PID przez cached_pid(request=True), a brakujące i-węzły są
+    wyszukiwane przy następnym read() w wątku kolektora i zapamiętywane. Przeszukanie deskryptorów kończy
+    się, gdy znaleziony zostanie szukany i-węzeł, a wszystkie gniazda
+    napotkane po drodze trafiają do pamięci podręcznej. Bez /proc/net
+    (np. Windows, macOS) używane jest psutil.net_connections().
+    """
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self.lock = threading.Lock()
+        self.owners = {}  # i-węzeł -> pid (None: właściciel nieznany/niedostępny)
+        self.live = set()  # i-węzły z ostatniego odczytu
+        self.resolve_owners = 0  # Liczba widoków potrzebujących PID wszystkich gniazd
+        self.requested = set()  # I-węzły wyświetlanych wierszy bez znanego PID
+        self.request_lock = threading.Lock()  # Osobna blokada - wątek Tk nie czeka na przeszukanie
+        self.native = os.path.exists(os.path.join(proc_root, 'net', 'tcp'))
+
+    def read(self, kinds=tuple(PROC_NET_KINDS)):
+        """Zwraca krotkę Connection dla podanych rodzajów gniazd"""
+        if not self.native:
+            return self.read_psutil()
+        connections = []
+        for name in kinds:
+            family, kind = PROC_NET_KINDS[name]
+            try:
+                with open(os.path.join(self.proc_root, 'net', name)) as f:
+                    data = f.read()
+            except OSError:
+                continue  # Np. jądro bez IPv6
+            connections.extend(parse_proc_net(data, family, kind))
+        inodes = {conn.inode for conn in connections}
+        self.prune(inodes)
+        with self.request_lock:
+            requested, self.requested = self.requested, set()
+        if self.resolve_owners:
+            self.resolve(inodes)
+        elif requested:
+            self.resolve(requested & inodes)
+        return tuple(connections)
+
+    def read_psutil(self):
+        """Ścieżka zapasowa - psutil podaje od razu PID (pełne przeszukanie procesów)"""
+        connections = []
+        for conn in psutil.net_connections(kind='inet'):
+            connections.append(Connection(conn.family, conn.type,
+                                          Address(*conn.laddr) if conn.laddr else (),
+                                          Address(*conn.raddr) if conn.raddr else (),
+                                          conn.status, None, conn.pid))
+        return tuple(connections)
+
+    def prune(self, live):
+        """Zapomina właścicieli gniazd spoza zbioru i-węzłów live"""
+        with self.lock:
+            self.live = live
+            if self.owners:
+                self.owners = {inode: pid for inode, pid in self.owners.items() if inode in live}
+
+    def forget(self, inodes):
+        """Zapomina właścicieli podanych (zamkniętych) gniazd"""
+        with self.lock:
+            for inode in inodes:
+                self.owners.pop(inode, None)
+
+    def cached_pid(self, connection, request=False):
+        """PID z pamięci podręcznej - bez przeszukiwania /proc (bezpieczne w wątku Tk).
+
+        Z request=True nieznany jeszcze właściciel zostanie wyszukany przy
+        następnym odczycie tabeli w wątku kolektora.
+        """
+        if connection.pid is not None or connection.inode is None:
+            return connection.pid
+        if not connection.inode:
+            return None  # Gniazdo bez i-węzła (np. TIME_WAIT)
+        pid = self.owners.get(connection.inode)
+        if pid is None and request and connection.inode not in self.owners:
+            with self.request_lock:
+                self.requested.add(connection.inode)
+        return pid
+
+    def resolve(self, inodes):
+        """Ustala właścicieli wszystkich podanych i-węzłów jednym przejściem"""
+        with self.lock:
+            wanted = {inode for inode in inodes if inode and inode not in self.owners}
+            if wanted:
+                self.scan_owners(wanted)
+
+    def scan_owners(self, wanted):
+        """Przegląda /proc/[pid]/fd, aż znajdzie wszystkie i-węzły z wanted"""
+        owners = self.owners
+        wanted = set(wanted)
+        try:
+            entries = os.scandir(self.proc_root)
+        except OSError:
+            for inode in wanted:
+                owners[inode] = None
+            return
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                fd_dir = os.path.join(entry.path, 'fd')
+                try:
+                    fds = os.listdir(fd_dir)
+                except OSError:
+                    continue  # Proces zakończony lub brak uprawnień
+                for fd in fds:
+                    try:
+                        target = os.readlink(os.path.join(fd_dir, fd))
+                    except OSError:
+                        continue
+                    if target.startswith('socket:['):
+                        inode = int(target[8:-1])
+                        owners[inode] = pid
+                        wanted.discard(inode)
+                if not wanted:
+                    return
+        # Pełne przejście: gniazda bez znalezionego właściciela (np. procesy
+        # innych użytkowników) nie będą szukane ponownie
+        for inode in wanted:
+            owners[inode] = None
+        for inode in self.live:
+            owners.setdefault(inode, None)
+
+
+# NETLINK_SOCK_DIAG (linux/netlink.h, linux/sock_diag.h, linux/inet_diag.h)
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+INET_DIAG_INFO = 2
+
+NLMSG_HEADER = struct.Struct('=IHHII')
+# inet_diag_req_v2: rodzina, protokół, rozszerzenia, pad, stany, inet_diag_sockid
+INET_DIAG_REQ = struct.Struct('=BBBBI48s')
+# inet_diag_msg: rodzina, stan, timer, retrans, sockid, expires, rqueue, wqueue, uid, inode
+INET_DIAG_MSG = struct.Struct('=BBBB48sIIIII')
+RTATTR = struct.Struct('=HH')
+# struct tcp_info: tcpi_bytes_acked i tcpi_bytes_received (jądro >= 4.1)
+TCP_INFO_BYTES = struct.Struct('=QQ')
+TCP_INFO_BYTES_OFFSET = 120
+
+
+def dump_tcp_bytes(family, buffer_size=1 << 17):
+    """Zwraca {i-węzeł: (bytes_acked, bytes_received)} dla gniazd TCP rodziny.
+
+    Jedno zapytanie NETLINK_SOCK_DIAG z INET_DIAG_INFO - bez uprawnień
+    roota i bez czytania /proc/net. Zgłasza OSError, gdy jądro nie
+    obsługuje sock_diag.
+    """
+    result = {}
+    buffer = bytearray(buffer_size)
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG) as sock:
+        request = INET_DIAG_REQ.pack(family, socket.IPPROTO_TCP, 1 << (INET_DIAG_INFO - 1), 0,
+                                     0xFFFFFFFF, bytes(48))
+        sock.send(NLMSG_HEADER.pack(NLMSG_HEADER.size + len(request), SOCK_DIAG_BY_FAMILY,
+                                    NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + request)
+        while True:
+            size = sock.recv_into(buffer)
+            data = memoryview(buffer)[:size]
+            offset = 0
+            while offset + NLMSG_HEADER.size <= size:
+                length, msg_type = NLMSG_HEADER.unpack_from(data, offset)[:2]
+                if msg_type == NLMSG_DONE:
+                    return result
+                if msg_type == NLMSG_ERROR:
+                    error = -struct.unpack_from('=i', data, offset + NLMSG_HEADER.size)[0]
+                    raise OSError(error, os.strerror(error))
+                if length < NLMSG_HEADER.size:
+                    break
+                end = offset + length
+                body = offset + NLMSG_HEADER.size
+                inode = INET_DIAG_MSG.unpack_from(data, body)[-1]
+                attr = body + INET_DIAG_MSG.size
+                while attr + RTATTR.size <= end:
+                    attr_length, attr_type = RTATTR.unpack_from(data, attr)
+                    if attr_length < RTATTR.size:
+                        break
+                    if (attr_type == INET_DIAG_INFO and inode and
+                            attr_length >= RTATTR.size + TCP_INFO_BYTES_OFFSET + TCP_INFO_BYTES.size):
+                        result[inode] = TCP_INFO_BYTES.unpack_from(data, attr + RTATTR.size + TCP_INFO_BYTES_OFFSET)
+                    attr += (attr_length + 3) & ~3
+                offset += (length + 3) & ~3
+
+
+# Przyrost ruchu TCP procesu między dwoma odczytami
+ProcessTraffic = namedtuple('ProcessTraffic', ['pid', 'sockets', 'sent', 'recv'])
+TrafficSample = namedtuple('TrafficSample', ['available', 'elapsed', 'processes'])
+
+
+class SocketTraffic:
+    """Ruch TCP per proces z liczników tcp_info gniazd.
+
+    Każdy odczyt to zrzut NETLINK_SOCK_DIAG (bajty potwierdzone i odebrane
+    per gniazdo) - przyrosty względem poprzedniego odczytu sumowane są po
+    właścicielu gniazda. Właściciele ustalani są przez wspólną pamięć
+    i-węzłów ConnectionTable (przeszukanie /proc/[pid]/fd tylko dla
+    nowych gniazd).
+    Gniazda nowe od poprzedniego odczytu liczone są od zera; pierwszy
+    odczyt jest tylko bazą. Ruch UDP nie jest przypisywany (jądro nie
+    prowadzi liczników bajtów per gniazdo UDP).
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.previous = None
+        self.timestamp = None
+        self.available = sys.platform.startswith('linux')
+
+    def read(self):
+        """Liczniki wszystkich gniazd TCP (IPv4 i IPv6)"""
+        counters = dump_tcp_bytes(socket.AF_INET)
+        counters.update(dump_tcp_bytes(socket.AF_INET6))
+        return counters
+
+    def sample(self, timestamp):
+        """Zwraca TrafficSample z przyrostami od poprzedniego wywołania"""
+        if not self.available:
+            return TrafficSample(False, 0, ())
+        try:
+            counters = self.read()
+        except OSError:
+            self.available = False
+            return TrafficSample(False, 0, ())
+
+        previous, self.previous = self.previous, counters
+        elapsed = timestamp - self.timestamp if self.timestamp is not None else 0
+        self.timestamp = timestamp
+        if previous is None or elapsed <= 0:
+            return TrafficSample(True, 0, ())
+
+        # Właściciele tylko gniazd, które coś przesłały
+        changed = {}
+        for inode, (acked, received) in counters.items():
+            old_acked, old_received = previous.get(inode, (0, 0))
+            sent, recv = acked - old_acked, received - old_received
+            if sent > 0 or recv > 0:
+                changed[inode] = (sent, recv)
+        # Zamknięte gniazda TCP - bez przycinania gniazd UDP ze wspólnej pamięci
+        self.table.forget(inode for inode in previous if inode not in counters)
+        self.table.resolve(changed)
+
+        totals = {}
+        for inode, (sent, recv) in changed.items():
+            pid = self.table.owners.get(inode)
+            if pid is None:
+                continue
+            total = totals.get(pid)
+            if total is None:
+                totals[pid] = [1, sent, recv]
+            else:
+                total[0] += 1
+                total[1] += sent
+                total[2] += recv
+        processes = tuple(ProcessTraffic(pid, *total) for pid, total in totals.items())
+        return TrafficSample(True, elapsed, processes)
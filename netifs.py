@@ -0,0 +1,119 @@
+import errno
+import os
+import socket
+import time
+from collections import namedtuple
+
+import psutil
+
+# Statyczne dane interfejsu - zmieniają się rzadko (adresy, MTU, prędkość łącza)
+InterfaceInfo = namedtuple('InterfaceInfo', ['name', 'addresses', 'isup', 'mtu', 'speed', 'duplex'])
+InterfacesSample = namedtuple('InterfacesSample', ['version', 'interfaces'])
+
+# Grupy multicast NETLINK_ROUTE (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+DUPLEX_NAMES = {
+    psutil.NIC_DUPLEX_FULL: "Full",
+    psutil.NIC_DUPLEX_HALF: "Half",
+    psutil.NIC_DUPLEX_UNKNOWN: "Unknown",
+}
+
+
+class LinkEvents:
+    """Nieblokujący nasłuch zdarzeń łączy i adresów (NETLINK_ROUTE)"""
+
+    def __init__(self):
+        self.sock = None
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        except (OSError, AttributeError):
+            return  # Brak netlink (np. Windows, macOS)
+        try:
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            return
+        self.sock = sock
+
+    def is_available(self):
+        return self.sock is not None
+
+    def pending(self):
+        """Odczytuje zaległe zdarzenia; True, jeśli jakieś były"""
+        changed = False
+        while True:
+            try:
+                if not self.sock.recv(65536):
+                    return changed
+                changed = True
+            except BlockingIOError:
+                return changed
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    changed = True  # Przepełnienie bufora - część zdarzeń utracona
+                    continue
+                return True
+
+
+class InterfaceCache:
+    """Pamięć podręczna adresów i parametrów interfejsów.
+
+    Dane z psutil.net_if_addrs()/net_if_stats() odczytywane są ponownie
+    tylko po zdarzeniu NETLINK_ROUTE (nowe/usunięte łącze lub adres,
+    zmiana stanu łącza). Bez netlink porównywana jest lista /sys/class/net,
+    a dodatkowo dane odświeżane są co max_age sekund. Każde przeładowanie
+    zwiększa version - widok przebudowuje tabelę tylko przy zmianie wersji.
+    """
+
+    def __init__(self, sys_root='/sys/class/net', max_age=60.0):
+        self.sys_root = sys_root
+        self.max_age = max_age
+        self.events = LinkEvents()
+        self.listing = None
+        self.loaded = 0
+        self.version = 0
+        self.interfaces = None
+        self.stale = True
+
+    def invalidate(self):
+        """Wymusza ponowny odczyt przy następnej próbce"""
+        self.stale = True
+
+    def changed(self):
+        """Tania kontrola zmian między próbkami"""
+        if self.events.is_available():
+            return self.events.pending()
+        try:
+            listing = sorted(os.listdir(self.sys_root))
+        except OSError:
+            listing = None
+        changed = listing != self.listing
+        self.listing = listing
+        return changed or time.monotonic() - self.loaded > self.max_age
+
+    def sample(self):
+        """Zwraca InterfacesSample - z pamięci, chyba że coś się zmieniło"""
+        changed = self.changed()
+        if changed or self.stale or self.interfaces is None:
+            self.reload()
+        return InterfacesSample(self.version, self.interfaces)
+
+    def reload(self):
+        addresses = psutil.net_if_addrs()
+        stats = psutil.net_if_stats()
+        interfaces = {}
+        for name, addrs in addresses.items():
+            stat = stats.get(name)
+            interfaces[name] = InterfaceInfo(name, tuple(addrs),
+                                             stat.isup if stat else False,
+                                             stat.mtu if stat else None,
+                                             stat.speed if stat else 0,
+                                             DUPLEX_NAMES.get(stat.duplex, "Unknown") if stat else "Unknown")
+        self.interfaces = interfaces
+        self.loaded = time.monotonic()
+        self.stale = False
+        self.version += 1
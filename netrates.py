@@ -0,0 +1,169 @@
+from array import array
+
+# Liczniki śledzone per interfejs (pola psutil.net_io_counters)
+COUNTER_FIELDS = ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                  'errin', 'errout', 'dropin', 'dropout')
+
+
+def counter_delta(previous, current):
+    """Przyrost licznika; spadek oznacza reset (np. restart łącza lub sterownika).
+
+    psutil.net_io_counters (nowrap=True) sam usuwa przekręcenia liczników
+    32-bitowych, więc każdy spadek jest resetem - przyrostem jest wtedy
+    nowa wartość.
+    """
+    if current >= previous:
+        return current - previous
+    return current
+
+
+class RingBuffer:
+    """Bufor kołowy o stałym rozmiarze (array('d'), bez alokacji przy dopisywaniu)"""
+
+    def __init__(self, size):
+        self.data = array('d', bytes(8 * size))
+        self.size = size
+        self.start = 0
+        self.count = 0
+
+    def append(self, value):
+        index = (self.start + self.count) % self.size
+        self.data[index] = value
+        if self.count < self.size:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.size
+
+    def __len__(self):
+        return self.count
+
+    def values(self):
+        """Wartości od najstarszej do najnowszej"""
+        end = self.start + self.count
+        if end <= self.size:
+            return self.data[self.start:end].tolist()
+        return self.data[self.start:].tolist() + self.data[:end - self.size].tolist()
+
+    def last(self):
+        if not self.count:
+            return 0.0
+        return self.data[(self.start + self.count - 1) % self.size]
+
+    def peak(self):
+        if not self.count:
+            return 0.0
+        return max(self.values())
+
+
+class InterfaceHistory:
+    """Historia prędkości jednego interfejsu - bufor na każdy licznik (na sekundę)"""
+
+    def __init__(self, size):
+        self.buffers = {field: RingBuffer(size) for field in COUNTER_FIELDS}
+        self.timestamps = RingBuffer(size)
+        self.counters = None
+        self.timestamp = None
+
+    def update(self, timestamp, counters):
+        """Dopisuje prędkości z nowego odczytu liczników"""
+        if self.counters is not None and timestamp > self.timestamp:
+            elapsed = timestamp - self.timestamp
+            for field, buffer in self.buffers.items():
+                delta = counter_delta(getattr(self.counters, field), getattr(counters, field))
+                buffer.append(delta / elapsed)
+            self.timestamps.append(timestamp)
+        self.counters = counters
+        self.timestamp = timestamp
+
+    def rate(self, field):
+        """Bieżąca prędkość licznika (jednostki na sekundę)"""
+        return self.buffers[field].last()
+
+    def peak(self, field):
+        """Najwyższa prędkość w oknie historii"""
+        return self.buffers[field].peak()
+
+    def history(self, field):
+        return self.buffers[field].values()
+
+
+class InterfaceRates:
+    """Prędkości per interfejs liczone z jednego odczytu liczników na tick.
+
+    update() dostaje słownik z psutil.net_io_counters(pernic=True) już
+    odczytany przez kolektor - wykres i tabela korzystają z tych samych
+    buforów zamiast ponownie czytać liczniki. Interfejsy, które zniknęły,
+    są usuwane.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.interfaces = {}
+
+    def update(self, timestamp, pernic):
+        for name, counters in pernic.items():
+            history = self.interfaces.get(name)
+            if history is None:
+                history = self.interfaces[name] = InterfaceHistory(self.size)
+            history.update(timestamp, counters)
+        for name in [name for name in self.interfaces if name not in pernic]:
+            del self.interfaces[name]
+
+    def get(self, name):
+        return self.interfaces.get(name)
+
+    def names(self):
+        return list(self.interfaces)
+
+
+class ProcessHistory:
+    """Historia prędkości ruchu TCP jednego procesu"""
+
+    def __init__(self, size):
+        self.sent = RingBuffer(size)
+        self.recv = RingBuffer(size)
+        self.sockets = 0
+
+    def idle(self):
+        """Brak ruchu w całym oknie historii"""
+        return self.sent.peak() == 0 and self.recv.peak() == 0
+
+
+class ProcessRates:
+    """Prędkości per proces z próbek SocketTraffic.
+
+    Procesy bez ruchu w danej próbce dostają zero (historia pozostaje
+    wyrównana w czasie); proces bez ruchu przez całe okno jest usuwany.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.processes = {}
+
+    def update(self, sample):
+        if not sample.elapsed:
+            return
+        current = {traffic.pid: traffic for traffic in sample.processes}
+        for pid in current:
+            if pid not in self.processes:
+                self.processes[pid] = ProcessHistory(self.size)
+        for pid, history in list(self.processes.items()):
+            traffic = current.get(pid)
+            if traffic is not None:
+                history.sent.append(traffic.sent / sample.elapsed)
+                history.recv.append(traffic.recv / sample.elapsed)
+                history.sockets = traffic.sockets
+            else:
+                history.sent.append(0.0)
+                history.recv.append(0.0)
+                history.sockets = 0
+                if history.idle():
+                    del self.processes[pid]
+
+    def top(self, count):
+        """Procesy o największym bieżącym ruchu (potem szczycie w oknie)"""
+        ranked = sorted(self.processes.items(),
+                        key=lambda item: (item[1].sent.last() + item[1].recv.last(),
+                                          item[1].sent.peak() + item[1].recv.peak()),
+                        reverse=True)
+        return ranked[:count]
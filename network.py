@@ -6,26 +6,54 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import threading
 import time
-from collections import deque
+from collections import deque, Counter
+from charts import BlitManager
+from netrates import InterfaceRates, ProcessRates
+from treesync import TreeReconciler
+from virtualtable import VirtualTable
+
+# Długość historii prędkości (próbki co 1 s)
+HISTORY_LENGTH = 60
+
+# Liczba procesów w tabeli największego ruchu
+TOP_TALKERS = 10
+
+# Widoki okna połączeń: pełna lista lub liczniki zgrupowane po kolumnie
+CONNECTION_VIEWS = ('Connections', 'Remote host', 'Local port', 'State', 'PID')
 
 class NetworkMonitor:
-    def __init__(self, parent_frame, colors):
+    def __init__(self, parent_frame, colors, scheduler):
         self.parent_frame = parent_frame
         self.colors = colors
+        self.scheduler = scheduler
+        self.interface_count = 0
+        self.interfaces_version = None
+        # Prędkości per interfejs (bufory kołowe) z tych samych próbek co wykres prędkości
+        self.interface_rates = InterfaceRates(HISTORY_LENGTH)
+        self.interface_names = None
+        self.interface_cells = {}
+        # Ruch TCP per proces (próbki co 2 s - okno tej samej długości co wykres)
+        self.process_rates = ProcessRates(HISTORY_LENGTH // 2)
         self.setup_network_tab()
         
         # Dane historyczne dla wykresów
-        self.sent_history = deque(maxlen=60)
-        self.recv_history = deque(maxlen=60)
-        self.timestamps = deque(maxlen=60)
+        self.sent_history = deque(maxlen=HISTORY_LENGTH)
+        self.recv_history = deque(maxlen=HISTORY_LENGTH)
+        self.timestamps = deque(maxlen=HISTORY_LENGTH)
         
         # Poprzednie wartości do obliczania prędkości
         self.prev_sent = 0
         self.prev_recv = 0
-        self.prev_time = time.time()
-        
-        # Uruchom monitoring sieci
-        self.update_network_data()
+        self.prev_time = 0
+        self.sent_speed = 0
+        self.recv_speed = 0
+        
+        # Uruchom monitoring sieci - próbki dostarcza wspólny harmonogram.
+        # Historia liczona jest zawsze (tanio), rysowanie tylko gdy zakładka jest widoczna.
+        self.scheduler.subscribe('net', self.record_network_data)
+        self.scheduler.subscribe('net', self.update_network_data, tab=self.parent_frame)
+        self.scheduler.subscribe('net_if', self.update_interfaces_info, tab=self.parent_frame)
+        self.scheduler.subscribe('process_net', self.update_top_talkers, tab=self.parent_frame)
 
     def setup_network_tab(self):
         """Konfiguruje zakładkę Network"""
@@ -87,6 +115,7 @@ class NetworkMonitor:
         self.ax_speed.set_facecolor(self.colors['bg_light'])
         self.canvas_speed = FigureCanvasTkAgg(self.fig_speed, speed_frame)
         self.canvas_speed.get_tk_widget().pack(fill='both', expand=True)
+        self.build_speed_chart()
         
         # Wykres wykorzystania interfejsów
         interfaces_frame = ttk.LabelFrame(charts_frame, text="🔌 Network Interfaces", style='Modern.TLabelframe', padding="15")
@@ -97,12 +126,13 @@ class NetworkMonitor:
         self.ax_interfaces.set_facecolor(self.colors['bg_light'])
         self.canvas_interfaces = FigureCanvasTkAgg(self.fig_interfaces, interfaces_frame)
         self.canvas_interfaces.get_tk_widget().pack(fill='both', expand=True)
+        self.interfaces_blit = BlitManager(self.canvas_interfaces, self.ax_interfaces.bbox)
         
         # Lista interfejsów sieciowych
         interfaces_list_frame = ttk.LabelFrame(main_frame, text="🌐 Network Interfaces", style='Modern.TLabelframe', padding="10")
         interfaces_list_frame.pack(fill='both', expand=True, pady=(0, 10))
         
-        columns = ('interface', 'ip', 'netmask', 'broadcast', 'speed', 'status')
+        columns = ('interface', 'ip', 'netmask', 'broadcast', 'speed', 'mtu', 'status', 'download', 'upload', 'peak')
         self.interfaces_tree = ttk.Treeview(interfaces_list_frame, columns=columns, show='headings', height=8)
         
         # Nagłówki
@@ -111,8 +141,12 @@ class NetworkMonitor:
             ('ip', 'IP Address', 150),
             ('netmask', 'Netmask', 120),
             ('broadcast', 'Broadcast', 120),
-            ('speed', 'Speed', 100),
-            ('status', 'Status', 100)
+            ('speed', 'Speed', 130),
+            ('mtu', 'MTU', 60),
+            ('status', 'Status', 100),
+            ('download', 'Download', 100),
+            ('upload', 'Upload', 100),
+            ('peak', 'Peak (down/up)', 150)
         ]
         
         for col, text, width in interface_headers:
@@ -121,11 +155,35 @@ class NetworkMonitor:
         
         self.interfaces_tree.pack(fill='both', expand=True, side=tk.LEFT)
         
+        # Konfiguruj kolory statusów
+        self.interfaces_tree.tag_configure('up', foreground=self.colors['success'])
+        self.interfaces_tree.tag_configure('down', foreground=self.colors['danger'])
+        
         # Pasek przewijania
         scrollbar_interfaces = ttk.Scrollbar(interfaces_list_frame, orient=tk.VERTICAL, command=self.interfaces_tree.yview)
         self.interfaces_tree.configure(yscrollcommand=scrollbar_interfaces.set)
         scrollbar_interfaces.pack(side=tk.RIGHT, fill='y')
         
+        # Procesy z największym ruchem TCP
+        talkers_frame = ttk.LabelFrame(main_frame, text="🔥 Top Talkers (TCP)", style='Modern.TLabelframe', padding="10")
+        talkers_frame.pack(fill='both', expand=True, pady=(0, 10))
+        
+        talkers_columns = ('pid', 'name', 'sockets', 'download', 'upload', 'peak')
+        self.talkers_tree = ttk.Treeview(talkers_frame, columns=talkers_columns, show='headings', height=6)
+        talkers_headers = [
+            ('pid', 'PID', 80),
+            ('name', 'Process', 180),
+            ('sockets', 'Active Sockets', 100),
+            ('download', 'Download', 100),
+            ('upload', 'Upload', 100),
+            ('peak', 'Peak (down/up)', 180)
+        ]
+        for col, text, width in talkers_headers:
+            self.talkers_tree.heading(col, text=text)
+            self.talkers_tree.column(col, width=width, anchor='center')
+        self.talkers_tree.pack(fill='both', expand=True)
+        self.talkers_sync = TreeReconciler(self.talkers_tree)
+        
         # Przyciski akcji
         action_frame = ttk.Frame(main_frame, style='Modern.TFrame')
         action_frame.pack(fill='x', pady=(0, 10))
@@ -148,170 +206,268 @@ class NetworkMonitor:
         # Inicjalizacja danych
         self.refresh_network_data()
 
-    def update_network_data(self):
-        """Aktualizuje dane sieciowe"""
+    def update_interfaces_info(self, sample):
+        """Odświeża listę interfejsów tylko, gdy zmieniła się wersja danych"""
+        info = sample.value
+        self.interface_count = len(info.interfaces)
+        if info.version != self.interfaces_version:
+            self.interfaces_version = info.version
+            self.show_interfaces(info.interfaces)
+
+    def record_network_data(self, sample):
+        """Zapisuje prędkości do historii (działa także przy ukrytej zakładce)"""
+        net_io = sample.value.total
+        current_time = sample.timestamp
+        self.interface_rates.update(current_time, sample.value.pernic)
+        time_diff = current_time - self.prev_time
+        
+        if self.prev_time and time_diff > 0:
+            # Oblicz prędkości w MB/s
+            self.sent_speed = (net_io.bytes_sent - self.prev_sent) / time_diff / 1024 / 1024
+            self.recv_speed = (net_io.bytes_recv - self.prev_recv) / time_diff / 1024 / 1024
+            
+            # Dodaj dane do historii
+            self.sent_history.append(self.sent_speed)
+            self.recv_history.append(self.recv_speed)
+            self.timestamps.append(current_time)
+        
+        # Zapisz poprzednie wartości
+        self.prev_sent = net_io.bytes_sent
+        self.prev_recv = net_io.bytes_recv
+        self.prev_time = current_time
+
+    def update_network_data(self, sample):
+        """Aktualizuje etykiety i wykresy sieciowe"""
         try:
-            # Pobierz aktualne statystyki sieciowe
-            net_io = psutil.net_io_counters()
-            current_time = time.time()
-            time_diff = current_time - self.prev_time
+            net_io = sample.value.total
             
-            if time_diff > 0:
-                # Oblicz prędkości w MB/s
-                sent_speed = (net_io.bytes_sent - self.prev_sent) / time_diff / 1024 / 1024
-                recv_speed = (net_io.bytes_recv - self.prev_recv) / time_diff / 1024 / 1024
-                
-                # Aktualizuj etykiety
-                self.download_label.config(text=f"Download: {recv_speed:.2f} MB/s")
-                self.upload_label.config(text=f"Upload: {sent_speed:.2f} MB/s")
-                self.total_download_label.config(text=f"Total Downloaded: {net_io.bytes_recv / 1024 / 1024 / 1024:.2f} GB")
-                self.total_upload_label.config(text=f"Total Uploaded: {net_io.bytes_sent / 1024 / 1024 / 1024:.2f} GB")
-                
-                # Dodaj dane do historii
-                self.sent_history.append(sent_speed)
-                self.recv_history.append(recv_speed)
-                self.timestamps.append(current_time)
-                
-                # Zaktualizuj wykresy
-                self.update_speed_chart()
-                self.update_interfaces_chart()
-                
-                # Zapisz poprzednie wartości
-                self.prev_sent = net_io.bytes_sent
-                self.prev_recv = net_io.bytes_recv
-                self.prev_time = current_time
+            # Aktualizuj etykiety
+            self.download_label.config(text=f"Download: {self.recv_speed:.2f} MB/s")
+            self.upload_label.config(text=f"Upload: {self.sent_speed:.2f} MB/s")
+            self.total_download_label.config(text=f"Total Downloaded: {net_io.bytes_recv / 1024 / 1024 / 1024:.2f} GB")
+            self.total_upload_label.config(text=f"Total Uploaded: {net_io.bytes_sent / 1024 / 1024 / 1024:.2f} GB")
+            
+            # Zaktualizuj wykresy
+            self.update_speed_chart()
+            self.update_interfaces_chart()
+            self.update_interface_rates()
             
             # Aktualizuj status
-            self.network_status_label.config(text=f"Last updated: {time.strftime('%H:%M:%S')} | Interfaces: {len(psutil.net_if_addrs())}")
+            self.network_status_label.config(text=f"Last updated: {time.strftime('%H:%M:%S')} | Interfaces: {self.interface_count}")
             
         except Exception as e:
             self.network_status_label.config(text=f"Error: {str(e)}")
-        
-        # Zaplanuj kolejną aktualizację
-        self.parent_frame.after(1000, self.update_network_data)
+
+    def build_speed_chart(self):
+        """Buduje wykres prędkości raz - linie są później tylko aktualizowane"""
+        # Blitting obejmuje tylko obszar wykresu (bez osi i legendy)
+        self.speed_blit = BlitManager(self.canvas_speed, self.ax_speed.bbox)
+        
+        self.upload_line, = self.ax_speed.plot([], [], label='Upload', color=self.colors['danger'], linewidth=2)
+        self.download_line, = self.ax_speed.plot([], [], label='Download', color=self.colors['success'], linewidth=2)
+        self.speed_blit.add_artist(self.upload_line)
+        self.speed_blit.add_artist(self.download_line)
+        
+        self.ax_speed.set_xlabel('Time (seconds)', color=self.colors['text'])
+        self.ax_speed.set_ylabel('Speed (MB/s)', color=self.colors['text'])
+        self.ax_speed.set_title('Network Speed Over Time', color=self.colors['text'], pad=20)
+        self.ax_speed.legend(loc='upper left')
+        self.ax_speed.grid(True, alpha=0.3, color=self.colors['text_secondary'])
+        self.ax_speed.tick_params(colors=self.colors['text_secondary'])
+        
+        # Stałe okno czasu: ostatnie HISTORY_LENGTH sekund, 0 = teraz
+        self.ax_speed.set_xlim(-HISTORY_LENGTH, 0)
+        self.speed_ylim = 1
+        self.ax_speed.set_ylim(0, self.speed_ylim)
 
     def update_speed_chart(self):
         """Aktualizuje wykres prędkości sieci"""
-        self.ax_speed.clear()
-        
-        if len(self.timestamps) > 1:
-            # Konwertuj timestampy na względny czas
-            relative_times = [t - self.timestamps[0] for t in self.timestamps]
-            
-            # Rysuj wykresy
-            self.ax_speed.plot(relative_times, self.sent_history, label='Upload', color=self.colors['danger'], linewidth=2)
-            self.ax_speed.plot(relative_times, self.recv_history, label='Download', color=self.colors['success'], linewidth=2)
-            
-            self.ax_speed.set_xlabel('Time (seconds)', color=self.colors['text'])
-            self.ax_speed.set_ylabel('Speed (MB/s)', color=self.colors['text'])
-            self.ax_speed.set_title('Network Speed Over Time', color=self.colors['text'], pad=20)
-            self.ax_speed.legend()
-            self.ax_speed.grid(True, alpha=0.3, color=self.colors['text_secondary'])
-            self.ax_speed.tick_params(colors=self.colors['text_secondary'])
-            
-            # Automatyczne skalowanie osi Y
-            max_speed = max(max(self.sent_history) if self.sent_history else 0, 
-                           max(self.recv_history) if self.recv_history else 0)
-            self.ax_speed.set_ylim(0, max(1, max_speed * 1.1))
-        
-        self.canvas_speed.draw()
+        if len(self.timestamps) < 2:
+            return
+        
+        # Czas względem ostatniej próbki
+        now = self.timestamps[-1]
+        relative_times = [t - now for t in self.timestamps]
+        self.upload_line.set_data(relative_times, self.sent_history)
+        self.download_line.set_data(relative_times, self.recv_history)
+        
+        # Skaluj oś Y tylko gdy maksimum przekroczy zakres lub spadnie wyraźnie poniżej
+        max_speed = max(max(self.sent_history), max(self.recv_history))
+        needed = max(1, max_speed * 1.1)
+        if needed > self.speed_ylim or needed < self.speed_ylim / 4:
+            self.speed_ylim = max(1, needed * 1.25)
+            self.ax_speed.set_ylim(0, self.speed_ylim)
+            self.speed_blit.redraw()
+        else:
+            self.speed_blit.update()
 
-    def update_interfaces_chart(self):
-        """Aktualizuje wykres interfejsów sieciowych"""
+    def build_interfaces_chart(self, names):
+        """Buduje słupki interfejsów - tylko gdy zmieni się lista interfejsów"""
         self.ax_interfaces.clear()
-        
+        self.interfaces_blit.clear()
+        self.interface_names = names
+        
+        x = range(len(names))
+        width = 0.35
+        self.sent_bars = self.ax_interfaces.bar([i - width/2 for i in x], [0] * len(names), width,
+                                                label='Sent', color=self.colors['danger'], alpha=0.7)
+        self.recv_bars = self.ax_interfaces.bar([i + width/2 for i in x], [0] * len(names), width,
+                                                label='Received', color=self.colors['success'], alpha=0.7)
+        # Szczyty z okna historii jako znaczniki nad słupkami
+        self.sent_peaks, = self.ax_interfaces.plot([i - width/2 for i in x], [0] * len(names), '_',
+                                                   markersize=14, color=self.colors['danger'])
+        self.recv_peaks, = self.ax_interfaces.plot([i + width/2 for i in x], [0] * len(names), '_',
+                                                   markersize=14, color=self.colors['success'])
+        for artist in (*self.sent_bars, *self.recv_bars, self.sent_peaks, self.recv_peaks):
+            self.interfaces_blit.add_artist(artist)
+        
+        self.ax_interfaces.set_xlabel('Network Interfaces', color=self.colors['text'])
+        self.ax_interfaces.set_ylabel('Speed (MB/s)', color=self.colors['text'])
+        self.ax_interfaces.set_title(f'Interface Speed (peak over {HISTORY_LENGTH} s)', color=self.colors['text'], pad=20)
+        self.ax_interfaces.set_xticks(x)
+        self.ax_interfaces.set_xticklabels(names, rotation=45, ha='right')
+        self.ax_interfaces.legend(loc='upper left')
+        self.ax_interfaces.grid(True, alpha=0.3, color=self.colors['text_secondary'])
+        self.ax_interfaces.tick_params(colors=self.colors['text_secondary'])
+        self.interfaces_ylim = 1
+        self.ax_interfaces.set_ylim(0, self.interfaces_ylim)
+
+    def update_interfaces_chart(self):
+        """Aktualizuje wykres bieżących i szczytowych prędkości interfejsów"""
+        names = [name for name in self.interface_rates.names() if name not in ['lo', 'loopback']]  # Pomiń interfejs pętli zwrotnej
+        if names != self.interface_names:
+            self.build_interfaces_chart(names)
+            rebuilt = True
+        else:
+            rebuilt = False
+        
+        peak = 0
+        sent_peaks = []
+        recv_peaks = []
+        for i, name in enumerate(names):
+            history = self.interface_rates.get(name)
+            self.sent_bars[i].set_height(history.rate('bytes_sent') / 1024 / 1024)
+            self.recv_bars[i].set_height(history.rate('bytes_recv') / 1024 / 1024)
+            sent_peaks.append(history.peak('bytes_sent') / 1024 / 1024)
+            recv_peaks.append(history.peak('bytes_recv') / 1024 / 1024)
+        self.sent_peaks.set_ydata(sent_peaks)
+        self.recv_peaks.set_ydata(recv_peaks)
+        if names:
+            peak = max(max(sent_peaks), max(recv_peaks))
+        
+        # Skala osi Y jak na wykresie prędkości - zmiana tylko przy wyraźnej różnicy
+        needed = max(1, peak * 1.1)
+        if needed > self.interfaces_ylim or needed < self.interfaces_ylim / 4:
+            self.interfaces_ylim = max(1, needed * 1.25)
+            self.ax_interfaces.set_ylim(0, self.interfaces_ylim)
+            rebuilt = True
+        
+        if rebuilt:
+            self.interfaces_blit.redraw()
+        else:
+            self.interfaces_blit.update()
+
+    @staticmethod
+    def format_rate(value):
+        """Prędkość w B/s jako tekst"""
+        if value >= 1024 * 1024:
+            return f"{value / 1024 / 1024:.2f} MB/s"
+        return f"{value / 1024:.1f} KB/s"
+
+    def update_top_talkers(self, sample):
+        """Dopisuje próbkę ruchu per proces i odświeża tabelę największego ruchu"""
+        traffic = sample.value
+        if not traffic.available:
+            self.talkers_sync.sync([(None, ("N/A", "Per-process traffic unavailable", "", "", "", ""), ())])
+            return
+        self.process_rates.update(traffic)
+        
+        rows = []
+        for pid, history in self.process_rates.top(TOP_TALKERS):
+            rows.append((pid, (pid,
+                               self.process_name(pid),
+                               history.sockets,
+                               self.format_rate(history.recv.last()),
+                               self.format_rate(history.sent.last()),
+                               f"{self.format_rate(history.recv.peak())} / {self.format_rate(history.sent.peak())}"),
+                         ()))
+        self.talkers_sync.sync(rows)
+
+    def process_name(self, pid):
+        """Nazwa procesu z rejestru procesów (lub bezpośrednio z psutil)"""
+        record = self.scheduler.process_registry.record(pid)
+        if record is not None:
+            return record.name
         try:
-            interfaces = psutil.net_io_counters(pernic=True)
-            interface_names = []
-            sent_speeds = []
-            recv_speeds = []
-            
-            for interface, stats in interfaces.items():
-                if interface not in ['lo', 'loopback']:  # Pomiń interfejs pętli zwrotnej
-                    interface_names.append(interface)
-                    # Przybliżona prędkość (w MB/s) - w prawdziwej aplikacji potrzebowalibyśmy historii per interfejs
-                    sent_speeds.append(stats.bytes_sent / 1024 / 1024)
-                    recv_speeds.append(stats.bytes_recv / 1024 / 1024)
-            
-            if interface_names:
-                x = range(len(interface_names))
-                width = 0.35
-                
-                bars_sent = self.ax_interfaces.bar([i - width/2 for i in x], sent_speeds, width, 
-                                                 label='Sent', color=self.colors['danger'], alpha=0.7)
-                bars_recv = self.ax_interfaces.bar([i + width/2 for i in x], recv_speeds, width, 
-                                                 label='Received', color=self.colors['success'], alpha=0.7)
-                
-                self.ax_interfaces.set_xlabel('Network Interfaces', color=self.colors['text'])
-                self.ax_interfaces.set_ylabel('Total Data (MB)', color=self.colors['text'])
-                self.ax_interfaces.set_title('Network Interface Usage', color=self.colors['text'], pad=20)
-                self.ax_interfaces.set_xticks(x)
-                self.ax_interfaces.set_xticklabels(interface_names, rotation=45, ha='right')
-                self.ax_interfaces.legend()
-                self.ax_interfaces.grid(True, alpha=0.3, color=self.colors['text_secondary'])
-                self.ax_interfaces.tick_params(colors=self.colors['text_secondary'])
-        
-        except Exception as e:
-            self.ax_interfaces.text(0.5, 0.5, 'Error loading interface data', 
-                                  ha='center', va='center', transform=self.ax_interfaces.transAxes,
-                                  color=self.colors['text'])
-        
-        self.canvas_interfaces.draw()
+            return psutil.Process(pid).name()
+        except psutil.Error:
+            return "N/A"
+
+    def update_interface_rates(self):
+        """Wpisuje bieżące i szczytowe prędkości do tabeli - tylko zmienione komórki"""
+        for name in self.interface_rates.names():
+            if not self.interfaces_tree.exists(name):
+                continue
+            history = self.interface_rates.get(name)
+            cells = (self.format_rate(history.rate('bytes_recv')),
+                     self.format_rate(history.rate('bytes_sent')),
+                     f"{self.format_rate(history.peak('bytes_recv'))} / {self.format_rate(history.peak('bytes_sent'))}")
+            if self.interface_cells.get(name) != cells:
+                self.interface_cells[name] = cells
+                for column, value in zip(('download', 'upload', 'peak'), cells):
+                    self.interfaces_tree.set(name, column, value)
 
     def refresh_network_data(self):
-        """Odświeża listę interfejsów sieciowych"""
+        """Wymusza ponowny odczyt danych interfejsów sieciowych"""
+        self.scheduler.interface_cache.invalidate()
+        self.scheduler.request('net_if')
+
+    def show_interfaces(self, interfaces):
+        """Przebudowuje listę interfejsów (tylko po zmianie danych w pamięci podręcznej)"""
         try:
             # Wyczyść poprzednie dane
             for item in self.interfaces_tree.get_children():
                 self.interfaces_tree.delete(item)
+            self.interface_cells = {}
             
-            # Pobierz informacje o interfejsach
-            interfaces = psutil.net_if_addrs()
-            stats = psutil.net_if_stats()
-            io_counters = psutil.net_io_counters(pernic=True)
-            
-            for interface, addresses in interfaces.items():
+            for interface, info in interfaces.items():
                 # Znajdź adres IPv4
                 ip_address = "N/A"
                 netmask = "N/A"
                 broadcast = "N/A"
                 
-                for addr in addresses:
+                for addr in info.addresses:
                     if addr.family == 2:  # IPv4
                         ip_address = addr.address
                         netmask = addr.netmask
                         broadcast = addr.broadcast
                         break
                 
-                # Pobierz statystyki interfejsu
-                interface_stats = stats.get(interface, None)
-                speed = "N/A"
-                status = "Down"
-                
-                if interface_stats:
-                    speed = f"{interface_stats.speed} Mbps" if interface_stats.speed > 0 else "Unknown"
-                    status = "Up" if interface_stats.isup else "Down"
+                speed = f"{info.speed} Mbps ({info.duplex})" if info.speed > 0 else "Unknown"
+                mtu = info.mtu if info.mtu is not None else "N/A"
+                status = "Up" if info.isup else "Down"
                 
                 # Określ kolor statusu
                 tags = ('up',) if status == "Up" else ('down',)
                 
-                self.interfaces_tree.insert('', 'end', 
-                                          values=(interface, ip_address, netmask, broadcast, speed, status),
+                self.interfaces_tree.insert('', 'end', iid=interface,
+                                          values=(interface, ip_address, netmask, broadcast, speed, mtu, status, '--', '--', '--'),
                                           tags=tags)
             
-            # Konfiguruj kolory statusów
-            self.interfaces_tree.tag_configure('up', foreground=self.colors['success'])
-            self.interfaces_tree.tag_configure('down', foreground=self.colors['danger'])
-            
         except Exception as e:
             self.network_status_label.config(text=f"Error refreshing interfaces: {str(e)}")
 
     def show_network_details(self):
-        """Pokazuje szczegółowe informacje o sieci"""
+        """Pokazuje szczegółowe informacje o sieci (po świeżej próbce połączeń)"""
+        # Tabelę połączeń czyta tylko wątek kolektora
+        self.scheduler.request('connections', self.show_network_details_dialog)
+
+    def show_network_details_dialog(self, sample):
+        """Okno szczegółów sieci z liczników stanów połączeń w próbce"""
         try:
             # Pobierz statystyki sieciowe
             net_io = psutil.net_io_counters()
-            connections = psutil.net_connections()
+            connections = sample.value
             
             # Grupuj połączenia według statusu
             connection_stats = {}
@@ -339,9 +495,8 @@ class NetworkMonitor:
             for status, count in connection_stats.items():
                 details += f"  {status}: {count}\n"
             
-            # Informacje o interfejsach
-            interfaces = psutil.net_if_addrs()
-            details += f"\n📡 Network Interfaces: {len(interfaces)}"
+            # Informacje o interfejsach (z pamięci podręcznej)
+            details += f"\n📡 Network Interfaces: {self.interface_count}"
             
             # Pokaż okno dialogowe
             import tkinter.messagebox as messagebox
@@ -352,16 +507,27 @@ class NetworkMonitor:
             messagebox.showerror("Error", f"Cannot get network details: {e}")
 
     def show_network_connections(self):
-        """Pokazuje aktywne połączenia sieciowe"""
+        """Pokazuje aktywne połączenia sieciowe - odświeżane na żywo"""
         try:
-            connections = psutil.net_connections()
-            
             # Utwórz nowe okno dla połączeń
             connections_window = tk.Toplevel(self.parent_frame)
             connections_window.title("Network Connections")
             connections_window.geometry("800x600")
             connections_window.configure(bg=self.colors['bg'])
             
+            # Widok i filtr
+            toolbar = ttk.Frame(connections_window, style='Modern.TFrame', padding="10 10 10 0")
+            toolbar.pack(fill='x')
+            ttk.Label(toolbar, text="View:", style='Modern.TLabel').pack(side=tk.LEFT)
+            mode_var = tk.StringVar(value=CONNECTION_VIEWS[0])
+            mode_box = ttk.Combobox(toolbar, textvariable=mode_var, values=CONNECTION_VIEWS,
+                                    state='readonly', width=14)
+            mode_box.pack(side=tk.LEFT, padx=5)
+            ttk.Label(toolbar, text="Filter:", style='Modern.TLabel').pack(side=tk.LEFT, padx=(10, 0))
+            filter_var = tk.StringVar()
+            filter_entry = ttk.Entry(toolbar, textvariable=filter_var, font=('Arial', 10))
+            filter_entry.pack(side=tk.LEFT, fill='x', expand=True, padx=5)
+            
             # Ramka z połączeniami
             conn_frame = ttk.Frame(connections_window, style='Modern.TFrame', padding="10")
             conn_frame.pack(fill='both', expand=True)
@@ -387,66 +553,145 @@ class NetworkMonitor:
             conn_tree.pack(fill='both', expand=True, side=tk.LEFT)
             
             # Pasek przewijania
-            scrollbar_conn = ttk.Scrollbar(conn_frame, orient=tk.VERTICAL, command=conn_tree.yview)
-            conn_tree.configure(yscrollcommand=scrollbar_conn.set)
+            scrollbar_conn = ttk.Scrollbar(conn_frame, orient=tk.VERTICAL)
             scrollbar_conn.pack(side=tk.RIGHT, fill='y')
             
-            # Wypełnij danymi
-            for conn in connections:
-                try:
-                    laddr = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else "N/A"
-                    raddr = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A"
-                    
-                    # Konwertuj rodzinę adresów
-                    family = "IPv4" if conn.family == 2 else "IPv6" if conn.family == 10 else "Other"
-                    
-                    # Konwertuj typ
-                    type_map = {1: "TCP", 2: "UDP", 3: "Other"}
-                    conn_type = type_map.get(conn.type, "Unknown")
-                    
-                    conn_tree.insert('', 'end', 
-                                   values=(conn.pid or "N/A", laddr, raddr, conn.status, family, conn_type))
-                except:
-                    continue
+            # Tabela zgrupowana (widoki z licznikami)
+            group_frame = ttk.Frame(connections_window, style='Modern.TFrame', padding="10")
+            group_tree = ttk.Treeview(group_frame, columns=('group', 'count'), show='headings', height=20)
+            group_tree.heading('group', text='Group')
+            group_tree.heading('count', text='Connections')
+            group_tree.column('group', width=500)
+            group_tree.column('count', width=150, anchor='center')
+            group_tree.pack(fill='both', expand=True, side=tk.LEFT)
+            scrollbar_group = ttk.Scrollbar(group_frame, orient=tk.VERTICAL)
+            scrollbar_group.pack(side=tk.RIGHT, fill='y')
+            
+            # Tabele wirtualne diffowane po krotce gniazda / grupie:
+            # PID ustalany tylko dla wierszy w widżecie
+            conn_table = VirtualTable(conn_tree, scrollbar_conn,
+                                      lambda index: (self.format_connection(conn_table.columns['connection'][index]), ()))
+            group_table = VirtualTable(group_tree, scrollbar_group,
+                                       lambda index: ((group_table.keys[index], group_table.columns['count'][index]), ()))
+            
+            status_label = ttk.Label(connections_window, text="Loading connections...", style='Modern.TLabel')
+            status_label.pack(fill='x', padx=10)
+            
+            state = {'connections': (), 'texts': [], 'mode': CONNECTION_VIEWS[0], 'owners': False}
+            
+            def want_owners(wanted):
+                # Widok PID i filtr potrzebują właścicieli wszystkich gniazd
+                if wanted != state['owners']:
+                    state['owners'] = wanted
+                    self.scheduler.connection_table.resolve_owners += 1 if wanted else -1
+                    if wanted:
+                        self.scheduler.request('connections')
+            
+            def on_sample(sample):
+                connections = sample.value
+                state['connections'] = connections
+                # Tekst do filtrowania liczony raz na próbkę
+                state['texts'] = [self.connection_text(conn) for conn in connections]
+                conn_table.set_data([self.connection_key(conn) for conn in connections],
+                                    {'connection': connections})
+                render()
+            
+            def render(*args):
+                mode = mode_var.get()
+                query = filter_var.get().strip().lower()
+                want_owners(mode == 'PID' or bool(query))
+                if mode != state['mode']:
+                    state['mode'] = mode
+                    if mode == CONNECTION_VIEWS[0]:
+                        group_frame.pack_forget()
+                        conn_frame.pack(fill='both', expand=True, before=status_label)
+                    else:
+                        conn_frame.pack_forget()
+                        group_frame.pack(fill='both', expand=True, before=status_label)
+                
+                texts = state['texts']
+                predicate = (lambda index: query in texts[index]) if query else None
+                conn_table.apply_view(None, predicate=predicate)
+                if mode == CONNECTION_VIEWS[0]:
+                    conn_table.render()
+                else:
+                    connections = state['connections']
+                    counts = Counter(self.connection_group(mode, connections[index]) for index in conn_table.view)
+                    if mode == 'PID':
+                        # Nazwa procesu raz na PID, nie raz na połączenie
+                        counts = Counter({self.pid_group(pid): count for pid, count in counts.items()})
+                    groups = list(counts)
+                    group_table.set_data(groups, {'count': [counts[group] for group in groups]})
+                    group_table.apply_view('count', reverse=True)
+                    group_table.render()
+                
+                status_label.config(text=f"Connections: {len(state['connections'])} | Shown: {len(conn_table.view)} | "
+                                         f"Last updated: {time.strftime('%H:%M:%S')}")
+            
+            def close():
+                self.scheduler.unsubscribe(subscription)
+                want_owners(False)
+                connections_window.destroy()
             
             # Przycisk odświeżania
             refresh_btn = ttk.Button(connections_window, text="🔄 Refresh", 
                                    style='Modern.TButton',
-                                   command=lambda: self.refresh_connections(conn_tree))
+                                   command=lambda: self.scheduler.request('connections'))
             refresh_btn.pack(pady=10)
             
+            mode_box.bind('<<ComboboxSelected>>', render)
+            filter_entry.bind('<KeyRelease>', render)
+            connections_window.protocol("WM_DELETE_WINDOW", close)
+            # Odświeżanie na żywo, dopóki okno jest otwarte
+            subscription = self.scheduler.subscribe('connections', on_sample)
+            
         except Exception as e:
             import tkinter.messagebox as messagebox
             messagebox.showerror("Error", f"Cannot show network connections: {e}")
 
-    def refresh_connections(self, tree):
-        """Odświeża listę połączeń sieciowych"""
-        try:
-            # Wyczyść poprzednie dane
-            for item in tree.get_children():
-                tree.delete(item)
-            
-            # Pobierz nowe połączenia
-            connections = psutil.net_connections()
-            
-            # Wypełnij danymi
-            for conn in connections:
-                try:
-                    laddr = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else "N/A"
-                    raddr = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A"
-                    
-                    family = "IPv4" if conn.family == 2 else "IPv6" if conn.family == 10 else "Other"
-                    type_map = {1: "TCP", 2: "UDP", 3: "Other"}
-                    conn_type = type_map.get(conn.type, "Unknown")
-                    
-                    tree.insert('', 'end', 
-                              values=(conn.pid or "N/A", laddr, raddr, conn.status, family, conn_type))
-                except:
-                    continue
-                    
-        except Exception as e:
-            import tkinter.messagebox as messagebox
-            messagebox.showerror("Error", f"Cannot refresh connections: {e}")
+    @staticmethod
+    def connection_key(conn):
+        """Klucz wiersza: krotka gniazda"""
+        return (conn.type, conn.laddr, conn.raddr, conn.inode)
+
+    def format_connection(self, conn):
+        """Wartości wiersza połączenia (PID z pamięci podręcznej i-węzłów,
+        brakujące ustalane w wątku kolektora przy następnej próbce)"""
+        laddr = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else "N/A"
+        raddr = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A"
+        
+        # Konwertuj rodzinę adresów
+        family = "IPv4" if conn.family == 2 else "IPv6" if conn.family == 10 else "Other"
+        
+        # Konwertuj typ
+        type_map = {1: "TCP", 2: "UDP", 3: "Other"}
+        conn_type = type_map.get(conn.type, "Unknown")
+        
+        return (self.scheduler.connection_table.cached_pid(conn, request=True) or "N/A", laddr, raddr, conn.status, family, conn_type)
+
+    def connection_text(self, conn):
+        """Tekst połączenia przeszukiwany przez filtr (PID, gdy już znany)"""
+        pid = self.scheduler.connection_table.cached_pid(conn)
+        laddr = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else ""
+        raddr = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else ""
+        kind = "tcp" if conn.type == 1 else "udp"
+        return f"{pid or ''} {laddr} {raddr} {conn.status} {kind}".lower()
+
+    def connection_group(self, mode, conn):
+        """Wartość grupująca połączenie w widoku zgrupowanym (w widoku PID sam PID)"""
+        if mode == 'Remote host':
+            return conn.raddr.ip if conn.raddr else "N/A"
+        if mode == 'Local port':
+            return str(conn.laddr.port) if conn.laddr else "N/A"
+        if mode == 'State':
+            return conn.status
+        return self.scheduler.connection_table.cached_pid(conn)
+
+    def pid_group(self, pid):
+        """Etykieta grupy PID z nazwą procesu"""
+        if pid is None:
+            return "N/A"
+        return f"{pid} ({self.process_name(pid)})"
 
     def show_network_settings(self):
         """Pokazuje ustawienia sieci"""
@@ -0,0 +1,102 @@
+import threading
+from collections import namedtuple
+
+import psutil
+
+import procfs
+
+ProcessInfo = namedtuple('ProcessInfo', ['pid', 'name', 'cpu', 'memory', 'status',
+                                         'user', 'threads', 'create_time'])
+
+PROCESS_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_percent',
+                 'status', 'username', 'num_threads', 'create_time']
+
+
+class ProcessRegistry:
+    """Długożyjący rejestr procesów kluczowany (pid, create_time).
+
+    Raz na tick (w wątku kolektora) odczytuje wszystkie procesy - z /proc
+    na Linuksie, inaczej przez trwałe obiekty psutil.Process - i liczy
+    użycie CPU z różnicy czasów względem poprzedniego ticku. Ostatnie
+    rekordy i uchwyty psutil.Process są udostępniane zakładce CPU,
+    zakładce Processes oraz oknom szczegółów i zasobów.
+    """
+
+    def __init__(self):
+        self.reader = procfs.ProcfsReader() if procfs.is_available() else None
+        self.records = {}  # pid -> ProcessInfo z ostatniego ticku
+        self.handles = {}  # (pid, create_time) -> psutil.Process
+        self._lock = threading.Lock()
+
+    def sample(self):
+        """Odczytuje procesy (raz na tick) i zwraca krotkę ProcessInfo"""
+        if self.reader is not None:
+            processes = tuple(ProcessInfo._make(row) for row in self.reader.read_all())
+        else:
+            processes = self.sample_psutil()
+
+        records = {proc.pid: proc for proc in processes}
+        with self._lock:
+            self.records = records
+            # Zapomnij uchwyty procesów, które się zakończyły
+            self.handles = {key: handle for key, handle in self.handles.items()
+                            if key[0] in records and records[key[0]].create_time == key[1]}
+        return processes
+
+    def sample_psutil(self):
+        """Ścieżka psutil - trwałe obiekty Process pamiętają poprzednie czasy CPU"""
+        with self._lock:
+            handles = dict(self.handles)
+        by_pid = {key[0]: handle for key, handle in handles.items()}
+
+        processes = []
+        for pid in psutil.pids():
+            try:
+                handle = by_pid.get(pid)
+                if handle is None or not handle.is_running():
+                    handle = psutil.Process(pid)
+                with handle.oneshot():
+                    info = handle.as_dict(PROCESS_ATTRS)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            create_time = info['create_time'] or 0
+            handles[(pid, create_time)] = handle
+            processes.append(ProcessInfo(
+                pid=pid,
+                name=info['name'] or '',
+                cpu=info['cpu_percent'] or 0,
+                memory=info['memory_percent'] or 0,
+                status=info['status'] or 'unknown',
+                user=info['username'] or 'N/A',
+                threads=info['num_threads'] or 0,
+                create_time=create_time
+            ))
+
+        with self._lock:
+            self.handles = handles
+        return tuple(processes)
+
+    def record(self, pid):
+        """Ostatni rekord procesu (lub None)"""
+        with self._lock:
+            return self.records.get(pid)
+
+    def get(self, pid):
+        """Zwraca (rekord, psutil.Process) dla procesu z ostatniego ticku.
+
+        Uchwyt jest tworzony raz i ponownie używany; zgłasza
+        psutil.NoSuchProcess, jeśli pid zniknął lub został użyty ponownie.
+        """
+        with self._lock:
+            record = self.records.get(pid)
+            if record is None:
+                raise psutil.NoSuchProcess(pid)
+            key = (pid, record.create_time)
+            handle = self.handles.get(key)
+        if handle is None:
+            handle = psutil.Process(pid)
+            if record.create_time and abs(handle.create_time() - record.create_time) > 0.01:
+                raise psutil.NoSuchProcess(pid)
+            with self._lock:
+                self.handles[key] = handle
+        return record, handle
@@ -0,0 +1,197 @@
+import os
+import pwd
+import sys
+import time
+
+# Stałe jądra potrzebne do przeliczeń
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# Statusy w nazewnictwie psutil
+STATUS_MAP = {
+    'R': 'running',
+    'S': 'sleeping',
+    'D': 'disk-sleep',
+    'T': 'stopped',
+    't': 'tracing-stop',
+    'Z': 'zombie',
+    'X': 'dead',
+    'x': 'dead',
+    'K': 'wake-kill',
+    'W': 'waking',
+    'I': 'idle',
+    'P': 'parked',
+}
+
+
+def is_available():
+    """Czy szybka ścieżka /proc jest dostępna (Linux)"""
+    return sys.platform.startswith('linux') and os.path.exists('/proc/self/stat')
+
+
+class ProcfsReader:
+    """Szybki odczyt listy procesów bezpośrednio z /proc (Linux).
+
+    Czyta /proc/[pid]/stat i /proc/[pid]/status do jednego bufora
+    wielokrotnego użytku, a nazwy użytkowników rozwiązuje przez
+    pamięć podręczną uid -> nazwa. Zwraca krotki w kolejności pól
+    ProcessInfo: (pid, name, cpu, memory, status, user, threads, create_time).
+    Obiekt nie jest bezpieczny wątkowo - używa go tylko wątek kolektora.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray(4096)
+        self.users = {}
+        self.prev_ticks = {}
+        self.long_names = {}  # (pid, starttime) -> pełna nazwa dla obciętych comm
+        self.prev_timestamp = None
+        self.boot_time = self.read_boot_time()
+        self.mem_total = self.read_mem_total()
+
+    def read_file(self, path):
+        """Czyta cały plik do bufora wielokrotnego użytku"""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.readv(fd, [self.buffer])
+            while size == len(self.buffer):
+                # Bufor za mały - powiększ i doczytaj resztę
+                chunk = os.read(fd, len(self.buffer))
+                if not chunk:
+                    break
+                self.buffer.extend(chunk)
+                size += len(chunk)
+            return bytes(memoryview(self.buffer)[:size])
+        finally:
+            os.close(fd)
+
+    def read_boot_time(self):
+        """Czas startu systemu z /proc/stat"""
+        for line in self.read_file('/proc/stat').splitlines():
+            if line.startswith(b'btime'):
+                return float(line.split()[1])
+        return 0.0
+
+    def read_mem_total(self):
+        """Całkowita pamięć w bajtach z /proc/meminfo"""
+        for line in self.read_file('/proc/meminfo').splitlines():
+            if line.startswith(b'MemTotal:'):
+                return int(line.split()[1]) * 1024
+        return 0
+
+    def username(self, uid):
+        """Nazwa użytkownika z pamięci podręcznej uid -> nazwa"""
+        name = self.users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self.users[uid] = name
+        return name
+
+    def read_process(self, pid):
+        """Parsuje /proc/[pid]/stat i status; zwraca (pola, ticki CPU)"""
+        data = self.read_file(f'/proc/{pid}/stat')
+        # Nazwa (comm) może zawierać spacje i nawiasy - szukaj ostatniego ')'
+        lparen = data.find(b'(')
+        rparen = data.rfind(b')')
+        name = data[lparen + 1:rparen].decode('utf-8', 'replace')
+        fields = data[rparen + 2:].split()
+
+        state = fields[0].decode()
+        ticks = int(fields[11]) + int(fields[12])  # utime + stime
+        threads = int(fields[17])
+        starttime = int(fields[19])
+        if len(name) == 15:
+            # comm obcinane przez jądro do 15 znaków - pełna nazwa z cmdline (jak psutil)
+            name = self.full_name(pid, starttime, name)
+        rss = int(fields[21]) * PAGE_SIZE
+
+        status = self.read_file(f'/proc/{pid}/status')
+        uid_pos = status.find(b'\nUid:')
+        uid = int(status[uid_pos + 5:status.find(b'\n', uid_pos + 1)].split()[0]) if uid_pos >= 0 else 0
+
+        create_time = self.boot_time + starttime / CLK_TCK
+        memory = rss / self.mem_total * 100 if self.mem_total else 0
+        return [pid, name, 0.0, memory, STATUS_MAP.get(state, state),
+                self.username(uid), threads, create_time], (starttime, ticks)
+
+    def full_name(self, pid, starttime, comm):
+        """Nazwa z argv[0], jeśli zaczyna się od obciętego comm (zapamiętywana)"""
+        key = (pid, starttime)
+        name = self.long_names.get(key)
+        if name is None:
+            name = comm
+            try:
+                argv0 = self.read_file(f'/proc/{pid}/cmdline').split(b'\0', 1)[0]
+            except OSError:
+                argv0 = b''
+            if argv0:
+                extended = os.path.basename(argv0.decode('utf-8', 'replace'))
+                if extended.startswith(comm):
+                    name = extended
+            self.long_names[key] = name
+        return name
+
+    def read_all(self):
+        """Odczytuje wszystkie procesy i liczy użycie CPU z różnicy ticków"""
+        timestamp = time.monotonic()
+        elapsed = timestamp - self.prev_timestamp if self.prev_timestamp else 0
+        prev_ticks = self.prev_ticks
+        ticks_now = {}
+        processes = []
+
+        with os.scandir('/proc') as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                try:
+                    row, (starttime, ticks) = self.read_process(pid)
+                except (FileNotFoundError, ProcessLookupError, PermissionError, IndexError, ValueError):
+                    # Proces zakończył się w trakcie odczytu lub brak dostępu
+                    continue
+
+                key = (pid, starttime)
+                ticks_now[key] = ticks
+                if elapsed > 0 and key in prev_ticks:
+                    row[2] = (ticks - prev_ticks[key]) / CLK_TCK / elapsed * 100
+                processes.append(tuple(row))
+
+        self.prev_ticks = ticks_now
+        if self.long_names:
+            self.long_names = {key: name for key, name in self.long_names.items() if key in ticks_now}
+        self.prev_timestamp = timestamp
+        return processes
+
+
+def benchmark_process_readers(rounds=10):
+    """Porównuje czas wyliczenia procesów: /proc vs psutil.process_iter"""
+    import psutil
+    from processes import PROCESS_ATTRS
+
+    def run_psutil():
+        for proc in psutil.process_iter(PROCESS_ATTRS):
+            proc.info
+
+    reader = ProcfsReader()
+    results = {}
+    for label, func in (('procfs', reader.read_all), ('psutil', run_psutil)):
+        func()  # Rozgrzewka (pierwsza próbka CPU)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        results[label] = (time.perf_counter() - start) / rounds
+    return results
+
+
+if __name__ == "__main__":
+    if not is_available():
+        print("/proc is not available on this system")
+        sys.exit(1)
+    process_count = len(ProcfsReader().read_all())
+    results = benchmark_process_readers()
+    print(f"Processes: {process_count}")
+    for label, seconds in results.items():
+        print(f"{label:>8}: {seconds * 1000:.2f} ms per enumeration")
+    print(f" speedup: {results['psutil'] / results['procfs']:.1f}x")
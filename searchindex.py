@@ -0,0 +1,258 @@
+import hashlib
+import os
+import pickle
+import threading
+from array import array
+from collections import Counter
+
+from dirindex import default_index_path
+from fileops import walk_tree
+
+INDEX_VERSION = 1
+
+
+def trigrams(text):
+    """Zbiór trigramów tekstu (małe litery)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_path_for(root):
+    """Plik indeksu dla danego katalogu głównego"""
+    digest = hashlib.sha1(os.fsencode(root)).hexdigest()[:16]
+    return os.path.join(os.path.dirname(default_index_path()), f'search-{digest}.pickle')
+
+
+class FilenameIndex:
+    """Trigramowy indeks nazw plików pod wybranym katalogiem.
+
+    Każda nazwa ma identyfikator; dla trigramu trzymana jest rosnąca lista
+    identyfikatorów (array). Zapytanie o podciąg przecina listy trigramów
+    zapytania i weryfikuje kandydatów, zapytanie rozmyte liczy wspólne
+    trigramy. Przy ponownym skanowaniu katalogi o niezmienionym mtime nie
+    są listowane - ich nazwy zostają, a nazwy ze zmienionych katalogów są
+    oznaczane jako usunięte i dopisywane na nowo (kompaktowanie, gdy
+    usuniętych robi się dużo). Indeks jest zapisywany na dysku.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(os.fspath(root))
+        self.path = index_path_for(self.root)
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.busy = False
+        self.error = None
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        self.names = []      # id -> nazwa (None dla usuniętych)
+        self.folded = []     # id -> nazwa małymi literami
+        self.parents = []    # id -> katalog nadrzędny
+        self.dirs = {}       # katalog -> (mtime, podkatalogi, identyfikatory wpisów)
+        self.postings = {}   # trigram -> array('I') identyfikatorów
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.names) - self.dead
+
+    # --- Budowanie ---
+
+    def start(self, rescan=True):
+        """Wczytuje zapisany indeks i (opcjonalnie) skanuje ponownie - w tle.
+
+        Trwające skanowanie jest anulowane, a nowe rusza po jego zakończeniu.
+        """
+        self.cancel()
+        self.cancel_event = threading.Event()
+        self.error = None
+        self.busy = True
+        self._thread = threading.Thread(target=self._run, args=(rescan, self.cancel_event, self._thread),
+                                        daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        """Czy ostatnie skanowanie zostało przerwane (indeks niekompletny)"""
+        return self.cancel_event.is_set()
+
+    def _run(self, rescan, cancel_event, previous):
+        if previous is not None:
+            previous.join()  # Jeden skan naraz - poprzedni kończy się przy punkcie kontrolnym
+        try:
+            if cancel_event.is_set():
+                return
+            if not self.names:
+                self.load()
+            if rescan:
+                self.rescan(cancel_event)
+                if not cancel_event.is_set():
+                    self.save()
+        except (OSError, pickle.PickleError, EOFError, ValueError) as e:
+            self.error = e
+        finally:
+            if cancel_event is self.cancel_event:
+                self.busy = False
+
+    def rescan(self, cancel_event):
+        """Przyrostowe skanowanie drzewa (wspólny walk_tree z Large Files)"""
+        old_dirs = dict(self.dirs)
+        mtimes = {}
+        # Katalogi obecne w indeksie po skanowaniu: niezmienione lub wylistowane.
+        # Usunięte i nieczytelne nie trafiają tu - ich nazwy zostaną oznaczone jako usunięte.
+        visited = set()
+
+        def cached_subdirs(path):
+            try:
+                mtime = os.stat(path).st_mtime
+            except (OSError, PermissionError):
+                return []  # Katalogu już nie ma - pomiń go i jego poddrzewo
+            mtimes[path] = mtime
+            cached = old_dirs.get(path)
+            if cached is not None and cached[0] == mtime:
+                visited.add(path)
+                return cached[1]  # Katalog bez zmian - nie listuj
+            return None
+
+        def on_directory(path, entries, subdirs):
+            names = [entry.name for entry in entries]
+            with self.lock:
+                visited.add(path)
+                cached = old_dirs.get(path)
+                if cached is not None:
+                    self._drop(cached[2])
+                self.dirs[path] = (mtimes.get(path), tuple(subdirs), self._add(path, names))
+
+        walk_tree(self.root, None, cancel_event.is_set, same_filesystem=True,
+                  on_directory=on_directory, cached_subdirs=cached_subdirs)
+        if cancel_event.is_set():
+            return
+
+        # Katalogi, których już nie ma
+        with self.lock:
+            for path in [path for path in self.dirs if path not in visited]:
+                self._drop(self.dirs.pop(path)[2])
+            if self.dead > len(self.names) // 4:
+                self._compact()
+
+    def _add(self, parent, names):
+        """Dopisuje nazwy katalogu; zwraca ich identyfikatory"""
+        ids = []
+        for name in names:
+            ident = len(self.names)
+            folded = name.lower()
+            self.names.append(name)
+            self.folded.append(folded)
+            self.parents.append(parent)
+            for trigram in trigrams(folded):
+                posting = self.postings.get(trigram)
+                if posting is None:
+                    posting = self.postings[trigram] = array('I')
+                posting.append(ident)
+            ids.append(ident)
+        return ids
+
+    def _drop(self, ids):
+        """Oznacza nazwy jako usunięte (listy trigramów czyszczone przy kompaktowaniu)"""
+        for ident in ids:
+            if self.names[ident] is not None:
+                self.names[ident] = None
+                self.dead += 1
+
+    def _compact(self):
+        """Przebudowuje identyfikatory bez usuniętych nazw"""
+        entries = [(path, mtime, subdirs, [self.names[i] for i in ids if self.names[i] is not None])
+                   for path, (mtime, subdirs, ids) in self.dirs.items()]
+        self.reset()
+        for path, mtime, subdirs, names in entries:
+            self.dirs[path] = (mtime, subdirs, self._add(path, names))
+
+    # --- Zapis ---
+
+    def load(self):
+        """Wczytuje indeks z dysku (jeśli istnieje)"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        if data.get('version') != INDEX_VERSION or data.get('root') != self.root:
+            return
+        with self.lock:
+            self.names = data['names']
+            self.folded = [name.lower() if name is not None else None for name in self.names]
+            self.parents = data['parents']
+            self.dirs = data['dirs']
+            self.postings = {trigram: array('I', raw) for trigram, raw in data['postings'].items()}
+            self.dead = sum(1 for name in self.names if name is None)
+
+    def save(self):
+        """Zapisuje indeks atomowo (plik tymczasowy + replace)"""
+        with self.lock:
+            data = {
+                'version': INDEX_VERSION,
+                'root': self.root,
+                'names': self.names,
+                'parents': self.parents,
+                'dirs': self.dirs,
+                'postings': {trigram: posting.tobytes() for trigram, posting in self.postings.items()},
+            }
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, self.path)
+
+    # --- Zapytania ---
+
+    def search(self, query, limit=200):
+        """Zwraca listę (id, nazwa, katalog): najpierw podciągi, potem dopasowania rozmyte"""
+        folded = query.strip().lower()
+        if not folded:
+            return []
+        with self.lock:
+            matches = self._substring(folded, limit)
+            if len(matches) < limit and len(folded) >= 3:
+                seen = set(matches)
+                matches.extend(ident for ident in self._fuzzy(folded, limit) if ident not in seen)
+            return [(ident, self.names[ident], self.parents[ident]) for ident in matches[:limit]]
+
+    def _substring(self, folded, limit):
+        names = self.folded
+        dead = self.names
+        if len(folded) < 3:
+            # Za krótkie na trigramy - przegląd liniowy
+            candidates = range(len(names))
+        else:
+            postings = sorted((self.postings.get(t, ()) for t in trigrams(folded)), key=len)
+            if not postings or not postings[0]:
+                return []
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return []
+            candidates = sorted(candidates)
+        result = []
+        for ident in candidates:
+            if dead[ident] is not None and folded in names[ident]:
+                result.append(ident)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def _fuzzy(self, folded, limit):
+        """Nazwy z co najmniej połową wspólnych trigramów, od najlepszych"""
+        query_trigrams = trigrams(folded)
+        counts = Counter()
+        for trigram in query_trigrams:
+            counts.update(self.postings.get(trigram, ()))
+        needed = max(1, len(query_trigrams) // 2)
+        scored = [(count, ident) for ident, count in counts.items()
+                  if count >= needed and self.names[ident] is not None]
+        # Więcej wspólnych trigramów, potem krótsza nazwa
+        scored.sort(key=lambda item: (-item[0], len(self.folded[item[1]])))
+        return [ident for count, ident in scored[:limit]]
@@ -0,0 +1,298 @@
+import errno
+import os
+import re
+import shutil
+import subprocess
+import time
+from collections import namedtuple
+
+# Odczyt czujników: dostępność, kod wyjścia, surowy tekst, odczyty temperatur
+# i przekroczenie limitu czasu programu sensors
+SensorsSample = namedtuple('SensorsSample', ['available', 'returncode', 'output', 'readings', 'timed_out'])
+TempReading = namedtuple('TempReading', ['sensor', 'current', 'high', 'critical'])
+
+# Limit czasu programu sensors (liczony od startu procesu, nie blokuje kolektora)
+SENSORS_TIMEOUT = 5
+
+# Ile najwyżej czeka odczyt w wątku kolektora, zanim sprawdzi wynik w kolejnym ticku
+SENSORS_WAIT = 0.25
+
+# Przerwa przed ponownym uruchomieniem po przekroczeniu limitu czasu
+SENSORS_BACKOFF = 30
+
+CURRENT_PATTERN = re.compile(r'([+-]?\d+\.\d+)°C')
+HIGH_PATTERN = re.compile(r'high\s*=\s*([+-]?\d+\.\d+)')
+CRIT_PATTERN = re.compile(r'crit\s*=\s*([+-]?\d+\.\d+)')
+
+
+def extract_temperature_value(temp_data, pattern):
+    """Ekstraktuje wartość temperatury z tekstu"""
+    match = pattern.search(temp_data)
+    return float(match.group(1)) if match else None
+
+
+def parse_sensors_output(sensors_output):
+    """Parsuje tekst z lm-sensors do krotki TempReading"""
+    readings = []
+    current_adapter = ""
+    for line in sensors_output.split('\n'):
+        line = line.strip()
+
+        # Pomiń puste linie
+        if not line:
+            continue
+
+        # Sprawdź czy to nowy adapter
+        if line.startswith('Adapter:'):
+            current_adapter = line
+            continue
+
+        # Parsuj linię z temperaturą
+        if ':' in line and ('°C' in line or '°F' in line):
+            sensor_name, temp_data = line.split(':', 1)
+            sensor_name = sensor_name.strip()
+            if current_adapter:
+                sensor_name += f" ({current_adapter})"
+            readings.append(TempReading(sensor_name,
+                                        extract_temperature_value(temp_data, CURRENT_PATTERN),
+                                        extract_temperature_value(temp_data, HIGH_PATTERN),
+                                        extract_temperature_value(temp_data, CRIT_PATTERN)))
+    return tuple(readings)
+
+
+class LmSensorsBackend:
+    """Odczyt czujników przez program sensors (lm-sensors).
+
+    Ścieżka programu ustalana jest raz (resolve), a nie przy każdym
+    odczycie. Program działa jako osobny proces: read() czeka na niego
+    najwyżej SENSORS_WAIT, a gdy jeszcze działa, zwraca None (brak nowej
+    próbki) i odbiera wynik w kolejnym ticku. Zawieszony program jest
+    zabijany po SENSORS_TIMEOUT i ponawiany dopiero po SENSORS_BACKOFF.
+    """
+
+    name = 'lm-sensors'
+
+    def __init__(self):
+        self.binary = None
+        self.process = None
+        self.started = 0.0
+        self.retry_at = 0.0
+        self.resolve()
+
+    def resolve(self):
+        """Wyszukuje program sensors w PATH (np. po instalacji pakietu)"""
+        self.binary = shutil.which('sensors')
+        self.retry_at = 0.0
+        return self.binary is not None
+
+    def read(self):
+        """Odczyt wszystkich czujników - wywoływany w wątku kolektora"""
+        if self.process is None:
+            if self.binary is None:
+                return SensorsSample(available=False, returncode=None, output='', readings=(), timed_out=False)
+            if time.monotonic() < self.retry_at:
+                return None  # Przerwa po przekroczeniu limitu - zostaje poprzednia próbka
+            try:
+                self.process = subprocess.Popen([self.binary], stdout=subprocess.PIPE,
+                                                stderr=subprocess.DEVNULL, text=True)
+            except OSError:
+                return SensorsSample(available=False, returncode=None, output='', readings=(), timed_out=False)
+            self.started = time.monotonic()
+
+        try:
+            output, _ = self.process.communicate(timeout=SENSORS_WAIT)
+        except subprocess.TimeoutExpired:
+            if time.monotonic() - self.started < SENSORS_TIMEOUT:
+                return None  # Jeszcze działa - wynik w kolejnym ticku
+            # Zawieszony odczyt (np. I2C/SMBus) - zabij bez czekania na zakończenie
+            self.process.kill()
+            self.process.stdout.close()
+            self.process = None
+            self.retry_at = time.monotonic() + SENSORS_BACKOFF
+            return SensorsSample(available=True, returncode=None, output='', readings=(), timed_out=True)
+
+        returncode = self.process.returncode
+        self.process = None
+        readings = parse_sensors_output(output) if returncode == 0 else ()
+        return SensorsSample(available=True, returncode=returncode,
+                             output=output, readings=readings, timed_out=False)
+
+
+class HwmonBackend:
+    """Natywny odczyt temperatur z sysfs (Linux) - bez lm-sensors.
+
+    Przy wyliczaniu przechodzi /sys/class/hwmon/*/temp*_input (z _max,
+    _crit i _label) oraz /sys/class/thermal/thermal_zone* (strefy bez
+    własnego urządzenia hwmon, by nie dublować czujników). Deskryptory
+    plików zostają otwarte, a każdy odczyt to os.pread od początku pliku.
+    """
+
+    name = 'hwmon'
+
+    def __init__(self, hwmon_root='/sys/class/hwmon', thermal_root='/sys/class/thermal'):
+        self.hwmon_root = hwmon_root
+        self.thermal_root = thermal_root
+        self.sensors = []  # (chip, nazwa, fd wartości, fd max, fd crit)
+        self.resolve_requested = False
+        self.enumerate()
+
+    def resolve(self):
+        """Zleca ponowne wyliczenie czujników przy następnym odczycie.
+
+        Może być wywołane z wątku Tk - deskryptory zamyka i otwiera tylko
+        wątek kolektora w read(), więc nie znikają w trakcie os.pread.
+        """
+        self.resolve_requested = True
+        return True
+
+    def enumerate(self):
+        """Wylicza czujniki i otwiera ich pliki (ponownie po zmianie sprzętu)"""
+        self.close()
+        self.enumerate_hwmon()
+        self.enumerate_thermal()
+        return bool(self.sensors)
+
+    def close(self):
+        """Zamyka otwarte deskryptory"""
+        for sensor in self.sensors:
+            for fd in sensor[2:]:
+                if fd is not None:
+                    os.close(fd)
+        self.sensors = []
+
+    @staticmethod
+    def read_text(path):
+        """Jednorazowy odczyt małego pliku sysfs"""
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def open_value(path):
+        """Otwiera plik wartości do ponownych odczytów (lub None)"""
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+
+    def enumerate_hwmon(self):
+        try:
+            devices = sorted(os.listdir(self.hwmon_root))
+        except OSError:
+            return
+        for device in devices:
+            base = os.path.join(self.hwmon_root, device)
+            # Starsze sterowniki trzymają pliki w podkatalogu device/
+            for directory in (base, os.path.join(base, 'device')):
+                try:
+                    inputs = sorted((name for name in os.listdir(directory)
+                                     if name.startswith('temp') and name.endswith('_input')),
+                                    key=lambda name: int(name[4:-6]) if name[4:-6].isdigit() else 0)
+                except OSError:
+                    continue
+                if not inputs:
+                    continue
+                chip = self.read_text(os.path.join(base, 'name')) or device
+                for name in inputs:
+                    prefix = os.path.join(directory, name[:-len('_input')])
+                    fd = self.open_value(prefix + '_input')
+                    if fd is None:
+                        continue
+                    label = self.read_text(prefix + '_label') or name[:-len('_input')]
+                    self.sensors.append((chip, label, fd,
+                                         self.open_value(prefix + '_max'),
+                                         self.open_value(prefix + '_crit')))
+                break
+
+    def enumerate_thermal(self):
+        try:
+            zones = sorted(name for name in os.listdir(self.thermal_root) if name.startswith('thermal_zone'))
+        except OSError:
+            return
+        for zone in zones:
+            base = os.path.join(self.thermal_root, zone)
+            try:
+                if any(name.startswith('hwmon') for name in os.listdir(base)):
+                    continue  # Strefa ma własne urządzenie hwmon - już odczytana
+            except OSError:
+                continue
+            fd = self.open_value(os.path.join(base, 'temp'))
+            if fd is None:
+                continue
+            kind = self.read_text(os.path.join(base, 'type')) or zone
+            # Progi z punktów wyzwalania: hot -> high, critical -> crit
+            trips = {}
+            index = 0
+            while True:
+                trip_type = self.read_text(os.path.join(base, f'trip_point_{index}_type'))
+                if trip_type is None:
+                    break
+                if trip_type in ('hot', 'critical') and trip_type not in trips:
+                    trips[trip_type] = self.open_value(os.path.join(base, f'trip_point_{index}_temp'))
+                index += 1
+            self.sensors.append((kind, zone, fd, trips.get('hot'), trips.get('critical')))
+
+    @staticmethod
+    def read_value(fd):
+        """Temperatura w °C z pliku w milistopniach (lub None)"""
+        if fd is None:
+            return None
+        try:
+            return int(os.pread(fd, 32, 0)) / 1000.0
+        except (OSError, ValueError):
+            return None
+
+    def read(self):
+        """Odczyt wszystkich czujników - wywoływany w wątku kolektora"""
+        if self.resolve_requested:
+            self.resolve_requested = False
+            self.enumerate()
+        try:
+            return self.read_all()
+        except OSError:
+            # Urządzenie zniknęło (np. wyładowany moduł) - wylicz czujniki od nowa
+            self.enumerate()
+            return self.read_all()
+
+    def read_all(self):
+        readings = []
+        lines = []
+        chip = None
+        for sensor_chip, label, fd, max_fd, crit_fd in self.sensors:
+            try:
+                current = int(os.pread(fd, 32, 0)) / 1000.0
+            except ValueError:
+                current = None  # Np. EAGAIN zgłaszany jako pusty odczyt
+            except OSError as e:
+                if e.errno in (errno.ENODEV, errno.ENOENT, errno.ENXIO):
+                    raise
+                current = None  # Czujnik chwilowo niedostępny (np. uśpione GPU)
+            high = self.read_value(max_fd)
+            critical = self.read_value(crit_fd)
+            readings.append(TempReading(f"{label} ({sensor_chip})", current, high, critical))
+
+            # Tekst w stylu programu sensors dla okna surowego wyniku
+            if sensor_chip != chip:
+                if lines:
+                    lines.append('')
+                lines.append(sensor_chip)
+                chip = sensor_chip
+            line = f"{label + ':':<16}{current:+.1f}°C" if current is not None else f"{label + ':':<16}N/A"
+            limits = [f"{name} = {value:+.1f}°C" for name, value in (('high', high), ('crit', critical))
+                      if value is not None]
+            if limits:
+                line += f"  ({', '.join(limits)})"
+            lines.append(line)
+
+        return SensorsSample(available=True, returncode=0, output='\n'.join(lines) + '\n',
+                             readings=tuple(readings), timed_out=False)
+
+
+def select_backend():
+    """Wybiera backend raz przy starcie: sysfs, a gdy brak czujników - lm-sensors"""
+    hwmon = HwmonBackend()
+    if hwmon.sensors:
+        return hwmon
+    return LmSensorsBackend()
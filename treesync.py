@@ -0,0 +1,79 @@
+class TreeReconciler:
+    """Synchronizuje płaski ttk.Treeview z listą wierszy bez przebudowy.
+
+    Wiersze identyfikowane są kluczem (np. (pid, create_time)). Przy każdej
+    synchronizacji aktualizowane są tylko zmienione komórki, nowe klucze są
+    wstawiane, zniknięte usuwane, a kolejność zmieniana tylko wtedy, gdy
+    faktycznie się różni. Zaznaczenie i pozycja przewijania zostają zachowane.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.rows = {}   # klucz -> [iid, values, tags]
+        self.keys = {}   # iid -> klucz
+        self.order = []  # aktualna kolejność iid w drzewie
+        self._next_id = 0
+
+    def key_for(self, iid):
+        """Zwraca klucz wiersza dla elementu drzewa"""
+        return self.keys.get(iid)
+
+    def iid_for(self, key):
+        """Zwraca element drzewa dla klucza (lub None)"""
+        row = self.rows.get(key)
+        return row[0] if row else None
+
+    def clear(self):
+        """Usuwa wszystkie wiersze"""
+        if self.order:
+            self.tree.delete(*self.order)
+        self.rows = {}
+        self.keys = {}
+        self.order = []
+
+    def sync(self, rows):
+        """Synchronizuje drzewo z listą (klucz, values, tags) w docelowej kolejności"""
+        tree = self.tree
+        wanted = {}
+        new_order = []
+        inserted = []
+
+        for key, values, tags in rows:
+            values = tuple(values)
+            tags = tuple(tags)
+            row = self.rows.get(key)
+            if row is None:
+                # Nowy wiersz
+                iid = f"row{self._next_id}"
+                self._next_id += 1
+                tree.insert('', 'end', iid=iid, values=values, tags=tags)
+                row = [iid, values, tags]
+                self.keys[iid] = key
+                inserted.append(iid)
+            else:
+                # Aktualizuj tylko zmienione komórki
+                if row[1] != values:
+                    old_values = row[1]
+                    for index, value in enumerate(values):
+                        if index >= len(old_values) or old_values[index] != value:
+                            tree.set(row[0], index, value)
+                    row[1] = values
+                if row[2] != tags:
+                    tree.item(row[0], tags=tags)
+                    row[2] = tags
+            wanted[key] = row
+            new_order.append(row[0])
+
+        # Usuń wiersze, których już nie ma
+        removed = {row[0] for key, row in self.rows.items() if key not in wanted}
+        if removed:
+            tree.delete(*removed)
+            for iid in removed:
+                del self.keys[iid]
+        self.rows = wanted
+
+        # Zmień kolejność tylko jeśli się różni (jedno wywołanie Tk)
+        current = [iid for iid in self.order if iid not in removed] + inserted
+        if current != new_order:
+            tree.set_children('', *new_order)
+        self.order = new_order
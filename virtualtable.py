@@ -0,0 +1,133 @@
+from tkinter import ttk
+
+from treesync import TreeReconciler
+
+
+class VirtualTable:
+    """Tabela z danymi kolumnowymi po stronie Pythona.
+
+    Dane (klucze i kolumny) trzymane są w listach; sortowanie i filtrowanie
+    działa na indeksach wierszy, nie na elementach Treeview. Gdy wierszy
+    jest więcej niż threshold, tabela przechodzi w tryb wirtualny - w
+    widżecie istnieje tylko okno widocznych wierszy, przesuwane paskiem
+    przewijania. Widoczne wiersze synchronizowane są przez TreeReconciler.
+    """
+
+    def __init__(self, tree, scrollbar, formatter, threshold=1000):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.formatter = formatter  # formatter(index) -> (values, tags)
+        self.threshold = threshold
+        self.sync = TreeReconciler(tree)
+        self.keys = []
+        self.columns = {}
+        self.view = []
+        self.offset = 0
+        self.virtual = None
+        self.selected_keys = set()
+        self._restored_selection = ()
+
+        tree.bind('<<TreeviewSelect>>', self.on_select, add='+')
+        tree.bind('<Configure>', lambda e: self.render() if self.virtual else None, add='+')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            tree.bind(sequence, self.on_wheel, add='+')
+        self.set_virtual(False)
+
+    def set_data(self, keys, columns):
+        """Ustawia dane tabeli: lista kluczy i słownik kolumna -> lista wartości"""
+        self.keys = keys
+        self.columns = columns
+
+    def apply_view(self, sort_column, reverse=False, predicate=None):
+        """Filtruje i sortuje indeksy wierszy na danych kolumnowych"""
+        indices = range(len(self.keys))
+        if predicate is not None:
+            indices = [i for i in indices if predicate(i)]
+        column = self.columns.get(sort_column)
+        if column is not None:
+            self.view = sorted(indices, key=column.__getitem__, reverse=reverse)
+        else:
+            self.view = list(indices)
+
+    def set_virtual(self, virtual):
+        """Przełącza pasek przewijania między Treeview a oknem wirtualnym"""
+        self.virtual = virtual
+        if virtual:
+            self.tree.configure(yscrollcommand='')
+            self.scrollbar.configure(command=self.on_scroll)
+        else:
+            self.offset = 0
+            self.tree.configure(yscrollcommand=self.scrollbar.set)
+            self.scrollbar.configure(command=self.tree.yview)
+
+    def page_size(self):
+        """Liczba wierszy mieszczących się w widżecie"""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget('height'))
+        row_height = ttk.Style().lookup('Treeview', 'rowheight') or 20
+        # Jeden wiersz zajmuje nagłówek
+        return max(1, height // int(row_height) - 1)
+
+    def render(self):
+        """Materializuje w widżecie wiersze widoku (lub tylko widoczne okno)"""
+        virtual = len(self.view) > self.threshold
+        if virtual != self.virtual:
+            self.set_virtual(virtual)
+
+        if virtual:
+            page = self.page_size()
+            self.offset = max(0, min(self.offset, len(self.view) - page))
+            window = self.view[self.offset:self.offset + page]
+        else:
+            window = self.view
+
+        rows = []
+        for index in window:
+            values, tags = self.formatter(index)
+            rows.append((self.keys[index], values, tags))
+        self.sync.sync(rows)
+        self.restore_selection()
+
+        if virtual:
+            total = len(self.view)
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(window)) / total))
+
+    def restore_selection(self):
+        """Zaznacza widoczne wiersze, których klucze były zaznaczone"""
+        wanted = tuple(iid for iid in self.sync.order if self.sync.key_for(iid) in self.selected_keys)
+        if set(wanted) != set(self.tree.selection()):
+            self._restored_selection = wanted
+            self.tree.selection_set(wanted)
+
+    def on_select(self, event):
+        """Zapamiętuje zaznaczenie jako klucze (przetrwa przewijanie okna)"""
+        selection = self.tree.selection()
+        if set(selection) == set(self._restored_selection):
+            return
+        self.selected_keys = {self.sync.key_for(iid) for iid in selection}
+
+    def scroll_to(self, offset):
+        """Przesuwa okno wirtualne"""
+        self.offset = max(0, int(offset))
+        self.render()
+
+    def on_scroll(self, *args):
+        """Obsługa paska przewijania w trybie wirtualnym"""
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * len(self.view))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.page_size()
+            self.scroll_to(self.offset + step)
+
+    def on_wheel(self, event):
+        """Przewijanie kółkiem myszy w trybie wirtualnym"""
+        if not self.virtual:
+            return None
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return 'break'